@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Agendador por jogo: busca cada jogo do FotMob logo depois do apito final.
+
+Em vez de rodar o período inteiro várias vezes por dia (cron), o agendador
+carrega o calendário das ligas (com o horário de início de cada jogo) e arma
+um timer por jogo para início + --atraso minutos. No disparo, o status do
+jogo é conferido no calendário; se ainda não terminou, ou se as estatísticas
+ainda estão incompletas (sem playerStats / xG zerado), tenta de novo a cada
+--intervalo minutos, até --tentativas vezes. Jogos completos vão para o
+armazém colunar e ficam registrados no arquivo de estado, para não serem
+buscados de novo (jogos mais antigos que --retroativo saem do estado). Um erro
+na busca ou na gravação de um jogo vira uma nova tentativa, sem derrubar os
+outros timers.
+
+O calendário é recarregado a cada hora (adiamentos e jogos novos).
+
+Exemplo:
+  python agendador.py --ligas laliga premier bundesliga
+"""
+
+import argparse
+import json
+import os
+import sched
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from armazenamento import DEFAULT_STORE_DIR, HAS_PYARROW, PLAYER_MATCH_KEY, ColumnarStore
+from buscar_estatisticas_combinado import fotmob_gap_reason
+from buscar_estatisticas_fotmob import (
+    DEFAULT_FIXTURES_CACHE, FOTMOB_LEAGUE_IDS, FotMobScraper, parse_match_time, period_seasons,
+)
+from registro import configure_cli_logging, get_logger
+
+DEFAULT_STATE_PATH = '.agendador_estado.json'
+
+# Minutos após o início para a primeira busca (90 + intervalo + acréscimos)
+DEFAULT_DELAY_MINUTES = 115
+# Minutos entre tentativas enquanto o jogo não terminou ou os dados estão incompletos
+DEFAULT_RETRY_MINUTES = 10
+DEFAULT_MAX_ATTEMPTS = 12
+# Janela de jogos armados: até HORIZON horas à frente e LOOKBACK horas para trás
+DEFAULT_HORIZON_HOURS = 24
+DEFAULT_LOOKBACK_HOURS = 48
+# Intervalo de recarga do calendário (segundos)
+FIXTURES_REFRESH_SECONDS = 3600
+
+
+def kickoff_epoch(match):
+    """Início do jogo em segundos desde a época (UTC), ou None"""
+    match_date = parse_match_time(match)
+    if match_date is None:
+        return None
+    return match_date.value / 1e9
+
+
+def epoch_date(epoch):
+    """Data/hora UTC de um instante em segundos desde a época"""
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class MatchScheduler:
+    """Timers por jogo (sched.scheduler) para buscar cada jogo após o fim"""
+
+    def __init__(self, scraper, leagues, store, state_path=DEFAULT_STATE_PATH,
+                 delay_minutes=DEFAULT_DELAY_MINUTES, retry_minutes=DEFAULT_RETRY_MINUTES,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, horizon_hours=DEFAULT_HORIZON_HOURS,
+                 lookback_hours=DEFAULT_LOOKBACK_HOURS, logger=None, clock=time.time, sleep=time.sleep):
+        self.scraper = scraper
+        self.leagues = list(leagues)
+        self.store = store
+        self.state_path = Path(state_path)
+        self.delay = delay_minutes * 60
+        self.retry = retry_minutes * 60
+        self.max_attempts = max_attempts
+        self.horizon = horizon_hours * 3600
+        self.lookback = lookback_hours * 3600
+        self.log = logger or get_logger('agendador')
+        self.clock = clock
+        self.scheduler = sched.scheduler(clock, sleep)
+        # Jogos já gravados (persistidos, match_id -> início) e jogos armados/abandonados nesta execução
+        self.done = self._load_state()
+        self.tracked = {}  # match_id -> início usado no timer
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('done', [])
+        except (OSError, ValueError):
+            return {}
+        done = {}
+        for entry in entries:
+            if isinstance(entry, list):
+                match_id, kickoff = entry
+            else:
+                # Estado antigo (só IDs): mantido até sair da janela a partir de agora
+                match_id, kickoff = entry, self.clock()
+            done[match_id] = kickoff
+        return done
+
+    def _save_state(self):
+        # Jogos fora da janela retroativa nunca são armados de novo: não precisam ficar no estado
+        cutoff = self.clock() - self.lookback
+        self.done = {match_id: kickoff for match_id, kickoff in self.done.items() if kickoff >= cutoff}
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'done': sorted([match_id, kickoff] for match_id, kickoff in self.done.items())}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def plan(self, refresh=True):
+        """Carrega o calendário das ligas e arma um timer para cada jogo novo na janela"""
+        now = self.clock()
+        armed = 0
+        # Temporadas da janela observada (a atual é None: calendário revalidado pelo TTL)
+        seasons = period_seasons(epoch_date(now - self.lookback), epoch_date(now + self.horizon),
+                                 today=epoch_date(now))
+        for league_key in self.leagues:
+            league_id = FOTMOB_LEAGUE_IDS[league_key]['id']
+            matches = [match for season in seasons for match in self.scraper.get_league_matches(league_id, season)]
+            for match in matches:
+                match_id = match.get('id')
+                kickoff = kickoff_epoch(match)
+                if match_id is None or kickoff is None or match_id in self.done:
+                    continue
+                if (match.get('status') or {}).get('cancelled'):
+                    continue
+                if not (now - self.lookback <= kickoff <= now + self.horizon):
+                    continue
+                if self.tracked.get(match_id) == kickoff:
+                    continue  # Já armado (ou abandonado) com este horário
+                self.tracked[match_id] = kickoff
+                self.scheduler.enterabs(max(now, kickoff + self.delay), 1, self._fetch,
+                                        (league_key, match_id, kickoff, 1))
+                armed += 1
+
+        self.log.info(f"🗓️  {armed} jogo(s) armado(s), {len(self.scheduler.queue)} timer(s) na fila")
+        if refresh:
+            self.scheduler.enter(FIXTURES_REFRESH_SECONDS, 2, self.plan)
+        return armed
+
+    def _retry(self, league_key, match_id, kickoff, attempt, reason):
+        if self.tracked.get(match_id) != kickoff:
+            return  # Jogo remarcado: o timer novo assume
+        if attempt >= self.max_attempts:
+            self.log.error(f"  ❌ Jogo {match_id}: desistindo após {attempt} tentativas ({reason})")
+            return
+        self.log.info(f"  ⏳ Jogo {match_id}: {reason}, nova tentativa em {self.retry // 60:.0f} min")
+        self.scheduler.enter(self.retry, 1, self._fetch, (league_key, match_id, kickoff, attempt + 1))
+
+    def _fetch(self, league_key, match_id, kickoff, attempt):
+        """Disparo de um timer: confere o status e grava o jogo se estiver completo"""
+        if match_id in self.done or self.tracked.get(match_id) != kickoff:
+            return
+        try:
+            self._fetch_match(league_key, match_id, kickoff, attempt)
+        except Exception as e:
+            # Erro de rede, de esquema ou de gravação: não pode derrubar os outros timers
+            self.log.error(f"  ❌ Jogo {match_id}: erro na busca/gravação: {e}")
+            self._retry(league_key, match_id, kickoff, attempt, f"erro: {e}")
+
+    def _fetch_match(self, league_key, match_id, kickoff, attempt):
+        league_id = FOTMOB_LEAGUE_IDS[league_key]['id']
+        season = period_seasons(epoch_date(kickoff), epoch_date(kickoff), today=epoch_date(self.clock()))[0]
+        matches = self.scraper.get_league_matches(league_id, season)
+        match = next((m for m in matches if m.get('id') == match_id), None)
+        if match is None:
+            self.log.warning(f"  ⚠️  Jogo {match_id} não está mais no calendário")
+            return
+        if kickoff_epoch(match) != kickoff:
+            return  # Remarcado: a próxima recarga do calendário arma o novo horário
+
+        home_team = match.get('home', {}).get('name', '')
+        away_team = match.get('away', {}).get('name', '')
+        status = match.get('status') or {}
+        if status.get('cancelled'):
+            self.log.warning(f"  ⚠️  {home_team} vs {away_team}: jogo cancelado")
+            return
+        if not status.get('finished'):
+            self._retry(league_key, match_id, kickoff, attempt, 'jogo ainda não terminou')
+            return
+
+        match_date = parse_match_time(match)
+        match_data = self.scraper.get_match_details(match_id)
+        player_stats = (self.scraper.extract_player_stats(match_data, match_date, home_team, away_team)
+                        if match_data else [])
+        reason = fotmob_gap_reason(player_stats, match_data)
+        if reason:
+            self._retry(league_key, match_id, kickoff, attempt, reason)
+            return
+
+        partitions = self.store.append('fotmob', self.scraper.stats_frame(player_stats), league_key, key=PLAYER_MATCH_KEY)
+        self.done[match_id] = kickoff
+        self._save_state()
+        self.log.info(f"  ✅ {home_team} vs {away_team}: {len(player_stats)} jogadores "
+                      f"({partitions} partição(ões), tentativa {attempt})")
+
+    def run(self, refresh=True):
+        """Arma os jogos e processa os timers (refresh=False: termina quando a fila esvaziar)"""
+        self.plan(refresh=refresh)
+        self.scheduler.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Busca cada jogo do FotMob logo após o fim (agendador por jogo)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--ligas', nargs='+', required=True, choices=sorted(FOTMOB_LEAGUE_IDS),
+                       help='Ligas acompanhadas')
+    parser.add_argument('--armazem', type=str, default=DEFAULT_STORE_DIR,
+                       help=f'Diretório do armazém (padrão: {DEFAULT_STORE_DIR})')
+    parser.add_argument('--estado', type=str, default=DEFAULT_STATE_PATH,
+                       help=f'Arquivo com os jogos já gravados (padrão: {DEFAULT_STATE_PATH})')
+    parser.add_argument('--cache-calendario', type=str, default=DEFAULT_FIXTURES_CACHE,
+                       help=f'Diretório do cache de calendários (padrão: {DEFAULT_FIXTURES_CACHE}; vazio desativa)')
+    parser.add_argument('--atraso', type=int, default=DEFAULT_DELAY_MINUTES,
+                       help=f'Minutos após o início para a primeira busca (padrão: {DEFAULT_DELAY_MINUTES})')
+    parser.add_argument('--intervalo', type=int, default=DEFAULT_RETRY_MINUTES,
+                       help=f'Minutos entre tentativas (padrão: {DEFAULT_RETRY_MINUTES})')
+    parser.add_argument('--tentativas', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help=f'Tentativas por jogo (padrão: {DEFAULT_MAX_ATTEMPTS})')
+    parser.add_argument('--horizonte', type=int, default=DEFAULT_HORIZON_HOURS,
+                       help=f'Horas à frente com jogos armados (padrão: {DEFAULT_HORIZON_HOURS})')
+    parser.add_argument('--retroativo', type=int, default=DEFAULT_LOOKBACK_HOURS,
+                       help=f'Horas para trás com jogos ainda não gravados (padrão: {DEFAULT_LOOKBACK_HOURS})')
+    parser.add_argument('--uma-vez', action='store_true',
+                       help='Não recarregar o calendário: sair quando os jogos armados terminarem')
+    args = parser.parse_args()
+    configure_cli_logging()
+
+    if not HAS_PYARROW:
+        print("❌ pyarrow não está instalado. Instale com: pip install pyarrow")
+        sys.exit(1)
+
+    print("="*70)
+    print("⏰ AGENDADOR POR JOGO - FOTMOB")
+    print("="*70)
+    print(f"Ligas: {', '.join(args.ligas)}")
+    print(f"Primeira busca: início + {args.atraso} min | Tentativas: {args.tentativas} a cada {args.intervalo} min")
+    print("="*70)
+
+    scheduler = MatchScheduler(
+        FotMobScraper(fixtures_cache=args.cache_calendario or None),
+        args.ligas,
+        ColumnarStore(args.armazem),
+        state_path=args.estado,
+        delay_minutes=args.atraso,
+        retry_minutes=args.intervalo,
+        max_attempts=args.tentativas,
+        horizon_hours=args.horizonte,
+        lookback_hours=args.retroativo,
+    )
+    try:
+        scheduler.run(refresh=not args.uma_vez)
+    except KeyboardInterrupt:
+        print("\n👋 Agendador interrompido")
+
+
+if __name__ == "__main__":
+    main()
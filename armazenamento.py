@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Armazenamento colunar (Parquet) dos dados extraídos.
+
+Cada conjunto de dados (ex: 'fotmob', 'fbref', 'chutes') fica em
+<raiz>/<conjunto>/liga=<liga>/ano=<ano>/mes=<mes>/dados.parquet. A leitura
+abre apenas as partições das ligas e meses pedidos e apenas as colunas
+pedidas, em vez de carregar planilhas inteiras.
+
+Requer pyarrow (opcional): pip install pyarrow
+"""
+
+import os
+import threading
+import uuid
+from pathlib import Path
+
+from importacao import lazy_import, module_available
+
+pd = lazy_import('pandas')
+
+# pyarrow só é importado quando o armazém é de fato lido ou gravado
+HAS_PYARROW = module_available('pyarrow')
+
+DEFAULT_STORE_DIR = 'armazem'
+
+# Identificação de um registro jogador x jogo (a versão mais nova substitui a anterior)
+PLAYER_MATCH_KEY = ['Player', 'Team', 'Date', 'Opponent']
+
+
+def typed_frame(rows, dtypes):
+    """DataFrame dos registros com as colunas de dtypes ({coluna: dtype}) convertidas"""
+    df = pd.DataFrame(rows)
+    for col in df.columns:
+        dtype = dtypes.get(col)
+        if dtype is not None:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _pyarrow():
+    """Módulos do pyarrow usados pelo armazém (pa, ds, pq)"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    return pa, ds, pq
+
+
+def _partition_schema():
+    """Colunas de partição (derivadas dos diretórios liga=/ano=/mes=)"""
+    pa, _, _ = _pyarrow()
+    return pa.schema([('liga', pa.string()), ('ano', pa.int32()), ('mes', pa.int32())])
+
+
+def _nullable_types():
+    """Inteiros/booleanos com valores ausentes continuam inteiros/booleanos no pandas"""
+    pa, _, _ = _pyarrow()
+    return {
+        pa.int64(): pd.Int64Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+    }
+
+
+class ColumnarStore:
+    """Conjuntos de dados em Parquet particionados por liga/ano/mês"""
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow não está instalado. Instale com: pip install pyarrow")
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _partition_path(self, dataset, league, year, month):
+        return self.root / dataset / f"liga={league}" / f"ano={year}" / f"mes={month}" / 'dados.parquet'
+
+    def append(self, dataset, df, league, key=None, date_column='Date', sort_by=None):
+        """
+        Grava registros de uma liga no conjunto, mesclando com as partições existentes.
+        key: colunas que identificam um registro (a versão nova substitui a antiga).
+        sort_by: ordem das linhas em cada partição (ex: índice jogo/jogador, para que
+        as estatísticas do Parquet permitam pular blocos na leitura).
+        Retorna o número de partições gravadas.
+        """
+        if df is None or df.empty:
+            return 0
+
+        pa, _, pq = _pyarrow()
+        df = df.copy()
+        dates = pd.to_datetime(df[date_column])
+        written = 0
+
+        with self._lock:
+            for (year, month), part in df.groupby([dates.dt.year, dates.dt.month], sort=True):
+                path = self._partition_path(dataset, league, int(year), int(month))
+                if path.exists():
+                    existing = pq.read_table(path).to_pandas()
+                    part = pd.concat([existing, part], ignore_index=True)
+                    if key:
+                        part = part.drop_duplicates(subset=key, keep='last')
+                if sort_by:
+                    part = part.sort_values(sort_by, kind='stable')
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+                pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+                os.replace(tmp_path, path)
+                written += 1
+
+        return written
+
+    def read(self, dataset, leagues=None, start=None, end=None, columns=None, date_column='Date'):
+        """
+        Lê um conjunto filtrando partições por liga e mês (e linhas por data).
+        columns: lista de colunas a carregar (None = todas).
+        """
+        path = self.root / dataset
+        if not path.exists():
+            return pd.DataFrame(columns=columns or [])
+
+        pa, ds, pq = _pyarrow()
+        partition_schema = _partition_schema()
+        # Partições podem ter colunas diferentes (ex: estatísticas novas): unir os esquemas
+        files = ds.dataset(path, format='parquet', partitioning='hive').files
+        schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [partition_schema])
+        dataset_obj = ds.dataset(
+            files, schema=schema, format='parquet',
+            partitioning=ds.partitioning(partition_schema, flavor='hive'),
+            partition_base_dir=str(path),
+        )
+
+        condition = None
+        if leagues:
+            condition = ds.field('liga').isin(list(leagues))
+        if start is not None:
+            start = pd.Timestamp(start)
+            expr = ds.field('ano') * 100 + ds.field('mes') >= start.year * 100 + start.month
+            condition = expr if condition is None else condition & expr
+        if end is not None:
+            end = pd.Timestamp(end)
+            expr = ds.field('ano') * 100 + ds.field('mes') <= end.year * 100 + end.month
+            condition = expr if condition is None else condition & expr
+
+        load_columns = None
+        if columns is not None:
+            load_columns = list(dict.fromkeys(list(columns) + [date_column]))
+            load_columns = [col for col in load_columns if col in dataset_obj.schema.names]
+
+        df = dataset_obj.to_table(columns=load_columns, filter=condition).to_pandas(
+            types_mapper=_nullable_types().get
+        )
+
+        if start is not None:
+            df = df[pd.to_datetime(df[date_column]) >= start.normalize()]
+        if end is not None:
+            df = df[pd.to_datetime(df[date_column]) < end.normalize() + pd.Timedelta(days=1)]
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+
+        return df.reset_index(drop=True)
+
+    def datasets(self):
+        """Conjuntos de dados existentes no armazém"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
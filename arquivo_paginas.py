@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Arquivo de páginas brutas (FBref, FotMob, Understat).
+
+Cada corpo baixado é guardado comprimido num banco SQLite, somente com
+inserções (append-only), indexado por URL e data/hora da busca e identificado
+pelo hash SHA-256 do conteúdo. Corpos idênticos são guardados uma única vez.
+
+O arquivo implementa a mesma interface de leitura do cache_http.PageCache
+(get/__contains__), então pode ser usado com CachedSession para rodar os
+scrapers sem rede (ver reextrair.py).
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    sha256 TEXT PRIMARY KEY,
+    encoding TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES bodies(sha256),
+    status INTEGER NOT NULL,
+    content_type TEXT
+);
+CREATE INDEX IF NOT EXISTS fetches_url ON fetches(url, fetched_at);
+"""
+
+
+def content_hash(body):
+    """Hash SHA-256 (hex) do corpo de uma página"""
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageArchive:
+    """Arquivo append-only de páginas comprimidas em SQLite"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def append(self, url, body, status=200, headers=None, fetched_at=None):
+        """Arquiva uma página. Retorna o hash do conteúdo."""
+        sha256 = content_hash(body)
+        fetched_at = fetched_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        content_type = (headers or {}).get('Content-Type')
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO bodies (sha256, encoding, size, body) VALUES (?, ?, ?, ?)',
+                (sha256, 'zlib', len(body), zlib.compress(body, 6))
+            )
+            self._conn.execute(
+                'INSERT INTO fetches (url, fetched_at, sha256, status, content_type) VALUES (?, ?, ?, ?, ?)',
+                (url, fetched_at, sha256, status, content_type)
+            )
+            self._conn.commit()
+        return sha256
+
+    def body(self, sha256):
+        """Corpo descomprimido de um hash (ou None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT encoding, body FROM bodies WHERE sha256 = ?', (sha256,)
+            ).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[1])
+
+    def latest(self, url):
+        """Metadados da busca mais recente de uma URL (ou None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, fetched_at, sha256, status, content_type FROM fetches '
+                'WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT 1', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'url': row[0],
+            'fetched_at': row[1],
+            'sha256': row[2],
+            'status_code': row[3],
+            'headers': {'Content-Type': row[4]} if row[4] else {},
+        }
+
+    def __contains__(self, url):
+        return self.latest(url) is not None
+
+    def get(self, url):
+        """Retorna (corpo, metadados) da versão mais recente, como PageCache.get"""
+        meta = self.latest(url)
+        if meta is None:
+            return None
+        body = self.body(meta['sha256'])
+        if body is None:
+            return None
+        return body, meta
+
+    def urls(self, like='%'):
+        """URLs arquivadas (filtro SQL LIKE opcional)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT DISTINCT url FROM fetches WHERE url LIKE ? ORDER BY url', (like,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self):
+        """Resumo do arquivo: buscas, corpos distintos e tamanhos"""
+        with self._lock:
+            fetches = self._conn.execute('SELECT COUNT(*) FROM fetches').fetchone()[0]
+            bodies, raw, stored = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM bodies'
+            ).fetchone()
+        return {'fetches': fetches, 'bodies': bodies, 'raw_bytes': raw, 'stored_bytes': stored}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ArchivingSession:
+    """Sessão que repassa as requisições e arquiva toda resposta 200"""
+
+    def __init__(self, session, archive):
+        self.session = session
+        self.archive = archive
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url, **kwargs):
+        response = self.session.get(url, **kwargs)
+        if response.status_code == 200:
+            self.archive.append(url, response.content, response.status_code, response.headers)
+        return response
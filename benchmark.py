@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmarks dos scripts.
+
+importacao: mede o tempo de `script --help` de cada ponto de entrada
+(mediana de N execuções, descontado o tempo de um `python -c pass`) e
+verifica se algum módulo pesado foi carregado só para importar o script.
+
+memoria: mede com tracemalloc cada etapa da extração das páginas de jogo do
+FBref guardadas no cache (ou no arquivo de páginas): árvore da página
+inteira, árvore só com as tabelas, pico da extração (mandante + visitante) e
+o que continua alocado depois, sem o coletor de ciclos. O retido deve ficar
+perto do tamanho dos registros, não do tamanho da página.
+
+detalhes: compara, em cada matchDetails do FotMob guardado no arquivo de
+páginas (--arquivo-paginas), json.loads do documento inteiro com
+trim_match_details (só playerStats e status decodificados, o resto pulado):
+tempo (melhor de N execuções), pico de memória e se o resultado é o mesmo.
+
+Sai com código 1 se algum script ou página passar do orçamento.
+
+Exemplo:
+  python benchmark.py importacao --orcamento 150
+  python benchmark.py memoria --cache .cache_paginas --limite 20
+  python benchmark.py detalhes --cache paginas.sqlite --limite 20
+"""
+
+import argparse
+import gc
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Scripts chamados pelo cron e pelos wrappers de validação
+ENTRY_POINTS = [
+    'buscar_estatisticas_multi_liga.py',
+    'buscar_estatisticas_fotmob.py',
+    'buscar_estatisticas_combinado.py',
+    'comparar_dados.py',
+    'validar_ligas.py',
+    'reextrair.py',
+    'gerar_relatorio.py',
+    'identidade.py',
+    'agendador.py',
+]
+
+# Módulos que não devem ser carregados só para importar um script
+HEAVY_MODULES = ['pandas', 'numpy', 'requests', 'bs4', 'cloudscraper', 'pyarrow', 'openpyxl']
+
+# Orçamento padrão de `--help` (ms, além da inicialização do interpretador)
+DEFAULT_IMPORT_BUDGET_MS = 150
+
+# Memória que pode continuar alocada após extrair uma página (KB, registros inclusos)
+DEFAULT_RETAINED_BUDGET_KB = 256
+
+# Páginas de jogo (com ID), não as URLs de calendário por data
+_MATCH_URL_RE = re.compile(r'/matches/[0-9a-f]{8}/')
+
+# Respostas da API do FotMob com os detalhes de um jogo
+_DETAILS_URL_RE = re.compile(r'/matchDetails\?matchId=')
+
+_LOADED_PROBE = """
+import importlib, json, sys
+sys.path.insert(0, {root!r})
+importlib.import_module({module!r})
+from importacao import is_loaded
+print(json.dumps([name for name in {heavy!r} if is_loaded(name)]))
+"""
+
+
+def time_command(command, repeats):
+    """Mediana (ms) do tempo de parede de um comando"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def heavy_modules_loaded(script):
+    """Módulos pesados de fato executados ao importar o script"""
+    probe = _LOADED_PROBE.format(root=str(ROOT), module=Path(script).stem, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return ['<erro ao importar>']
+    return json.loads(result.stdout)
+
+
+def bench_imports(scripts, repeats, budget_ms):
+    """Mede o --help de cada script. Retorna True se todos ficaram no orçamento."""
+    baseline = time_command([sys.executable, '-c', 'pass'], repeats)
+    print(f"Interpretador (python -c pass): {baseline:.0f} ms")
+    print(f"Orçamento: {budget_ms:.0f} ms além do interpretador\n")
+
+    ok = True
+    for script in scripts:
+        elapsed = time_command([sys.executable, script, '--help'], repeats) - baseline
+        loaded = heavy_modules_loaded(script)
+        within = elapsed <= budget_ms and not loaded
+        ok = ok and within
+        status = "✅" if within else "❌"
+        extra = f" | carregados: {', '.join(loaded)}" if loaded else ""
+        print(f"{status} {script:<36} {elapsed:7.0f} ms{extra}")
+    return ok
+
+
+def _traced_peak(func):
+    """(resultado, pico em bytes acima do uso atual) de uma chamada"""
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    result = func()
+    return result, tracemalloc.get_traced_memory()[1] - base
+
+
+def _extract_match(scraper, url, date):
+    """Registros do mandante e do visitante de uma página de jogo"""
+    return (scraper.get_player_stats_from_match(url, 'Mandante', 'Visitante', date, 'home') +
+            scraper.get_player_stats_from_match(url, 'Visitante', 'Mandante', date, 'away'))
+
+
+def bench_memory(source, limit, budget_kb):
+    """Memória por etapa em cada página de jogo. Retorna True se o retido ficou no orçamento."""
+    from arquivo_paginas import PageArchive
+    from buscar_estatisticas_multi_liga import LeagueScraper, bs4, parse_tables, pd, release_tree
+    from cache_http import CachedSession, PageCache
+
+    if not Path(source).exists():
+        print(f"❌ {source} não existe")
+        return False
+    pages = PageArchive(source) if Path(source).is_file() else PageCache(source)
+    urls = [url for url in pages.urls() if _MATCH_URL_RE.search(url)][:limit]
+    if not urls:
+        print(f"❌ Nenhuma página de jogo do FBref em {source}")
+        return False
+
+    def new_scraper():
+        # Scraper novo por página (sem a resposta guardada pelo SingleFlightSession)
+        scraper = LeagueScraper(session=CachedSession(pages), delays=False)
+        scraper._initialized = True
+        return scraper
+
+    date = pd.Timestamp('2000-01-01')
+    _extract_match(new_scraper(), urls[0], date)  # Importações e caches de primeiro uso fora da medição
+
+    print(f"Páginas de jogo: {len(urls)} ({source})")
+    print(f"Orçamento: {budget_kb:.0f} KB retidos por página\n")
+    print(f"   {'HTML':>9} {'árvore':>10} {'tabelas':>10} {'extração':>10} {'retido':>9}  registros")
+
+    ok = True
+    gc.collect()
+    gc.disable()  # O que não for liberado na hora aparece no retido
+    tracemalloc.start()
+    try:
+        for url in urls:
+            content = pages.get(url)[0]
+            full, full_peak = _traced_peak(lambda: bs4.BeautifulSoup(content, 'html.parser'))
+            full.decompose()
+            del full
+            gc.collect()
+            tables, tables_peak = _traced_peak(lambda: parse_tables(content))
+            release_tree(tables)
+            del tables
+
+            base = tracemalloc.get_traced_memory()[0]
+            rows, extract_peak = _traced_peak(lambda: _extract_match(new_scraper(), url, date))
+            retained = tracemalloc.get_traced_memory()[0] - base
+
+            within = retained <= budget_kb * 1024
+            ok = ok and within
+            status = "✅" if within else "❌"
+            print(f"{status} {len(content) / 1024:6.0f} KB {full_peak / 2**20:7.1f} MB {tables_peak / 2**20:7.1f} MB "
+                  f"{extract_peak / 2**20:7.1f} MB {retained / 1024:6.0f} KB  {len(rows)}")
+            del rows
+            gc.collect()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return ok
+
+
+def _best_time(func, repeats):
+    """Melhor tempo (ms) de N chamadas"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def bench_details(source, limit, repeats):
+    """json.loads x trim_match_details em cada matchDetails. Retorna True se os resultados batem."""
+    from arquivo_paginas import PageArchive
+    from buscar_estatisticas_fotmob import MATCH_DETAIL_PATHS, trim_match_details
+    from cache_http import PageCache
+
+    if not Path(source).exists():
+        print(f"❌ {source} não existe")
+        return False
+    pages = PageArchive(source) if Path(source).is_file() else PageCache(source)
+    urls = [url for url in pages.urls() if _DETAILS_URL_RE.search(url)][:limit]
+    if not urls:
+        print(f"❌ Nenhum matchDetails do FotMob em {source}")
+        return False
+
+    print(f"matchDetails: {len(urls)} ({source})\n")
+    print(f"   {'JSON':>9} {'json.loads':>17} {'trim_match_details':>19}")
+
+    ok = True
+    totals = [0.0, 0.0]
+    for url in urls:
+        text = pages.get(url)[0].decode('utf-8')
+        full = json.loads(text)
+        expected = {}
+        for path in MATCH_DETAIL_PATHS:
+            node = full
+            for key in path:
+                node = node.get(key) if isinstance(node, dict) else None
+            if node is not None:
+                expected.setdefault(path[0], {})[path[1]] = node
+        del full
+
+        same = trim_match_details(text) == expected
+        ok = ok and same
+        tracemalloc.start()
+        _, loads_peak = _traced_peak(lambda: json.loads(text))
+        _, trim_peak = _traced_peak(lambda: trim_match_details(text))
+        tracemalloc.stop()
+        loads_ms = _best_time(lambda: json.loads(text), repeats)
+        trim_ms = _best_time(lambda: trim_match_details(text), repeats)
+        totals[0] += loads_ms
+        totals[1] += trim_ms
+
+        status = "✅" if same else "❌"
+        print(f"{status} {len(text) / 1024:6.0f} KB {loads_ms:6.2f} ms {loads_peak / 2**20:5.1f} MB "
+              f"{trim_ms:7.2f} ms {trim_peak / 2**20:5.1f} MB")
+
+    print(f"\nTotal: json.loads {totals[0]:.1f} ms, trim_match_details {totals[1]:.1f} ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks dos scripts')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    imports = subparsers.add_parser('importacao', help='Tempo de inicialização (--help) dos scripts')
+    imports.add_argument('--orcamento', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                         help=f'Orçamento em ms por script (padrão: {DEFAULT_IMPORT_BUDGET_MS})')
+    imports.add_argument('--repeticoes', type=int, default=5, help='Execuções por script (padrão: 5)')
+    imports.add_argument('--scripts', nargs='+', default=ENTRY_POINTS, help='Scripts medidos (padrão: todos)')
+
+    memory = subparsers.add_parser('memoria', help='Memória por etapa da extração das páginas de jogo do FBref')
+    memory.add_argument('--cache', type=str, default='.cache_paginas',
+                        help='Cache de páginas (diretório) ou arquivo de páginas (.sqlite) (padrão: .cache_paginas)')
+    memory.add_argument('--limite', type=int, default=10, help='Páginas medidas (padrão: 10)')
+    memory.add_argument('--orcamento', type=float, default=DEFAULT_RETAINED_BUDGET_KB,
+                        help=f'KB que podem continuar alocados por página (padrão: {DEFAULT_RETAINED_BUDGET_KB})')
+
+    details = subparsers.add_parser('detalhes', help='json.loads x trim_match_details nos matchDetails do FotMob')
+    details.add_argument('--cache', type=str, required=True,
+                         help='Arquivo de páginas (.sqlite, ver --arquivo-paginas) ou cache de páginas (diretório)')
+    details.add_argument('--limite', type=int, default=10, help='Documentos medidos (padrão: 10)')
+    details.add_argument('--repeticoes', type=int, default=20, help='Execuções por documento (padrão: 20)')
+
+    args = parser.parse_args()
+
+    print("="*70)
+    print(f"⏱️  BENCHMARK - {args.comando.upper()}")
+    print("="*70)
+
+    if args.comando == 'importacao':
+        ok = bench_imports(args.scripts, args.repeticoes, args.orcamento)
+    elif args.comando == 'memoria':
+        ok = bench_memory(args.cache, args.limite, args.orcamento)
+    elif args.comando == 'detalhes':
+        ok = bench_details(args.cache, args.limite, args.repeticoes)
+
+    print()
+    if ok:
+        print("🎉 Dentro do orçamento")
+    else:
+        print("⚠️  Fora do orçamento")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Busca combinada: FotMob primeiro, FBref apenas para as lacunas.
+
+O calendário e as estatísticas dos jogadores vêm da API do FotMob (rápida).
+Jogos em que o FotMob não trouxe dados (sem playerStats, erro na API ou xG
+zerado para todos os jogadores) são enviados ao scraper do FBref, que só
+busca esses jogos. A saída tem um único esquema, com a coluna Source
+indicando a origem de cada linha.
+
+Exemplo:
+  python buscar_estatisticas_combinado.py --liga laliga --inicio 2025-09-01 --fim 2025-09-30
+"""
+
+import argparse
+import sys
+from collections import namedtuple
+from datetime import timedelta
+
+from arquivo_paginas import PageArchive
+from buscar_estatisticas_fotmob import DEFAULT_FIXTURES_CACHE, FOTMOB_LEAGUE_IDS, FotMobScraper
+from buscar_estatisticas_multi_liga import LEAGUE_IDS, LeagueScraper, scrape_period
+from identidade import DEFAULT_INDEX_PATH, IdentityIndex
+from importacao import lazy_import
+from registro import configure_cli_logging
+
+pd = lazy_import('pandas')
+
+# Esquema único da saída (xG/xA como float nas duas fontes)
+OUTPUT_COLUMNS = [
+    'Player', 'Team', 'Date', 'Opponent', 'Minutes', 'Goals', 'Assists', 'xG', 'xA', 'SH',
+    'Confronto', 'Location', 'adj', 'Year', 'Month', 'Source', 'SourceHash',
+    'PlayerID', 'TeamID', 'OpponentID',
+]
+
+# Jogo do calendário do FBref com os times já resolvidos no índice de identidade
+Fixture = namedtuple('Fixture', ['position', 'date', 'home_id', 'away_id'])
+
+
+def fotmob_gap_reason(player_stats, match_data):
+    """Motivo para buscar o jogo no FBref (ou None se o FotMob trouxe tudo)"""
+    if not match_data:
+        return 'erro na API'
+    if not player_stats:
+        return 'sem playerStats'
+    if sum(row['xG'] for row in player_stats) == 0:
+        return 'xG zerado'
+    return None
+
+
+def scrape_fotmob(league_key, start_date, end_date, scraper, limit_games=None):
+    """
+    Busca o período no FotMob.
+    Retorna (registros, lacunas), onde lacunas são os jogos a buscar no FBref.
+    """
+    league_info = FOTMOB_LEAGUE_IDS[league_key]
+    scraper.log.info(f"\n📊 FotMob: buscando jogos da {league_info['name']}...")
+
+    filtered_matches = scraper.get_period_fixtures(league_info['id'], start_date, end_date)
+
+    # Jogos futuros, adiados ou em andamento não têm dados em nenhuma fonte
+    played = []
+    for match, match_date in filtered_matches:
+        status = match.get('status') or {}
+        if status.get('finished') and not status.get('cancelled'):
+            played.append((match, match_date))
+    if len(played) < len(filtered_matches):
+        scraper.log.info(f"  ⏭️  {len(filtered_matches) - len(played)} jogo(s) não terminado(s) ou cancelado(s) ignorado(s)")
+    filtered_matches = played
+
+    if limit_games:
+        filtered_matches = filtered_matches[:limit_games]
+    scraper.log.info(f"  📅 {len(filtered_matches)} jogos no período")
+
+    all_player_stats = []
+    gaps = []
+
+    # Detalhes dos jogos (em paralelo com scraper.workers > 1)
+    details = scraper.iter_match_details([match.get('id') for match, _ in filtered_matches])
+
+    for i, ((match, match_date), match_data) in enumerate(zip(filtered_matches, details), 1):
+        home_team = match.get('home', {}).get('name', '')
+        away_team = match.get('away', {}).get('name', '')
+        scraper.log.info(f"  [{i}/{len(filtered_matches)}] {home_team} vs {away_team} ({match_date.strftime('%Y-%m-%d')})")
+
+        player_stats = scraper.extract_player_stats(match_data, match_date, home_team, away_team) if match_data else []
+
+        reason = fotmob_gap_reason(player_stats, match_data)
+        if reason:
+            scraper.log.info(f"    ↪️  Lacuna ({reason}): será buscado no FBref")
+            gaps.append({'date': match_date, 'home_team': home_team, 'away_team': away_team})
+            continue
+
+        scraper.log.info(f"    ✅ {len(player_stats)} jogadores")
+        all_player_stats.extend(player_stats)
+
+    return all_player_stats, gaps
+
+
+def make_gap_filter(gaps, index):
+    """
+    Filtro dos jogos do calendário do FBref que correspondem às lacunas.
+    Times são comparados pelo ID canônico do índice de identidade; a data do
+    FotMob é UTC, então aceita-se um dia de diferença. Os dois times precisam
+    corresponder; se um deles não foi resolvido no índice (nome do FBref nunca
+    visto no FotMob e vice-versa), aceita-se a data e o outro time apenas quando
+    ele tem um único jogo nessa janela.
+
+    O filtro recebe os jogos de um mês do calendário por vez (iter_period
+    processa mês a mês), então a janela de um dia de uma lacuna na virada do
+    mês é avaliada em cada mês separadamente.
+    """
+    wanted = []
+    for gap in gaps:
+        wanted.append((
+            gap['date'].normalize(),
+            index.resolve_team('fotmob', gap['home_team']),
+            index.resolve_team('fotmob', gap['away_team']),
+        ))
+
+    def match_filter(matches):
+        fotmob_ids = index.team_ids('fotmob')
+        fixtures = [
+            Fixture(position, match['date'], index.resolve_team('fbref', match['home_team']),
+                    index.resolve_team('fbref', match['away_team']))
+            for position, match in enumerate(matches)
+        ]
+        fbref_ids = index.team_ids('fbref')
+        selected = set()
+        for date, gap_home, gap_away in wanted:
+            nearby = [fixture for fixture in fixtures if abs(fixture.date - date) <= timedelta(days=1)]
+            exact = [fixture.position for fixture in nearby
+                     if fixture.home_id == gap_home and fixture.away_id == gap_away]
+            if exact:
+                selected.update(exact)
+                continue
+            for team_id, other_gap, home in ((gap_home, gap_away, True), (gap_away, gap_home, False)):
+                if other_gap in fbref_ids:
+                    continue  # O outro time já tem nome no FBref: não é ele
+                candidates = [fixture for fixture in nearby if team_id in (fixture.home_id, fixture.away_id)]
+                if len(candidates) != 1:
+                    continue
+                fixture = candidates[0]
+                own_id, other_fbref = (fixture.home_id, fixture.away_id) if home else (fixture.away_id, fixture.home_id)
+                if own_id == team_id and other_fbref not in fotmob_ids:
+                    selected.add(fixture.position)
+                    break
+        return [match for position, match in enumerate(matches) if position in selected]
+
+    return match_filter
+
+
+def scrape_fbref_gaps(league_key, gaps, index, scraper=None):
+    """
+    Busca no FBref apenas os jogos das lacunas: um período curto por mês com
+    lacunas (do dia anterior à primeira ao dia seguinte à última), e o filtro
+    vê os jogos de um mês do calendário por vez (ver make_gap_filter)
+    """
+    league_info = LEAGUE_IDS[league_key]
+    if scraper is None:
+        scraper = LeagueScraper()
+
+    match_filter = make_gap_filter(gaps, index)
+    dates = sorted(gap['date'].normalize() for gap in gaps)
+    all_player_stats = []
+
+    # Só os meses que têm lacunas (evita baixar o calendário dos outros meses)
+    for year, month in sorted(set((date.year, date.month) for date in dates)):
+        month_dates = [date for date in dates if (date.year, date.month) == (year, month)]
+        window_start = month_dates[0] - timedelta(days=1)
+        window_end = month_dates[-1] + timedelta(days=1)
+        all_player_stats.extend(scrape_period(
+            league_info['id'], league_info['name'], window_start, window_end, scraper,
+            match_filter=match_filter
+        ))
+
+    return all_player_stats
+
+
+def normalize_rows(rows, source, index):
+    """Converte registros de uma fonte para o esquema único da saída"""
+    if not rows:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    df = pd.DataFrame(rows)
+    df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+    for col in ('xG', 'xA'):
+        df[col] = df[col].astype(float)
+    if 'SH' not in df.columns:
+        df['SH'] = pd.NA
+    df['Source'] = source
+    df = index.annotate(df, source)
+    return df.reindex(columns=OUTPUT_COLUMNS)
+
+
+def scrape_combined(league_key, start_date, end_date, fotmob=None, fbref=None, index=None, limit_games=None):
+    """Busca o período no FotMob e completa as lacunas com o FBref. Retorna um DataFrame."""
+    fotmob = fotmob or FotMobScraper()
+    index = index or IdentityIndex(DEFAULT_INDEX_PATH)
+
+    fotmob_rows, gaps = scrape_fotmob(league_key, start_date, end_date, fotmob, limit_games)
+    # Resolver os times do FotMob antes de casar as lacunas com o calendário do FBref
+    fotmob_frame = normalize_rows(fotmob_rows, 'fotmob', index)
+
+    fbref_rows = []
+    if gaps:
+        fotmob.log.info(f"\n🐢 FBref: {len(gaps)} jogo(s) sem dados completos no FotMob")
+        fbref_rows = scrape_fbref_gaps(league_key, gaps, index, fbref)
+
+    frames = [fotmob_frame, normalize_rows(fbref_rows, 'fbref', index)]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(['Date', 'Team', 'Player']).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Busca estatísticas no FotMob e completa as lacunas com o FBref',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--liga', type=str, required=True,
+                       choices=sorted(set(LEAGUE_IDS) & set(FOTMOB_LEAGUE_IDS)),
+                       help='Liga a buscar')
+    parser.add_argument('--inicio', type=str, required=True, help='Data de início (YYYY-MM-DD)')
+    parser.add_argument('--fim', type=str, required=True, help='Data de fim (YYYY-MM-DD)')
+    parser.add_argument('--output', type=str, default=None, help='Arquivo Excel de saída')
+    parser.add_argument('--limit', type=int, default=None, help='Limitar número de jogos')
+    parser.add_argument('--test', action='store_true', help='Modo teste - não salva arquivo')
+    parser.add_argument('--indice', type=str, default=DEFAULT_INDEX_PATH,
+                       help=f'Arquivo do índice de identidades (padrão: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--arquivo-paginas', type=str, default=None,
+                       help='Arquivar as páginas baixadas neste banco (ex: paginas.sqlite)')
+    parser.add_argument('--cache-calendario', type=str, default=DEFAULT_FIXTURES_CACHE,
+                       help=f'Diretório do cache de calendários do FotMob (padrão: {DEFAULT_FIXTURES_CACHE}; vazio desativa)')
+    args = parser.parse_args()
+    configure_cli_logging()
+
+    try:
+        start_date = pd.to_datetime(args.inicio)
+        end_date = pd.to_datetime(args.fim)
+    except:
+        print("❌ Erro: Datas inválidas. Use formato YYYY-MM-DD")
+        sys.exit(1)
+
+    print("="*70)
+    print("🔀 BUSCA COMBINADA - FOTMOB + FBREF (LACUNAS)")
+    print("="*70)
+    print(f"Liga: {FOTMOB_LEAGUE_IDS[args.liga]['name']}")
+    print(f"Período: {args.inicio} até {args.fim}")
+    print("="*70)
+
+    archive = PageArchive(args.arquivo_paginas) if args.arquivo_paginas else None
+    index = IdentityIndex(args.indice)
+    df = scrape_combined(
+        args.liga, start_date, end_date,
+        fotmob=FotMobScraper(archive=archive, fixtures_cache=args.cache_calendario or None),
+        fbref=LeagueScraper(archive=archive),
+        index=index,
+        limit_games=args.limit,
+    )
+    index.save()
+
+    if df.empty:
+        print("\n⚠️  Nenhum dado foi encontrado.")
+        sys.exit(1)
+
+    df = df.drop_duplicates(subset=['PlayerID', 'TeamID', 'Date'], keep='first')
+
+    print(f"\n✅ Total: {len(df)} registros de jogadores")
+    for source, count in df['Source'].value_counts().items():
+        print(f"  - {source}: {count}")
+
+    if args.test:
+        print("\n🧪 MODO TESTE - Primeiras linhas:")
+        print(df.head(10).to_string())
+    else:
+        output_file = args.output or (
+            f"{args.liga}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}_combinado.xlsx"
+        )
+        df.to_excel(output_file, index=False)
+        print(f"\n💾 Dados salvos em: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,30 @@ Script para buscar estatísticas usando FotMob API (alternativa ao FBref)
 Busca: MINUTES, GOALS, ASSISTS, XG, XA
 """
 
-import requests
-import pandas as pd
 import time
-from datetime import datetime
 import argparse
+import contextlib
 import sys
 import json
+import os
+import re
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+from arquivo_paginas import ArchivingSession, PageArchive, content_hash
+from armazenamento import HAS_PYARROW, PLAYER_MATCH_KEY, ColumnarStore, typed_frame
+from cache_http import PageCache, SingleFlightSession, accept_encoding
+from importacao import lazy_import
+from limite_taxa import DEFAULT_LIMIT_PATH, RateLimiter, limit_session
+from registro import configure_cli_logging, get_logger
+from saidas import DEFAULT_CHUNK_ROWS, NdjsonSink, ParquetSink, StoreSink, stream_rows
+from sessao_http2 import HAS_HTTPX, Http2Session
+
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
 
 # IDs das ligas no FotMob
 FOTMOB_LEAGUE_IDS = {
@@ -23,52 +40,495 @@ FOTMOB_LEAGUE_IDS = {
     'championship': {'id': 50, 'name': 'Championship', 'country': 'Inglaterra (Série B)'},
 }
 
+FOTMOB_API_URL = "https://www.fotmob.com/api"
+
+# Orçamento padrão da API com --workers (requisições por minuto, somando todos os processos)
+FOTMOB_REQUESTS_PER_MINUTE = 60
+
+# Diretório padrão do cache de calendários das ligas
+DEFAULT_FIXTURES_CACHE = '.cache_fotmob'
+
+# Tempo (s) antes de revalidar o calendário em cache de uma temporada em andamento
+FIXTURES_TTL = 15 * 60
+
+# Tempo (s) que o calendário da temporada atual é reaproveitado na mesma execução
+CURRENT_SEASON_TTL = 3600
+
+
+# Trechos do matchDetails usados pela extração (o resto do documento é ignorado)
+# header.status: só jogos encerrados vão para o cache de jogos (match_cache)
+MATCH_DETAIL_PATHS = [('content', 'playerStats'), ('header', 'status')]
+SHOTMAP_PATH = ('content', 'shotmap')
+
+# Eventos de chute do shotmap: (coluna, campo do FotMob, dtype)
+SHOT_FIELDS = [
+    ('ShotId', 'id', 'Int64'),
+    ('PlayerId', 'playerId', 'Int64'),
+    ('Player', 'playerName', 'string'),
+    ('TeamId', 'teamId', 'Int64'),
+    ('Period', 'period', 'string'),
+    ('Minute', 'min', 'Int64'),
+    ('MinuteAdded', 'minAdded', 'Int64'),
+    ('EventType', 'eventType', 'string'),
+    ('Situation', 'situation', 'string'),
+    ('ShotType', 'shotType', 'string'),
+    ('X', 'x', 'float64'),
+    ('Y', 'y', 'float64'),
+    ('xG', 'expectedGoals', 'float64'),
+    ('xGOT', 'expectedGoalsOnTarget', 'float64'),
+    ('IsOnTarget', 'isOnTarget', 'boolean'),
+    ('IsBlocked', 'isBlocked', 'boolean'),
+    ('IsOwnGoal', 'isOwnGoal', 'boolean'),
+]
+SHOT_DTYPES = {column: dtype for column, _, dtype in SHOT_FIELDS}
+SHOT_DTYPES.update({'MatchId': 'Int64', 'GoalMouthY': 'float64', 'GoalMouthZ': 'float64'})
+
+# Índice dos chutes no armazém: um chute por (jogo, id do chute), ordenado por jogo/jogador
+SHOT_KEY = ['MatchId', 'ShotId']
+SHOT_SORT = ['MatchId', 'PlayerId', 'Minute']
+
+_JSON_SPACE = re.compile(r'\s*')
+_JSON_DECODER = json.JSONDecoder()
+# Valores pulados sem decodificar: string, escalar (número, true, false, null) e
+# trecho sem chaves/colchetes fora de strings dentro de um objeto ou lista
+_JSON_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_JSON_SCALAR = re.compile(r'[^\s,\]}]+')
+_JSON_FLAT = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*', re.DOTALL)
+
+# Níveis de aninhamento pulados numa só busca da regex (o matchDetails tem ~10)
+_JSON_NESTING = 12
+_json_container = None
+
+
+def _container_pattern(depth):
+    """
+    Regex de um objeto/lista com até depth níveis internos (o re não tem
+    recursão). Quantificadores possessivos: sem eles o re guarda um ponto de
+    retorno por repetição e a memória cresce com o tamanho do valor.
+    """
+    string = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    plain = r'[^"{}\[\]]*+'
+    inner = string if depth == 0 else f'(?:{string}|{_container_pattern(depth - 1)})'
+    return rf'[{{\[]{plain}(?:{inner}{plain})*+[}}\]]'
+
+
+def _compile_container():
+    """Regex de _container_pattern, ou None no Python < 3.11 (sem quantificadores possessivos)"""
+    try:
+        return re.compile(_container_pattern(_JSON_NESTING), re.DOTALL)
+    except re.error:
+        return None
+
+
+def _skip_json_value(text, pos):
+    """
+    Posição após o valor que começa em text[pos], sem decodificá-lo nem montar
+    objetos. Objetos e listas são pulados numa só busca da regex (em C) até
+    _JSON_NESTING níveis; valores mais fundos (ou Python < 3.11) são
+    atravessados contando chaves/colchetes.
+    """
+    global _json_container
+    char = text[pos]
+    if char not in '{[':
+        match = (_JSON_STRING if char == '"' else _JSON_SCALAR).match(text, pos)
+        if match is None:
+            raise ValueError(f"valor JSON inválido na posição {pos}")
+        return match.end()
+    
+    if _json_container is None:
+        # Compilada no primeiro uso (não pesa na importação do script)
+        _json_container = _compile_container() or False
+    if _json_container:
+        match = _json_container.match(text, pos)
+        if match is not None:
+            return match.end()
+    
+    depth = 0
+    while pos < len(text):
+        char = text[pos]
+        if char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        else:
+            raise ValueError(f"string JSON sem fim na posição {pos}")
+        pos = _JSON_FLAT.match(text, pos + 1).end()
+    raise ValueError("documento JSON truncado")
+
+
+def _walk_json_object(text, pos, prefix, wanted, prefixes, found):
+    """
+    Percorre as chaves do objeto que começa em text[pos] ('{').
+    Retorna a posição após o objeto, ou None quando todos os caminhos já foram achados.
+    """
+    pos = _JSON_SPACE.match(text, pos + 1).end()
+    if text[pos] == '}':
+        return pos + 1
+    
+    while True:
+        key, pos = _JSON_DECODER.raw_decode(text, pos)
+        pos = _JSON_SPACE.match(text, pos).end()
+        if text[pos] != ':':
+            raise ValueError(f"':' esperado na posição {pos}")
+        pos = _JSON_SPACE.match(text, pos + 1).end()
+        
+        path = prefix + (key,)
+        if path in wanted:
+            found[path], pos = _JSON_DECODER.raw_decode(text, pos)
+        elif path in prefixes and text[pos] == '{':
+            pos = _walk_json_object(text, pos, path, wanted, prefixes, found)
+        else:
+            # Valor fora dos caminhos pedidos: pulado sem decodificar
+            pos = _skip_json_value(text, pos)
+        
+        if pos is None or len(found) == len(wanted):
+            return None
+        
+        pos = _JSON_SPACE.match(text, pos).end()
+        if text[pos] == ',':
+            pos = _JSON_SPACE.match(text, pos + 1).end()
+        elif text[pos] == '}':
+            return pos + 1
+        else:
+            raise ValueError(f"',' ou '}}' esperado na posição {pos}")
+
+
+def extract_json_paths(text, paths):
+    """
+    Decodifica apenas os trechos de um documento JSON indicados por caminhos de
+    chaves (ex: ('content', 'playerStats')), sem montar o documento inteiro.
+    Só os objetos no caminho são percorridos chave a chave; os demais valores
+    são pulados sem decodificar (ver _skip_json_value, que não valida o
+    conteúdo pulado), e a leitura para assim que todos os caminhos foram
+    achados. Caminhos ausentes ficam fora do resultado.
+    """
+    wanted = {tuple(path) for path in paths}
+    prefixes = {path[:i] for path in wanted for i in range(1, len(path))}
+    found = {}
+    pos = _JSON_SPACE.match(text, 0).end()
+    if pos < len(text) and text[pos] == '{':
+        _walk_json_object(text, pos, (), wanted, prefixes, found)
+    return found
+
+
+def trim_match_details(text, paths=MATCH_DETAIL_PATHS):
+    """matchDetails reduzido aos caminhos pedidos (mesma estrutura aninhada)"""
+    trimmed = {}
+    for path, value in extract_json_paths(text, paths).items():
+        if value is None:
+            continue
+        node = trimmed
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return trimmed
+
+
+# Modo amplo: tipo de cada estatística informado pelo FotMob -> (conversão do valor, dtype da coluna)
+_STAT_TYPES = {
+    'integer': (lambda value: int(float(value)), 'Int64'),
+    'fractionWithPercentage': (lambda value: int(float(value)), 'Int64'),
+    'double': (float, 'float64'),
+    'boolean': (bool, 'boolean'),
+}
+
+
+def compact_fixture(match):
+    """Reduz um jogo de fixtures.allMatches aos campos usados pelos scrapers"""
+    status = match.get('status') or {}
+    return {
+        'id': match.get('id'),
+        'home': {'name': (match.get('home') or {}).get('name', '')},
+        'away': {'name': (match.get('away') or {}).get('name', '')},
+        'status': {
+            'utcTime': status.get('utcTime'),
+            'finished': bool(status.get('finished')),
+            'cancelled': bool(status.get('cancelled')),
+        },
+    }
+
+
+class FixtureCache:
+    """Calendários compactos das ligas em disco (um JSON por liga e temporada)"""
+    
+    def __init__(self, directory=DEFAULT_FIXTURES_CACHE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, league_id, season):
+        season_key = season.replace('/', '-') if season else 'atual'
+        return self.directory / f"liga_{league_id}_{season_key}.json"
+    
+    def load(self, league_id, season=None):
+        path = self._path(league_id, season)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save(self, league_id, season, entry):
+        path = self._path(league_id, season)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
 class FotMobScraper:
     """Scraper para buscar dados do FotMob API"""
     
-    def __init__(self):
-        self.base_url = "https://www.fotmob.com/api"
-        self.session = requests.Session()
+    def __init__(self, session=None, delays=True, archive=None, fixtures_cache=None, match_cache=None,
+                 wide=False, shots=False, logger=None, base_url=FOTMOB_API_URL, http2=False,
+                 rate_limiter=None, workers=1):
+        # base_url: raiz da API (ex: servidor local de teste)
+        self.base_url = base_url.rstrip('/')
+        # logger: destino das mensagens de progresso (padrão: 'estatisticas.fotmob', ver registro.py)
+        self.log = logger or get_logger('fotmob')
+        # delays=False desativa as pausas de rate limiting (replay do arquivo/cache)
+        self.delays = delays
+        # wide=True: além das colunas padrão, grava todas as estatísticas do jogador (fm_*)
+        self.wide = wide
+        # shots=True: decodifica também o shotmap de cada jogo (ver extract_shots)
+        self.shots = shots
+        self.detail_paths = MATCH_DETAIL_PATHS + ([SHOTMAP_PATH] if shots else [])
+        self.archive = archive
+        # fixtures_cache: FixtureCache (ou diretório) para guardar os calendários das ligas
+        if fixtures_cache is not None and not isinstance(fixtures_cache, FixtureCache):
+            fixtures_cache = FixtureCache(fixtures_cache)
+        self.fixtures_cache = fixtures_cache
+        # match_cache: PageCache (ou diretório) com o matchDetails já reduzido por jogo
+        if match_cache is not None and not isinstance(match_cache, PageCache):
+            match_cache = PageCache(match_cache)
+        self.match_cache = match_cache
+        # rate_limiter: limite_taxa.RateLimiter compartilhado (substitui a pausa fixa por jogo)
+        self.rate_limiter = rate_limiter if delays else None
+        # workers: matchDetails buscados em paralelo em scrape_league_period
+        self.workers = max(1, workers)
+        # Índices dos calendários: (liga, temporada) -> (montado em, FixtureIndex)
+        self._fixture_indexes = {}
+        # Modo amplo: estatística -> (coluna, conversão) e coluna -> dtype, preenchidos
+        # na primeira vez que a estatística aparece (ver stats_frame)
+        self._wide_columns = {}
+        self.wide_dtypes = {}
+        if session is None and http2:
+            # HTTP/2: uma conexão multiplexa os matchDetails de todas as threads
+            session = Http2Session(prior_knowledge=self.base_url.startswith('http://'))
+        self.session = session if session is not None else requests.Session()
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json',
+            'Accept-Encoding': accept_encoding(),
             'Referer': 'https://www.fotmob.com/'
         }
         self.session.headers.update(headers)
+        
+        if self.rate_limiter is not None:
+            # Ficha do limite só para o que vai à rede (não para cache nem pedidos juntados)
+            self.session = limit_session(self.session, self.rate_limiter)
+        
+        if archive is not None:
+            # Guardar toda resposta da API no arquivo (ver reextrair.py)
+            self.session = ArchivingSession(self.session, archive)
+        
+        # Pedidos simultâneos da mesma URL (ex: calendário da liga) viram uma só requisição
+        self.session = SingleFlightSession(self.session)
+    
+    def _sleep(self, seconds):
+        """Pausa de rate limiting (ignorada quando delays=False)"""
+        if self.delays:
+            time.sleep(seconds)
+    
+    def _fetch(self, url, **kwargs):
+        """GET na sessão (o limite compartilhado, se houver, é aplicado por RateLimitedSession)"""
+        return self.session.get(url, **kwargs)
+    
+    def _fixtures_fresh(self, entry, url):
+        """Se o calendário em cache pode ser usado sem consultar a API"""
+        if self.archive is not None and url not in self.archive:
+            # Arquivando: baixar ao menos uma vez para a reextração ter o calendário
+            return False
+        if entry.get('finished'):
+            # Temporada passada encerrada: nunca muda
+            return True
+        return time.time() - entry.get('fetched_at', 0) < FIXTURES_TTL
     
     def get_league_matches(self, league_id, season=None):
-        """Busca jogos de uma liga"""
+        """
+        Busca jogos de uma liga (season: ex. '2023/2024'; None = temporada atual).
+        Com fixtures_cache, o calendário fica em disco: temporadas encerradas não
+        são baixadas de novo e a atual é revalidada (ETag/Last-Modified) após FIXTURES_TTL.
+        """
         url = f"{self.base_url}/leagues?id={league_id}&type=league"
+        if season:
+            url += f"&season={quote(season, safe='')}"
+        
+        entry = self.fixtures_cache.load(league_id, season) if self.fixtures_cache else None
+        if entry is not None and self._fixtures_fresh(entry, url):
+            return entry['fixtures']
+        
+        request_headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
         
         try:
-            response = self.session.get(url, timeout=20)
+            response = self._fetch(url, timeout=20, headers=request_headers)
+            if response.status_code == 304 and entry is not None:
+                # Não mudou desde a última busca
+                entry['fetched_at'] = time.time()
+                self.fixtures_cache.save(league_id, season, entry)
+                return entry['fixtures']
+            
             response.raise_for_status()
             data = response.json()
             
             if 'fixtures' in data and 'allMatches' in data['fixtures']:
                 matches = data['fixtures']['allMatches']
+                if self.fixtures_cache is not None and matches:
+                    matches = [compact_fixture(match) for match in matches]
+                    self.fixtures_cache.save(league_id, season, {
+                        'url': url,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'fetched_at': time.time(),
+                        # Só uma temporada explícita com todos os jogos encerrados é definitiva
+                        'finished': bool(season) and all(
+                            m['status']['finished'] or m['status']['cancelled'] for m in matches
+                        ),
+                        'fixtures': matches,
+                    })
                 return matches
             return []
             
         except Exception as e:
-            print(f"  ❌ Erro ao buscar jogos: {e}")
+            if entry is not None:
+                self.log.warning(f"  ⚠️  Erro ao atualizar jogos ({e}), usando calendário em cache")
+                return entry['fixtures']
+            self.log.error(f"  ❌ Erro ao buscar jogos: {e}")
             return []
     
+    def get_fixture_index(self, league_id, season=None):
+        """
+        Calendário da liga indexado por data (FixtureIndex), montado uma vez por
+        liga/temporada neste scraper. Temporadas encerradas ficam em memória enquanto ele
+        existe; as demais (ex: a atual, season=None) são remontadas após CURRENT_SEASON_TTL.
+        """
+        key = (league_id, season)
+        cached = self._fixture_indexes.get(key)
+        if cached is not None:
+            built_at, index = cached
+            if index.finished or time.monotonic() - built_at < CURRENT_SEASON_TTL:
+                return index
+        
+        index = FixtureIndex(self.get_league_matches(league_id, season))
+        if len(index):
+            self._fixture_indexes[key] = (time.monotonic(), index)
+        return index
+    
+    def get_period_fixtures(self, league_id, start_date, end_date):
+        """
+        Jogos do período [(jogo, data)], a partir do calendário de cada temporada que
+        ele cobre (ver period_seasons): temporadas passadas usam o próprio calendário,
+        que fica em cache em disco e nunca é baixado de novo depois de encerrado.
+        """
+        fixtures = []
+        seen = set()
+        for season in period_seasons(start_date, end_date):
+            index = self.get_fixture_index(league_id, season)
+            if season is not None and not len(index):
+                # Temporada explícita indisponível (ex: arquivo gravado quando era a atual)
+                index = self.get_fixture_index(league_id)
+            for match, match_date in index.window(start_date, end_date):
+                if match.get('id') not in seen:
+                    seen.add(match.get('id'))
+                    fixtures.append((match, match_date))
+        return fixtures
+    
     def get_match_details(self, match_id):
-        """Busca detalhes de um jogo específico"""
+        """
+        Busca detalhes de um jogo específico.
+        Só os trechos de self.detail_paths são decodificados; o retorno tem a
+        mesma estrutura do matchDetails (ex: data['content']['playerStats']).
+        """
         url = f"{self.base_url}/matchDetails?matchId={match_id}"
+        paths = [list(path) for path in self.detail_paths]
+        
+        if self.match_cache is not None:
+            cached = self.match_cache.get(url)
+            if cached is not None:
+                data = json.loads(cached[0])
+                # Só serve se o trecho guardado tem todos os caminhos pedidos agora
+                if all(path in data.get('_paths', []) for path in paths):
+                    return data
         
         try:
-            time.sleep(1)  # Rate limiting
-            response = self.session.get(url, timeout=20)
+            if self.rate_limiter is None:
+                self._sleep(1)  # Rate limiting
+            response = self._fetch(url, timeout=20)
             response.raise_for_status()
-            return response.json()
+            try:
+                # O corpo já está inteiro na memória (o hash usa response.content):
+                # decodificar o texto uma vez custa menos que montar o documento
+                data = trim_match_details(response.text, self.detail_paths)
+            except ValueError:
+                # Documento inesperado: decodificar inteiro
+                data = response.json()
+            if isinstance(data, dict):
+                # Hash da resposta original, copiado para cada registro extraído
+                data['_source_hash'] = content_hash(response.content)
+                data['_match_id'] = match_id
+                data['_paths'] = paths
+                finished = ((data.get('header') or {}).get('status') or {}).get('finished')
+                if self.match_cache is not None and data.get('content') and finished:
+                    # Jogo ao vivo ou não iniciado: playerStats ainda parcial, não guardar
+                    self.match_cache.put(url, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            return data
             
         except Exception as e:
-            print(f"    ❌ Erro ao buscar detalhes do jogo {match_id}: {e}")
+            self.log.error(f"    ❌ Erro ao buscar detalhes do jogo {match_id}: {e}")
             return None
     
+    def iter_match_details(self, match_ids):
+        """
+        matchDetails de cada jogo, na ordem de match_ids. Com workers > 1 as
+        requisições correm em paralelo (limitadas pelo rate_limiter, se houver).
+        """
+        if self.workers <= 1:
+            for match_id in match_ids:
+                yield self.get_match_details(match_id)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Poucos pedidos adiantados (não o período inteiro): a memória não cresce com o período
+            pending = deque()
+            for match_id in match_ids:
+                pending.append(executor.submit(self.get_match_details, match_id))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def wide_column(self, stat_key, stat_value, stat_info):
+        """Coluna do modo amplo para uma estatística (fm_<chave do FotMob>) e sua conversão"""
+        key = stat_value.get('key') or stat_key
+        column = f"fm_{re.sub(r'[^0-9a-z]+', '_', str(key).lower()).strip('_')}"
+        convert, dtype = _STAT_TYPES.get(stat_info.get('type'), (float, 'float64'))
+        self.wide_dtypes[column] = dtype
+        if 'total' in stat_info:
+            self.wide_dtypes[f"{column}_total"] = dtype
+        return self._wide_columns.setdefault(stat_key, (column, convert))
+    
+    def stats_frame(self, rows):
+        """DataFrame dos registros com as colunas do modo amplo tipadas (Int64/float64/boolean)"""
+        return typed_frame(rows, self.wide_dtypes)
+    
     def extract_player_stats(self, match_data, match_date, home_team, away_team):
         """Extrai estatísticas de jogadores de um jogo"""
         player_stats = []
@@ -120,6 +580,9 @@ class FotMobScraper:
             has_saves = False
             has_goals_conceded = False
             
+            # Modo amplo: todas as estatísticas, coletadas na mesma passada
+            wide_stats = {} if self.wide else None
+            
             # Extrair do array stats
             if 'stats' in player_data and isinstance(player_data['stats'], list):
                 for stat_group in player_data['stats']:
@@ -134,6 +597,15 @@ class FotMobScraper:
                                     value = stat_info['value']
                                     key_lower = stat_key.lower()
                                     
+                                    if wide_stats is not None:
+                                        column, convert = self._wide_columns.get(stat_key) or self.wide_column(stat_key, stat_value, stat_info)
+                                        try:
+                                            wide_stats[column] = convert(value)
+                                            if 'total' in stat_info:
+                                                wide_stats[f"{column}_total"] = convert(stat_info['total'])
+                                        except (TypeError, ValueError):
+                                            pass
+                                    
                                     # Identificar estatísticas de goleiro
                                     if 'save' in key_lower and 'accurate' not in key_lower:
                                         has_saves = True
@@ -231,102 +703,196 @@ class FotMobScraper:
                 'Location': location,
                 'Year': match_date_naive.year,
                 'Month': match_date_naive.month,
-                'adj': 0
+                'adj': 0,
+                'SourceHash': match_data.get('_source_hash'),
+                'MatchId': match_data.get('_match_id'),
+                'PlayerId': player_data.get('id', player_id),
             }
+            if wide_stats:
+                stats.update(wide_stats)
             player_stats.append(stats)
         
         return player_stats
 
+    def extract_shots(self, match_data, match_date):
+        """
+        Eventos de chute do shotmap de um jogo (coordenadas, xG, xGOT, situação,
+        parte do corpo), um registro por chute. Requer shots=True.
+        """
+        shotmap = (match_data.get('content') or {}).get('shotmap') or {}
+        shots = shotmap.get('shots') if isinstance(shotmap, dict) else None
+        if not shots:
+            return []
+        
+        # Nomes dos times pelo playerStats do mesmo jogo
+        teams = {}
+        for player_data in ((match_data.get('content') or {}).get('playerStats') or {}).values():
+            if player_data.get('teamId') is not None:
+                teams[player_data['teamId']] = player_data.get('teamName', '')
+        
+        if hasattr(match_date, 'tz') and match_date.tz is not None:
+            match_date = match_date.tz_localize(None)
+        
+        shot_rows = []
+        for shot in shots:
+            row = {column: shot.get(field) for column, field, _ in SHOT_FIELDS}
+            team_id = row['TeamId']
+            row['MatchId'] = match_data.get('_match_id')
+            row['Date'] = match_date
+            row['Team'] = teams.get(team_id, '')
+            row['Opponent'] = next((name for tid, name in teams.items() if tid != team_id), '')
+            goal_mouth = shot.get('onGoalShot') or {}
+            row['GoalMouthY'] = goal_mouth.get('x')
+            row['GoalMouthZ'] = goal_mouth.get('y')
+            shot_rows.append(row)
+        return shot_rows
+
+
+def shots_frame(shot_rows):
+    """DataFrame dos chutes com os tipos de SHOT_FIELDS, ordenado pelo índice jogo/jogador"""
+    df = typed_frame(shot_rows, SHOT_DTYPES)
+    if df.empty:
+        return df
+    return df.sort_values(SHOT_SORT).reset_index(drop=True)
+
+
+def parse_match_time(match):
+    """Data/hora (UTC, sem timezone) de um jogo da lista da liga, ou None"""
+    try:
+        match_time = match['status']['utcTime']
+        # utcTime pode ser string ISO ou timestamp
+        if isinstance(match_time, str):
+            match_date = pd.Timestamp(match_time)
+        else:
+            match_date = pd.Timestamp(match_time, unit='ms', tz='UTC')
+    except (KeyError, TypeError, ValueError):
+        return None
+    if match_date.tz is not None:
+        match_date = match_date.tz_convert('UTC').tz_localize(None)
+    return match_date
+
+
+class FixtureIndex:
+    """Jogos de uma liga ordenados por data, com recorte de janelas por busca binária"""
+    
+    def __init__(self, matches):
+        entries = []
+        for match in matches:
+            match_date = parse_match_time(match)
+            if match_date is not None:
+                entries.append((match_date.value, match_date, match))
+        entries.sort(key=lambda entry: entry[0])
+        
+        self.timestamps = [entry[0] for entry in entries]
+        self.dates = [entry[1] for entry in entries]
+        self.matches = [entry[2] for entry in entries]
+        self.match_ids = [match.get('id') for match in self.matches]
+        # Todos os jogos encerrados ou cancelados: o calendário não muda mais
+        self.finished = bool(self.matches) and all(
+            (match.get('status') or {}).get('finished') or (match.get('status') or {}).get('cancelled')
+            for match in self.matches
+        )
+    
+    def __len__(self):
+        return len(self.matches)
+    
+    def window(self, start_date, end_date):
+        """Jogos entre start_date e end_date (datas inclusivas). Retorna [(jogo, data)]."""
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+        lo = bisect_left(self.timestamps, start.value)
+        hi = bisect_left(self.timestamps, end.value, lo)
+        return list(zip(self.matches[lo:hi], self.dates[lo:hi]))
+
+
+def season_of(date):
+    """Temporada do FotMob que contém a data (ex: '2024/2025'; as ligas começam em julho/agosto)"""
+    year = date.year if date.month >= 7 else date.year - 1
+    return f"{year}/{year + 1}"
 
-def scrape_league_period(league_key, start_date, end_date, scraper, limit_games=None):
-    """Busca estatísticas de um período específico"""
+
+def period_seasons(start_date, end_date, today=None):
+    """
+    Temporadas que cobrem o período, em ordem. A temporada em andamento vira None
+    (calendário atual da API, revalidado pelo TTL); as outras são explícitas.
+    """
+    current = season_of(today if today is not None else pd.Timestamp.now())
+    seasons = []
+    for year in range(int(season_of(start_date)[:4]), int(season_of(end_date)[:4]) + 1):
+        season = f"{year}/{year + 1}"
+        seasons.append(None if season == current else season)
+    return seasons
+
+
+def filter_matches_by_period(matches, start_date, end_date):
+    """Jogos entre start_date e end_date (comparando apenas a data). Retorna [(jogo, data)]."""
+    return FixtureIndex(matches).window(start_date, end_date)
+
+
+def iter_league_period(league_key, start_date, end_date, scraper, limit_games=None, shot_rows=None):
+    """
+    Busca estatísticas de um período específico, entregando os registros jogo a
+    jogo (uma lista por jogo; ver saidas.py).
+    shot_rows: lista (ou saída de saidas.py) que recebe os chutes de cada jogo
+    (scraper com shots=True)
+    """
     if league_key not in FOTMOB_LEAGUE_IDS:
-        print(f"❌ Liga '{league_key}' não suportada")
-        return []
+        scraper.log.error(f"❌ Liga '{league_key}' não suportada")
+        return
     
     league_info = FOTMOB_LEAGUE_IDS[league_key]
     league_id = league_info['id']
     league_name = league_info['name']
     
-    print(f"\n📊 Buscando jogos da {league_name}...")
+    scraper.log.info(f"\n📊 Buscando jogos da {league_name}...")
     
-    # Buscar todos os jogos da liga
-    matches = scraper.get_league_matches(league_id)
+    # Calendário de cada temporada do período (indexado por data uma vez por temporada)
+    filtered_matches = scraper.get_period_fixtures(league_id, start_date, end_date)
     
-    if not matches:
-        print("  ❌ Nenhum jogo encontrado")
-        return []
+    if not filtered_matches:
+        scraper.log.warning("  ⚠️  Nenhum jogo encontrado no período")
+        return
     
-    print(f"  ✅ Encontrados {len(matches)} jogos")
-    
-    # Filtrar jogos por data
-    filtered_matches = []
-    for match in matches:
-        try:
-            # Tentar extrair data do jogo
-            if 'status' in match and 'utcTime' in match['status']:
-                match_time_str = match['status']['utcTime']
-                # utcTime pode ser string ISO ou timestamp
-                if isinstance(match_time_str, str):
-                    match_date = pd.to_datetime(match_time_str)
-                else:
-                    match_date = datetime.fromtimestamp(match_time_str / 1000)
-                
-                # Normalizar para comparar apenas a data (sem hora)
-                match_date_normalized = match_date.normalize() if hasattr(match_date, 'normalize') else match_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                start_normalized = start_date.normalize() if hasattr(start_date, 'normalize') else start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                end_normalized = end_date.normalize() if hasattr(end_date, 'normalize') else end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                
-                # Se match_date é timezone-aware, converter para naive
-                if hasattr(match_date_normalized, 'tz_localize') and match_date_normalized.tz is not None:
-                    match_date_normalized = match_date_normalized.tz_localize(None)
-                
-                if start_normalized <= match_date_normalized <= end_normalized:
-                    filtered_matches.append(match)
-        except Exception as e:
-            continue
-    
-    print(f"  📅 {len(filtered_matches)} jogos no período {start_date.strftime('%Y-%m-%d')} a {end_date.strftime('%Y-%m-%d')}")
+    scraper.log.info(f"  📅 {len(filtered_matches)} jogos no período {start_date.strftime('%Y-%m-%d')} a {end_date.strftime('%Y-%m-%d')}")
     
     if limit_games:
         filtered_matches = filtered_matches[:limit_games]
-        print(f"  ⚠️  Limitando a {limit_games} jogos")
+        scraper.log.warning(f"  ⚠️  Limitando a {limit_games} jogos")
     
-    all_player_stats = []
+    # Detalhes dos jogos (em paralelo com scraper.workers > 1)
+    details = scraper.iter_match_details([match.get('id') for match, _ in filtered_matches])
     
-    for i, match in enumerate(filtered_matches, 1):
-        match_id = match.get('id')
+    for i, ((match, match_date), match_data) in enumerate(zip(filtered_matches, details), 1):
         home_team = match.get('home', {}).get('name', '')
         away_team = match.get('away', {}).get('name', '')
         
-        try:
-            match_time_str = match['status']['utcTime']
-            if isinstance(match_time_str, str):
-                match_date = pd.to_datetime(match_time_str)
-            else:
-                match_date = datetime.fromtimestamp(match_time_str / 1000)
-        except:
-            continue
-        
-        print(f"\n  [{i}/{len(filtered_matches)}] Processando: {home_team} vs {away_team} ({match_date.strftime('%Y-%m-%d')})")
-        
-        # Buscar detalhes do jogo
-        match_data = scraper.get_match_details(match_id)
+        scraper.log.info(f"\n  [{i}/{len(filtered_matches)}] Processando: {home_team} vs {away_team} ({match_date.strftime('%Y-%m-%d')})")
         
         if not match_data:
-            print(f"    ⚠️  Não foi possível obter dados do jogo")
+            scraper.log.warning(f"    ⚠️  Não foi possível obter dados do jogo")
             continue
         
         # Extrair estatísticas
         player_stats = scraper.extract_player_stats(match_data, match_date, home_team, away_team)
         
         if player_stats:
-            print(f"    ✅ {len(player_stats)} jogadores processados")
-            all_player_stats.extend(player_stats)
+            scraper.log.info(f"    ✅ {len(player_stats)} jogadores processados")
         else:
-            print(f"    ⚠️  Nenhuma estatística encontrada")
-    
-    return all_player_stats
+            scraper.log.warning(f"    ⚠️  Nenhuma estatística encontrada")
+        
+        if shot_rows is not None and scraper.shots:
+            match_shots = scraper.extract_shots(match_data, match_date)
+            shot_rows.extend(match_shots)
+            scraper.log.info(f"    🎯 {len(match_shots)} chutes")
+        
+        if player_stats:
+            yield player_stats
+
+
+def scrape_league_period(league_key, start_date, end_date, scraper, limit_games=None, shot_rows=None):
+    """Busca estatísticas de um período específico numa lista (ver iter_league_period)"""
+    return [row for rows in iter_league_period(league_key, start_date, end_date, scraper, limit_games, shot_rows)
+            for row in rows]
 
 
 def main():
@@ -346,6 +912,7 @@ Ligas disponíveis:
 Exemplos:
   python buscar_estatisticas_fotmob.py --liga bundesliga --inicio 2024-09-01 --fim 2024-09-30
   python buscar_estatisticas_fotmob.py --liga bundesliga --inicio 2024-09-01 --fim 2024-09-30 --limit 5 --test
+  python buscar_estatisticas_fotmob.py --liga bundesliga --inicio 2024-08-01 --fim 2025-05-31 --ndjson > bundesliga.ndjson
         """
     )
     
@@ -362,8 +929,48 @@ Exemplos:
                        help='Limitar número de jogos')
     parser.add_argument('--test', action='store_true',
                        help='Modo teste - não salva arquivo')
+    parser.add_argument('--arquivo-paginas', type=str, default=None,
+                       help='Arquivar as respostas da API neste banco (ex: paginas.sqlite)')
+    parser.add_argument('--cache-calendario', type=str, default=DEFAULT_FIXTURES_CACHE,
+                       help=f'Diretório do cache de calendários das ligas (padrão: {DEFAULT_FIXTURES_CACHE}; vazio desativa)')
+    parser.add_argument('--cache-jogos', type=str, default=None,
+                       help='Guardar o matchDetails reduzido (só playerStats) de cada jogo neste diretório')
+    parser.add_argument('--amplo', action='store_true',
+                       help='Extrair todas as estatísticas de cada jogador (colunas fm_*)')
+    parser.add_argument('--armazem', type=str, default=None,
+                       help='Gravar também no armazém colunar (Parquet) neste diretório (requer pyarrow)')
+    parser.add_argument('--chutes', action='store_true',
+                       help='Extrair também os chutes do shotmap (conjunto "chutes" do armazém; requer --armazem)')
+    parser.add_argument('--http2', action='store_true',
+                       help='Usar HTTP/2 (httpx): uma conexão para todos os matchDetails')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='matchDetails buscados em paralelo (padrão: 1)')
+    parser.add_argument('--base-url', type=str, default=FOTMOB_API_URL,
+                       help=f'Raiz da API (padrão: {FOTMOB_API_URL}; ex: servidor local de teste)')
+    parser.add_argument('--limite-global', type=float, default=None,
+                       help=f'Requisições por minuto na API somando todos os processos (padrão com --workers: {FOTMOB_REQUESTS_PER_MINUTE})')
+    parser.add_argument('--limite-arquivo', type=str, default=DEFAULT_LIMIT_PATH,
+                       help=f'Banco do limite global compartilhado (padrão: {DEFAULT_LIMIT_PATH})')
+    parser.add_argument('--ndjson', action='store_true',
+                       help='Escrever os registros em NDJSON na saída padrão, jogo a jogo (sem planilha; mensagens vão para stderr)')
+    parser.add_argument('--parquet', type=str, default=None,
+                       help='Gravar os registros em blocos Parquet neste diretório durante a busca (sem planilha)')
+    parser.add_argument('--bloco', type=int, default=DEFAULT_CHUNK_ROWS,
+                       help=f'Registros por bloco gravado no --parquet/--armazem em fluxo (padrão: {DEFAULT_CHUNK_ROWS})')
     
     args = parser.parse_args()
+    # NDJSON na saída padrão: as mensagens vão para stderr
+    ndjson_stream = sys.stdout
+    if args.ndjson:
+        sys.stdout = sys.stderr
+    configure_cli_logging()
+    streaming = args.ndjson or args.parquet is not None
+    
+    if args.chutes and not args.armazem:
+        parser.error('--chutes requer --armazem')
+    if args.http2 and not HAS_HTTPX:
+        print('❌ httpx[http2] não está instalado. Instale com: pip install "httpx[http2]"')
+        sys.exit(1)
     
     print("="*70)
     print("🔍 BUSCADOR DE ESTATÍSTICAS - FOTMOB API")
@@ -380,18 +987,62 @@ Exemplos:
         print("❌ Erro: Datas inválidas. Use formato YYYY-MM-DD")
         sys.exit(1)
     
-    scraper = FotMobScraper()
+    archive = PageArchive(args.arquivo_paginas) if args.arquivo_paginas else None
+    if args.parquet and not HAS_PYARROW:
+        print("❌ pyarrow não está instalado. Instale com: pip install pyarrow")
+        sys.exit(1)
+    store = None
+    if args.armazem:
+        if not HAS_PYARROW:
+            print("❌ pyarrow não está instalado. Instale com: pip install pyarrow")
+            sys.exit(1)
+        store = ColumnarStore(args.armazem)
+    
+    rate_limiter = None
+    if args.limite_global or args.workers > 1:
+        rate_limiter = RateLimiter(args.limite_arquivo, args.limite_global or FOTMOB_REQUESTS_PER_MINUTE,
+                                   burst=args.workers)
+    
+    scraper = FotMobScraper(archive=archive, fixtures_cache=args.cache_calendario or None,
+                            match_cache=args.cache_jogos, wide=args.amplo, shots=args.chutes,
+                            base_url=args.base_url, http2=args.http2, rate_limiter=rate_limiter,
+                            workers=args.workers)
     
     # Buscar dados
     print("\n🚀 Iniciando busca...")
-    all_stats = scrape_league_period(args.liga, start_date, end_date, scraper, args.limit)
+    
+    if streaming:
+        # Registros gravados jogo a jogo / em blocos, sem juntar o período na memória
+        sinks = []
+        if args.parquet:
+            sinks.append(ParquetSink(args.parquet, scraper.stats_frame, chunk_rows=args.bloco))
+        if store is not None:
+            sinks.append(StoreSink(store, 'fotmob', args.liga, scraper.stats_frame, chunk_rows=args.bloco))
+        if args.ndjson:
+            sinks.append(NdjsonSink(ndjson_stream))
+        shot_sink = None
+        if args.chutes:
+            shot_sink = StoreSink(store, 'chutes', args.liga, shots_frame, key=SHOT_KEY, sort_by=SHOT_SORT,
+                                  chunk_rows=args.bloco)
+        with shot_sink or contextlib.nullcontext():
+            batches = iter_league_period(args.liga, start_date, end_date, scraper, args.limit, shot_sink)
+            total = stream_rows(batches, sinks)
+        print(f"\n✅ Total: {total} registros de jogadores")
+        if shot_sink is not None:
+            print(f"🎯 Chutes: {shot_sink.rows_written} eventos ({Path(args.armazem) / 'chutes'})")
+        if not total:
+            sys.exit(1)
+        return
+    
+    shot_rows = [] if args.chutes else None
+    all_stats = scrape_league_period(args.liga, start_date, end_date, scraper, args.limit, shot_rows)
     
     if not all_stats:
         print("\n⚠️  Nenhum dado foi encontrado.")
         sys.exit(1)
     
     # Criar DataFrame
-    df = pd.DataFrame(all_stats)
+    df = scraper.stats_frame(all_stats)
     
     # Remover duplicatas
     initial_count = len(df)
@@ -423,6 +1074,14 @@ Exemplos:
         
         df.to_excel(output_file, index=False)
         print(f"\n💾 Dados salvos em: {output_file}")
+        
+        if store is not None:
+            partitions = store.append('fotmob', df, args.liga, key=PLAYER_MATCH_KEY)
+            print(f"🗄️  Armazém: {partitions} partição(ões) gravada(s) em {Path(args.armazem) / 'fotmob'}")
+            
+            if shot_rows:
+                partitions = store.append('chutes', shots_frame(shot_rows), args.liga, key=SHOT_KEY, sort_by=SHOT_SORT)
+                print(f"🎯 Chutes: {len(shot_rows)} eventos em {partitions} partição(ões) ({Path(args.armazem) / 'chutes'})")
 
 
 if __name__ == "__main__":
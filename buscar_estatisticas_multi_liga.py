@@ -11,22 +11,31 @@ Script genérico para buscar estatísticas de jogadores de múltiplas ligas:
 Estatísticas: MINUTES, GOALS, ASSISTS, XG e XA
 """
 
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 import time
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import argparse
 import sys
 
-# Tentar importar cloudscraper
-try:
-    import cloudscraper
-    HAS_CLOUDSCRAPER = True
-except ImportError:
-    HAS_CLOUDSCRAPER = False
+from armazenamento import HAS_PYARROW, PLAYER_MATCH_KEY, ColumnarStore, typed_frame
+from arquivo_paginas import ArchivingSession, PageArchive, content_hash
+from cache_http import SingleFlightSession, accept_encoding
+from importacao import lazy_import, module_available
+from limite_taxa import DEFAULT_LIMIT_PATH, RateLimiter, limit_session
+from registro import configure_cli_logging, get_logger
+from saidas import DEFAULT_CHUNK_ROWS, NdjsonSink, ParquetSink, StoreSink, stream_rows
+
+# Módulos pesados carregados só quando usados (--help e erros de argumentos saem na hora)
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
+
+# Verificar se o cloudscraper está instalado (sem importá-lo)
+HAS_CLOUDSCRAPER = module_available('cloudscraper')
+if HAS_CLOUDSCRAPER:
+    cloudscraper = lazy_import('cloudscraper')
 
 # IDs das ligas no fbref.com
 LEAGUE_IDS = {
@@ -39,13 +48,139 @@ LEAGUE_IDS = {
     'championship': {'id': 10, 'name': 'Championship', 'country': 'Inglaterra (Série B)'},
 }
 
+# Outras tabelas por jogador da página do jogo (id: stats_<time>_<tipo> ou keeper_stats_<time>)
+EXTRA_TABLES = ['passing', 'passing_types', 'defense', 'possession', 'misc', 'keeper']
+
+# Colunas das tabelas extras que já estão no registro principal ou não são estatísticas
+_EXTRA_SKIP_STATS = {'player', 'shirtnumber', 'nationality', 'position', 'age', 'minutes'}
+
+# Segundos em que uma página recém-baixada é reaproveitada (a página do jogo é
+# pedida em seguida para o mandante e para o visitante)
+PAGE_LINGER_SECONDS = 60
+
+# Expressões da tabela de jogos (compiladas uma vez, usadas em cada linha)
+_SCHEDULE_TABLE_ID_RE = re.compile(r'sched.*')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_DATE_ONLY_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_SCORE_RE = re.compile(r'^\d+[\s\-:]\d+$')
+_DATE_ONLY_MATCH_URL_RE = re.compile(r'/matches/\d{4}-\d{2}-\d{2}$')
+_DIGITS_RE = re.compile(r'^\d+$')
+_CLOCK_RE = re.compile(r'\d{2}:\d{2}')
+_WEEKDAYS = {'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'}
+
+# Segundos em que o índice da tabela de jogos de uma temporada é reaproveitado
+# (jogos disputados depois disso entram na próxima montagem)
+SCHEDULE_TTL_SECONDS = 3600
+
+
+def parse_tables(content):
+    """
+    Árvore só com as tabelas da página (cabeçalho, menus e scripts não viram nós).
+    Quem termina de usar a árvore chama release_tree.
+    """
+    return bs4.BeautifulSoup(content, 'html.parser', parse_only=bs4.SoupStrainer('table'))
+
+
+def release_tree(soup):
+    """
+    Libera a árvore na hora. As árvores do BeautifulSoup têm referências
+    circulares e, sem isto, só saem da memória quando o coletor de ciclos roda.
+    (soup.decompose() sozinho não alcança os filhos de uma árvore com parse_only)
+    """
+    for element in list(soup.contents):
+        if isinstance(element, bs4.Tag):
+            element.decompose()
+    soup.decompose()
+
+
+def parse_stat_value(text):
+    """Valor numérico de uma célula (int, float ou None se vazia/não numérica)"""
+    text = text.replace(',', '').rstrip('%')
+    if not text:
+        return None
+    try:
+        return float(text) if '.' in text else int(text)
+    except ValueError:
+        return None
+
+
+def parse_player_table(table, prefix, dtypes):
+    """
+    Linhas de uma tabela por jogador: {jogador: {<prefixo>_<data-stat>: valor}}.
+    dtypes ({coluna: dtype}) recebe o tipo de cada coluna conforme os valores vistos
+    (float64 se algum valor tem casas decimais, senão Int64).
+    """
+    players = {}
+    body = table.find('tbody') or table
+    for row in body.find_all('tr'):
+        row_class = str(row.get('class', []))
+        if 'thead' in row_class or 'spacer' in row_class:
+            continue
+        
+        player_name = None
+        values = {}
+        for cell in row.find_all(['td', 'th']):
+            data_stat = cell.get('data-stat', '')
+            if data_stat == 'player':
+                player_name = cell.get_text(strip=True)
+            elif data_stat and data_stat not in _EXTRA_SKIP_STATS:
+                column = f"{prefix}_{data_stat}"
+                value = parse_stat_value(cell.get_text(strip=True))
+                values[column] = value
+                if isinstance(value, float):
+                    dtypes[column] = 'float64'
+                elif value is not None:
+                    dtypes.setdefault(column, 'Int64')
+        
+        if player_name:
+            players[player_name] = values
+    return players
+
+
+def extract_extra_tables(soup, summary_table_id, kinds, dtypes):
+    """
+    Tabelas extras do mesmo time da tabela summary (stats_<time>_summary), já parseada.
+    Retorna {jogador: {coluna: valor}} com as colunas de todas as tabelas pedidas
+    (tipos das colunas em dtypes, ver parse_player_table).
+    """
+    match = re.match(r'stats_(.+)_summary$', summary_table_id or '')
+    if not match:
+        return {}
+    team_id = match.group(1)
+    
+    players = {}
+    for kind in kinds:
+        table_id = f"keeper_stats_{team_id}" if kind == 'keeper' else f"stats_{team_id}_{kind}"
+        table = soup.find('table', {'id': table_id})
+        if table is None:
+            continue
+        for player_name, values in parse_player_table(table, kind, dtypes).items():
+            players.setdefault(player_name, {}).update(values)
+    return players
+
+
 class LeagueScraper:
     """Scraper genérico para buscar dados de qualquer liga do fbref.com"""
     
-    def __init__(self):
+    def __init__(self, session=None, delays=True, archive=None, extra_tables=None, rate_limiter=None,
+                 logger=None):
         self.base_url = "https://fbref.com"
+        # logger: destino das mensagens de progresso (padrão: 'estatisticas.fbref', ver registro.py)
+        self.log = logger or get_logger('fbref')
+        # delays=False desativa as pausas de rate limiting (replay de fixtures/cache)
+        self.delays = delays
+        # rate_limiter: limite_taxa.RateLimiter compartilhado entre processos; substitui
+        # as pausas fixas entre páginas por um orçamento global de requisições
+        self.rate_limiter = rate_limiter if delays else None
+        # extra_tables: tabelas de EXTRA_TABLES a juntar em cada registro (mesma página)
+        self.extra_tables = list(extra_tables or [])
+        # Tipo de cada coluna das tabelas extras (Int64 ou float64), conforme os valores vistos
+        self.extra_dtypes = {}
         
-        if HAS_CLOUDSCRAPER:
+        if session is not None:
+            # Sessão injetada (ex: cache_http.CachedSession para replay offline)
+            self.session = session
+        elif HAS_CLOUDSCRAPER:
             # Usar cloudscraper com configurações otimizadas para evitar bloqueio
             try:
                 self.session = cloudscraper.create_scraper(
@@ -67,7 +202,7 @@ class LeagueScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': accept_encoding(),
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -82,8 +217,68 @@ class LeagueScraper:
         if hasattr(self.session, 'headers'):
             self.session.headers.update(headers)
         
+        if self.rate_limiter is not None:
+            # Ficha do limite global só para o que vai à rede (não para cache nem pedidos juntados)
+            self.session = limit_session(self.session, self.rate_limiter)
+        
+        if archive is not None:
+            # Guardar toda página baixada no arquivo (ver reextrair.py)
+            self.session = ArchivingSession(self.session, archive)
+        
+        # Pedidos simultâneos (ou repetidos em seguida) da mesma página viram uma só requisição
+        self.session = SingleFlightSession(self.session, linger=PAGE_LINGER_SECONDS)
+        
+        # Índices das tabelas de jogos: URL da temporada -> (montado em, ScheduleIndex)
+        self._schedules = {}
         self._initialized = False
     
+    def _sleep(self, seconds):
+        """Pausa de rate limiting (ignorada quando delays=False)"""
+        if self.delays:
+            time.sleep(seconds)
+    
+    def _pace(self, seconds):
+        """Pausa fixa entre páginas (dispensada quando há limite global)"""
+        if self.rate_limiter is None:
+            self._sleep(seconds)
+    
+    def _fetch(self, url, timeout=20):
+        """GET na sessão (o limite global, se houver, é aplicado por RateLimitedSession)"""
+        return self.session.get(url, timeout=timeout)
+    
+    def _penalize(self, url, seconds):
+        """Espera após 403/429; com limite global, todos os processos esperam juntos"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(urlparse(url).netloc, seconds)
+        else:
+            self._sleep(seconds)
+    
+    def get_schedule_index(self, url):
+        """
+        Índice da tabela de jogos da temporada (ScheduleIndex), baixado e montado
+        uma vez por SCHEDULE_TTL_SECONDS. None se a página ou a tabela faltarem.
+        """
+        cached = self._schedules.get(url)
+        if cached is not None and time.monotonic() - cached[0] < SCHEDULE_TTL_SECONDS:
+            return cached[1]
+        
+        self.log.info(f"  Acessando: {url}")
+        response = self._get_with_retry(url, max_retries=3, timeout=20)
+        if response is None:
+            self.log.error(f"  ❌ Não foi possível acessar a URL após múltiplas tentativas")
+            return None
+        
+        soup = parse_tables(response.content)
+        del response
+        try:
+            index = ScheduleIndex.from_soup(soup, self)
+        finally:
+            release_tree(soup)
+        if index is None:
+            self.log.warning(f"  ⚠️  Tabela de jogos não encontrada")
+        self._schedules[url] = (time.monotonic(), index)
+        return index
+    
     def _ensure_initialized(self):
         """Garante que a sessão foi inicializada"""
         if self._initialized:
@@ -91,35 +286,35 @@ class LeagueScraper:
         
         try:
             if HAS_CLOUDSCRAPER:
-                print("  ✅ Usando cloudscraper")
+                self.log.info("  ✅ Usando cloudscraper")
             else:
-                print("  ⚠️  Usando requests padrão")
+                self.log.warning("  ⚠️  Usando requests padrão")
             
-            print("  🔄 Estabelecendo conexão...")
+            self.log.info("  🔄 Estabelecendo conexão...")
             # Primeiro acesso com delay
-            time.sleep(2)
-            initial_response = self.session.get(self.base_url, timeout=20)
+            self._pace(2)
+            initial_response = self._fetch(self.base_url, timeout=20)
             
             if initial_response.status_code == 200:
-                print("  ✅ Conexão estabelecida")
+                self.log.info("  ✅ Conexão estabelecida")
             elif initial_response.status_code == 403:
-                print("  ⚠️  Erro 403 na inicialização. Tentando novamente...")
-                time.sleep(5)
+                self.log.warning("  ⚠️  Erro 403 na inicialização. Tentando novamente...")
+                self._penalize(self.base_url, 5)
                 # Atualizar referer
                 self.session.headers.update({
                     'Referer': self.base_url,
                     'Origin': self.base_url
                 })
-                initial_response = self.session.get(self.base_url, timeout=20)
+                initial_response = self._fetch(self.base_url, timeout=20)
                 if initial_response.status_code == 200:
-                    print("  ✅ Conexão estabelecida na segunda tentativa")
+                    self.log.info("  ✅ Conexão estabelecida na segunda tentativa")
                 else:
-                    print(f"  ⚠️  Status: {initial_response.status_code}")
+                    self.log.warning(f"  ⚠️  Status: {initial_response.status_code}")
             else:
-                print(f"  ⚠️  Status: {initial_response.status_code}")
+                self.log.warning(f"  ⚠️  Status: {initial_response.status_code}")
             self._initialized = True
         except Exception as e:
-            print(f"  ⚠️  Aviso na conexão: {e}")
+            self.log.warning(f"  ⚠️  Aviso na conexão: {e}")
             self._initialized = True
     
     def _get_with_retry(self, url, max_retries=3, timeout=20):
@@ -128,8 +323,8 @@ class LeagueScraper:
             try:
                 if attempt > 0:
                     delay = min(5 * (attempt + 1), 30)  # Delays progressivos: 10s, 15s, 30s
-                    print(f"    ⏳ Tentativa {attempt + 1}/{max_retries} - Aguardando {delay}s...")
-                    time.sleep(delay)
+                    self.log.info(f"    ⏳ Tentativa {attempt + 1}/{max_retries} - Aguardando {delay}s...")
+                    self._penalize(url, delay)
                     
                     # Atualizar headers
                     self.session.headers.update({
@@ -137,54 +332,71 @@ class LeagueScraper:
                         'Origin': self.base_url
                     })
                 
-                response = self.session.get(url, timeout=timeout)
+                response = self._fetch(url, timeout=timeout)
                 
                 if response.status_code == 200:
                     return response
                 elif response.status_code == 403:
                     if attempt < max_retries - 1:
-                        print(f"    ⚠️  Erro 403 (Forbidden) - Tentando novamente...")
+                        self.log.warning(f"    ⚠️  Erro 403 (Forbidden) - Tentando novamente...")
                         continue
                     else:
-                        print(f"    ❌ Erro 403 (Forbidden) após {max_retries} tentativas")
-                        print(f"    💡 O site está bloqueando o acesso. Possíveis soluções:")
-                        print(f"       - Aguarde alguns minutos e tente novamente")
-                        print(f"       - Verifique se o cloudscraper está atualizado: pip install --upgrade cloudscraper")
+                        self.log.error(f"    ❌ Erro 403 (Forbidden) após {max_retries} tentativas")
+                        self.log.error(f"    💡 O site está bloqueando o acesso. Possíveis soluções:")
+                        self.log.error(f"       - Aguarde alguns minutos e tente novamente")
+                        self.log.error(f"       - Verifique se o cloudscraper está atualizado: pip install --upgrade cloudscraper")
                         response.raise_for_status()
                 elif response.status_code == 429:
-                    print(f"    ⚠️  Rate limit (429). Aguardando 30 segundos...")
-                    time.sleep(30)
+                    self.log.warning(f"    ⚠️  Rate limit (429). Aguardando 30 segundos...")
+                    self._penalize(url, 30)
                     continue
                 else:
                     response.raise_for_status()
                     
             except requests.exceptions.Timeout:
                 if attempt < max_retries - 1:
-                    print(f"    ⚠️  Timeout - Tentando novamente...")
+                    self.log.warning(f"    ⚠️  Timeout - Tentando novamente...")
                     continue
                 else:
                     raise
             except requests.exceptions.RequestException as e:
                 if attempt < max_retries - 1:
-                    print(f"    ⚠️  Erro na requisição: {e} - Tentando novamente...")
+                    self.log.warning(f"    ⚠️  Erro na requisição: {e} - Tentando novamente...")
                     continue
                 else:
                     raise
         
         return None
     
+    def stats_frame(self, rows):
+        """DataFrame dos registros: xG/xA numéricos e colunas das tabelas extras tipadas"""
+        df = typed_frame(rows, self.extra_dtypes)
+        for col in df.columns:
+            if col in ('xG', 'xA'):
+                df[col] = df[col].astype(float)
+            elif col not in self.extra_dtypes and col.split('_', 1)[0] in EXTRA_TABLES:
+                # Coluna extra sem nenhum valor preenchido
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        return df
+    
     def get_player_stats_from_match(self, match_url, team, opponent, date, location):
-        """Extrai estatísticas de jogadores de um jogo específico"""
+        """
+        Extrai estatísticas de jogadores de um jogo específico.
+        Os registros guardam só str/números; a árvore da página é liberada ao sair.
+        """
+        soup = None
         try:
             if not match_url or '/matches/' not in match_url:
                 return []
             
-            time.sleep(3)  # Rate limiting
+            self._pace(3)  # Rate limiting
             response = self._get_with_retry(match_url, max_retries=3, timeout=20)
             
             if response is None:
                 return []
-            soup = BeautifulSoup(response.content, 'html.parser')
+            source_hash = content_hash(response.content)
+            soup = parse_tables(response.content)
+            del response
             
             player_stats = []
             all_tables = soup.find_all('table', {'id': re.compile(r'.*')})
@@ -192,7 +404,7 @@ class LeagueScraper:
             # Debug: listar tabelas encontradas
             table_ids = [t.get('id', 'N/A') for t in all_tables if t.get('id')]
             if table_ids:
-                print(f"    🔍 Tabelas encontradas: {len(table_ids)} (primeiras 5: {table_ids[:5]})")
+                self.log.info(f"    🔍 Tabelas encontradas: {len(table_ids)} (primeiras 5: {table_ids[:5]})")
             
             # Encontrar tabelas summary
             summary_tables = []
@@ -262,10 +474,10 @@ class LeagueScraper:
                         stats_table = candidate_tables[0]
             
             if not stats_table:
-                print(f"    ❌ Tabela de estatísticas não encontrada para {location} team")
+                self.log.error(f"    ❌ Tabela de estatísticas não encontrada para {location} team")
                 return []
             
-            print(f"    ✓ Tabela encontrada ({stats_table.get('id', 'N/A')})")
+            self.log.info(f"    ✓ Tabela encontrada ({stats_table.get('id', 'N/A')})")
             rows = stats_table.find_all('tr')[1:]  # Pular cabeçalho
             first_row_processed = False
             
@@ -418,15 +630,26 @@ class LeagueScraper:
                     'Location': location,
                     'adj': 0,
                     'Year': date.year,
-                    'Month': date.month
+                    'Month': date.month,
+                    'SourceHash': source_hash
                 }
                 player_stats.append(stats)
             
+            if self.extra_tables and player_stats:
+                # Outras tabelas do mesmo time, da mesma página já parseada
+                extra = extract_extra_tables(soup, stats_table.get('id', ''), self.extra_tables,
+                                             self.extra_dtypes)
+                for stats in player_stats:
+                    stats.update(extra.get(stats['Player'], {}))
+            
             return player_stats
             
         except Exception as e:
-            print(f"    ❌ Erro ao extrair estatísticas: {e}")
+            self.log.error(f"    ❌ Erro ao extrair estatísticas: {e}")
             return []
+        finally:
+            if soup is not None:
+                release_tree(soup)
 
 
 def get_season_url(league_id, year, month):
@@ -440,293 +663,388 @@ def get_season_url(league_id, year, month):
     return f"https://fbref.com/en/comps/{league_id}/{season}/schedule/{season}-Scores-and-Fixtures"
 
 
-def process_schedule_table(soup, start_date, end_date, scraper, limit_games=None):
-    """Processa tabela de jogos"""
-    all_player_stats = []
-    
-    # Encontrar tabela de jogos
-    table = soup.find('table', {'id': re.compile(r'sched.*')})
+def _cells_by_stat(cells):
+    """Células da linha indexadas pelo data-stat (uma passada)"""
+    by_stat = {}
+    for cell in cells:
+        stat = cell.get('data-stat')
+        if stat:
+            by_stat[stat] = cell
+    return by_stat
+
+
+def _first_link(cell):
+    """Primeiro <a> da célula (sem o custo de montar um filtro do find)"""
+    for element in cell.descendants:
+        if element.name == 'a':
+            return element
+    return None
+
+
+def _is_match_href(href):
+    """Link de página de jogo (não de calendário nem apenas de data)"""
+    return bool(href) and '/matches/' in href and '/schedule/' not in href and not _DATE_ONLY_MATCH_URL_RE.search(href)
+
+
+def _find_date_cell(cells):
+    """Heurística: data no atributo data-date ou no texto das primeiras células"""
+    for cell in cells:
+        date_attr = cell.get('data-date', '')
+        if date_attr and _DATE_RE.match(date_attr):
+            return date_attr, cell
+
+    for cell in cells[:10]:
+        text = cell.get_text(strip=True)
+        if _DATE_ONLY_RE.match(text):
+            return text, cell
+    return "", None
+
+
+def _find_score(cells):
+    """Heurística: primeira célula com cara de placar (ignorando horários)"""
+    for cell in cells:
+        text = cell.get_text(strip=True)
+        if _SCORE_RE.match(text) and len(text) <= 10:
+            if ':' not in text or int(text.split(':')[0]) > 23:
+                return text
+
+    for cell in cells:
+        data_stat = cell.get('data-stat', '')
+        if 'score' in data_stat.lower():
+            text = cell.get_text(strip=True)
+            if text:
+                return text
+    return ""
+
+
+def _find_teams(cells, home_team, away_team):
+    """Heurística: times pela posição das células ou pelos links de /squads/"""
+    if not home_team and len(cells) > 4:
+        home_team = cells[4].get_text(strip=True)
+    if not away_team and len(cells) > 5:
+        away_team = cells[5].get_text(strip=True)
+
+    if not home_team or not away_team:
+        team_links = []
+        for cell in cells:
+            link = cell.find('a')
+            if link:
+                text = link.get_text(strip=True)
+                href = link.get('href', '')
+                if text and len(text) > 2 and '/squads/' in href:
+                    if (not _DIGITS_RE.match(text) and
+                        not _DATE_RE.match(text) and
+                        not _CLOCK_RE.match(text) and
+                        text not in _WEEKDAYS):
+                        team_links.append(text)
+
+        if not home_team and len(team_links) > 0:
+            home_team = team_links[0]
+        if not away_team and len(team_links) > 1:
+            away_team = team_links[1]
+    return home_team, away_team
+
+
+def _find_match_link(cells, date_cell, scraper):
+    """Heurística: link do jogo na célula da data ou em qualquer célula (ignorando URLs só de data)"""
+    if date_cell is not None:
+        link = date_cell.find('a')
+        if link and _is_match_href(link.get('href', '')):
+            return urljoin(scraper.base_url, link['href'])
+
+    for cell in cells:
+        for link in cell.find_all('a'):
+            href = link.get('href', '')
+            if _is_match_href(href):
+                return urljoin(scraper.base_url, href)
+
+    return None
+
+
+def parse_schedule_row(cells):
+    """
+    Leitura rápida de uma linha da tabela de jogos pelas células data-stat
+    (date, score, home_team, away_team, match_report).
+    Retorna dict com date, score, home_team, away_team e match_href; os campos
+    ausentes ficam None (célula inexistente) para a heurística completar.
+    """
+    by_stat = _cells_by_stat(cells)
+    fields = {'date_cell': by_stat.get('date')}
+
+    date_cell = fields['date_cell']
+    fields['date'] = (date_cell.get('data-date') or date_cell.get_text(strip=True)) if date_cell else None
+
+    for stat in ('score', 'home_team', 'away_team'):
+        cell = by_stat.get(stat)
+        fields[stat] = cell.get_text(strip=True) if cell is not None else None
+
+    # O link do relatório e o do placar apontam para a página do jogo
+    fields['match_href'] = None
+    for stat in ('score', 'match_report'):
+        link = _first_link(by_stat[stat]) if stat in by_stat else None
+        if link and _is_match_href(link.get('href', '')):
+            fields['match_href'] = link['href']
+            break
+    return fields
+
+
+def find_schedule_table(soup):
+    """Tabela de jogos da página da temporada (ou None)"""
+    table = soup.find('table', {'id': _SCHEDULE_TABLE_ID_RE})
     if not table:
-        tables = soup.find_all('table')
-        for t in tables:
+        for t in soup.find_all('table'):
             if 'schedule' in str(t.get('id', '')).lower():
-                table = t
-                break
-    
-    if not table:
-        print(f"  ⚠️  Tabela de jogos não encontrada")
-        return []
+                return t
+    return table
+
+
+class ScheduleIndex:
+    """
+    Jogos de uma temporada, ordenados por data: (date, home_team, away_team, score, match_url).
+    Montado uma vez a partir da tabela de jogos; cada consulta por período faz
+    busca binária na data e só percorre as linhas da janela.
+    """
     
-    rows = table.find_all('tr')[1:]
-    print(f"  Encontradas {len(rows)} linhas na tabela")
+    def __init__(self, entries, rows=0, no_date=0):
+        self.entries = sorted(entries, key=lambda entry: entry[0])
+        self.dates = [entry[0] for entry in self.entries]
+        self.rows = rows
+        self.no_date = no_date
     
-    matches_found = 0
-    skipped_no_date = 0
-    skipped_out_of_range = 0
-    skipped_no_teams = 0
+    def __len__(self):
+        return len(self.entries)
     
-    for row_idx, row in enumerate(rows):
-        cells = row.find_all(['td', 'th'])
-        if len(cells) < 3:
-            continue
+    @classmethod
+    def from_soup(cls, soup, scraper):
+        """Lê todas as linhas da tabela de jogos (None se a tabela não existir)"""
+        table = find_schedule_table(soup)
+        if not table:
+            return None
         
-        try:
-            # Extrair data
-            date_text = ""
-            date_cell = None
-            
-            for cell in cells:
-                date_attr = cell.get('data-date', '')
-                if date_attr and re.match(r'\d{4}-\d{2}-\d{2}', date_attr):
-                    date_text = date_attr
-                    date_cell = cell
-                    break
-            
-            if not date_text:
-                for cell in cells[:10]:
-                    text = cell.get_text(strip=True)
-                    if re.match(r'^\d{4}-\d{2}-\d{2}$', text):
-                        date_text = text
-                        date_cell = cell
-                        break
-            
-            if not date_text:
-                skipped_no_date += 1
-                continue
-            
-            match_date = pd.to_datetime(date_text, format='%Y-%m-%d', errors='coerce')
-            if pd.isna(match_date):
-                skipped_no_date += 1
-                continue
-            
-            if match_date < start_date or match_date > end_date:
-                skipped_out_of_range += 1
-                continue
-            
-            # Verificar se tem placar (jogo foi jogado)
-            has_score = False
-            score_text = ""
-            for cell in cells:
-                text = cell.get_text(strip=True)
-                if re.match(r'^\d+[\s\-:]\d+$', text) and len(text) <= 10:
-                    if ':' not in text or (':' in text and int(text.split(':')[0]) > 23):
-                        has_score = True
-                        score_text = text
-                        break
-            
-            if not has_score:
-                for cell in cells:
-                    data_stat = cell.get('data-stat', '')
-                    if 'score' in data_stat.lower() and cell.get_text(strip=True):
-                        has_score = True
-                        score_text = cell.get_text(strip=True)
-                        break
-            
-            if not has_score:
+        rows = table.find_all('tr')[1:]
+        entries = []
+        no_date = 0
+        
+        for row in rows:
+            cells = [cell for cell in row.children if cell.name in ('td', 'th')]
+            if len(cells) < 3:
                 continue
             
-            # Extrair times
-            home_team = ""
-            away_team = ""
-            
-            for cell in cells:
-                data_stat = cell.get('data-stat', '')
-                text = cell.get_text(strip=True)
+            try:
+                # Campos pelas células data-stat; heurísticas só quando faltar a célula
+                fields = parse_schedule_row(cells)
                 
-                if data_stat == 'home_team':
-                    home_team = text
-                elif data_stat == 'away_team':
-                    away_team = text
-            
-            if not home_team and len(cells) > 4:
-                home_team = cells[4].get_text(strip=True)
-            if not away_team and len(cells) > 5:
-                away_team = cells[5].get_text(strip=True)
-            
-            if not home_team or not away_team:
-                # Por links
-                team_links = []
-                for cell in cells:
-                    link = cell.find('a')
-                    if link:
-                        text = link.get_text(strip=True)
-                        href = link.get('href', '')
-                        if text and len(text) > 2 and '/squads/' in href:
-                            if (not re.match(r'^\d+$', text) and 
-                                not re.match(r'\d{4}-\d{2}-\d{2}', text) and
-                                not re.match(r'\d{2}:\d{2}', text) and
-                                text not in ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']):
-                                team_links.append(text)
+                date_text, date_cell = fields['date'], fields['date_cell']
+                if not date_text:
+                    date_text, date_cell = _find_date_cell(cells)
                 
-                if team_links:
-                    if not home_team and len(team_links) > 0:
-                        home_team = team_links[0]
-                    if not away_team and len(team_links) > 1:
-                        away_team = team_links[1]
-            
+                try:
+                    match_date = pd.Timestamp(datetime.strptime(date_text, '%Y-%m-%d'))
+                except ValueError:
+                    no_date += 1
+                    continue
+                
+                # Sem placar: jogo ainda não disputado (a linha só conta na data)
+                score_text = fields['score'] if fields['score'] is not None else _find_score(cells)
+                if not score_text:
+                    entries.append((match_date, '', '', '', None))
+                    continue
+                
+                home_team, away_team = fields['home_team'] or "", fields['away_team'] or ""
+                if not home_team or not away_team:
+                    home_team, away_team = _find_teams(cells, home_team, away_team)
+                
+                match_link = None
+                if home_team and away_team:
+                    if fields['match_href']:
+                        match_link = urljoin(scraper.base_url, fields['match_href'])
+                    else:
+                        match_link = _find_match_link(cells, date_cell, scraper)
+                
+                entries.append((match_date, home_team, away_team, score_text, match_link))
+                
+            except Exception as e:
+                scraper.log.error(f"     ❌ Erro ao processar linha: {e}")
+                continue
+        
+        return cls(entries, rows=len(rows), no_date=no_date)
+    
+    def matches(self, start_date, end_date, scraper):
+        """Jogos disputados entre start_date e end_date (inclusive): (lista de jogos, contadores)"""
+        lo = bisect_left(self.dates, start_date)
+        hi = bisect_right(self.dates, end_date, lo=lo)
+        counts = {
+            'rows': self.rows,
+            'no_date': self.no_date,
+            'out_of_range': len(self.entries) - (hi - lo),
+            'no_teams': 0,
+        }
+        
+        matches = []
+        for match_date, home_team, away_team, score_text, match_link in self.entries[lo:hi]:
+            if not score_text:
+                continue
             if not home_team or not away_team:
-                skipped_no_teams += 1
+                counts['no_teams'] += 1
                 continue
-            
-            # Buscar link do jogo
-            match_link = None
-            
-            # Primeiro, tentar na célula da data
-            if date_cell:
-                link_cell = date_cell.find('a')
-                if link_cell and link_cell.get('href'):
-                    href = link_cell.get('href', '')
-                    if '/matches/' in href and '/schedule/' not in href:
-                        # Ignorar URLs que são apenas datas (sem ID do match)
-                        if not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', href) and not re.match(r'/matches/\d{4}-\d{2}-\d{2}$', href):
-                            match_link = urljoin(scraper.base_url, href)
-            
-            # Se não encontrou, procurar em todas as células
             if not match_link:
-                for cell in cells:
-                    links = cell.find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        if href and '/matches/' in href and '/schedule/' not in href:
-                            # Ignorar URLs que são apenas datas (sem ID do match)
-                            if not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', href) and not re.match(r'/matches/\d{4}-\d{2}-\d{2}$', href):
-                                match_link = urljoin(scraper.base_url, href)
-                                if match_link.startswith('http'):
-                                    break
-                    if match_link:
-                        break
-            
-            # Se encontrou apenas URL de data, tentar construir URL completa a partir do texto
-            if not match_link or re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', match_link):
-                # Tentar encontrar link do jogo através dos nomes dos times
-                for cell in cells:
-                    links = cell.find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        text = link.get_text(strip=True)
-                        # Procurar links que contenham nome do time e match
-                        if href and '/matches/' in href and text:
-                            # Se o texto do link corresponde a um dos times
-                            if (text.lower() in home_team.lower() or text.lower() in away_team.lower() or
-                                home_team.lower() in text.lower() or away_team.lower() in text.lower()):
-                                if '/schedule/' not in href and not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', href):
-                                    match_link = urljoin(scraper.base_url, href)
-                                    break
-                    if match_link and not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', match_link):
-                        break
-            
-            # Se ainda não encontrou, pular este jogo
-            if not match_link or re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', match_link):
-                print(f"     ⚠️  URL parece inválida (apenas data): {match_link if match_link else 'N/A'}")
-                print(f"     ℹ️  Tentando encontrar link correto...")
-                # Última tentativa: procurar qualquer link que não seja apenas data
-                for cell in cells:
-                    links = cell.find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        if href and '/matches/' in href and len(href) > 20:  # Links de matches geralmente são longos
-                            if '/schedule/' not in href and not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', href):
-                                match_link = urljoin(scraper.base_url, href)
-                                break
-                    if match_link and not re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', match_link):
-                        break
-            
-            if not match_link or re.match(r'.*/matches/\d{4}-\d{2}-\d{2}$', match_link):
+                scraper.log.warning(f"     ⚠️  Link do jogo não encontrado: {home_team} vs {away_team}")
                 continue
-            
-            print(f"     🔗 URL: {match_link}")
+            matches.append({
+                'date': match_date,
+                'home_team': home_team,
+                'away_team': away_team,
+                'score': score_text,
+                'match_url': match_link,
+            })
+        return matches, counts
+
+
+def parse_schedule_table(soup, start_date, end_date, scraper):
+    """
+    Lê a tabela de jogos e retorna os jogos disputados no período.
+    Retorna (lista de jogos, contadores) ou (None, contadores) se a tabela não existir.
+    Cada jogo é um dict com: date, home_team, away_team, score, match_url
+    """
+    index = ScheduleIndex.from_soup(soup, scraper)
+    if index is None:
+        return None, {'rows': 0, 'no_date': 0, 'out_of_range': 0, 'no_teams': 0}
+    return index.matches(start_date, end_date, scraper)
+
+
+def iter_schedule_matches(index, start_date, end_date, scraper, limit_games=None, match_filter=None):
+    """
+    Busca os jogos do período a partir do índice da tabela de jogos (ScheduleIndex),
+    entregando os registros de cada jogo (mandante + visitante) assim que saem.
+    match_filter: função opcional (jogos do período -> jogos a buscar) que escolhe
+    quais jogos baixar (ex: apenas os que faltaram em outra fonte, ver
+    buscar_estatisticas_combinado.py)
+    """
+    matches, counts = index.matches(start_date, end_date, scraper)
+    scraper.log.info(f"  Encontradas {counts['rows']} linhas na tabela ({len(matches)} jogos no período)")
+    
+    if match_filter is not None:
+        selected = match_filter(matches)
+        scraper.log.info(f"  🎯 {len(selected)} de {len(matches)} jogos selecionados pelo filtro")
+        matches = selected
+    
+    matches_found = 0
+    total_rows = 0
+    
+    for match in matches:
+        match_link = match['match_url']
+        match_date = match['date']
+        home_team = match['home_team']
+        away_team = match['away_team']
+        
+        try:
+            scraper.log.info(f"     🔗 URL: {match_link}")
             
             if limit_games and matches_found >= limit_games:
-                print(f"  ⏸️  Limite de {limit_games} jogos atingido")
+                scraper.log.info(f"  ⏸️  Limite de {limit_games} jogos atingido")
                 break
             
-            print(f"  📅 {match_date.strftime('%Y-%m-%d')}: {home_team} vs {away_team} (Placar: {score_text})")
+            scraper.log.info(f"  📅 {match_date.strftime('%Y-%m-%d')}: {home_team} vs {away_team} (Placar: {match['score']})")
             
             # Buscar estatísticas
             stats_home = scraper.get_player_stats_from_match(
                 match_link, home_team, away_team, match_date, 'home'
             )
-            all_player_stats.extend(stats_home)
-            
             stats_away = scraper.get_player_stats_from_match(
                 match_link, away_team, home_team, match_date, 'away'
             )
-            all_player_stats.extend(stats_away)
             
             matches_found += 1
-            print(f"     ✓ {len(stats_home) + len(stats_away)} jogadores processados")
-            
-            time.sleep(5)
+            total_rows += len(stats_home) + len(stats_away)
+            scraper.log.info(f"     ✓ {len(stats_home) + len(stats_away)} jogadores processados")
             
         except Exception as e:
-            print(f"     ❌ Erro ao processar linha: {e}")
+            scraper.log.error(f"     ❌ Erro ao processar jogo: {e}")
             continue
+        
+        yield stats_home + stats_away
+        scraper._pace(5)
     
-    print(f"\n  📊 Estatísticas:")
-    print(f"     ✓ Jogos processados: {matches_found}")
-    print(f"     ⚠️  Sem data: {skipped_no_date}")
-    print(f"     ⚠️  Fora do período: {skipped_out_of_range}")
-    print(f"     ⚠️  Sem times: {skipped_no_teams}")
-    print(f"  ✅ Total: {len(all_player_stats)} registros de jogadores")
-    
-    return all_player_stats
+    scraper.log.info(f"\n  📊 Estatísticas:")
+    scraper.log.info(f"     ✓ Jogos processados: {matches_found}")
+    scraper.log.warning(f"     ⚠️  Sem data: {counts['no_date']}")
+    scraper.log.warning(f"     ⚠️  Fora do período: {counts['out_of_range']}")
+    scraper.log.warning(f"     ⚠️  Sem times: {counts['no_teams']}")
+    scraper.log.info(f"  ✅ Total: {total_rows} registros de jogadores")
 
 
-def scrape_period(league_id, league_name, start_date, end_date, scraper=None, limit_games=None):
-    """Busca dados para um período específico"""
-    if scraper is None:
-        scraper = LeagueScraper()
-    
-    if not scraper._initialized:
-        scraper._ensure_initialized()
-    
-    all_player_stats = []
-    
-    # Gerar lista de meses
+def process_schedule_table(index, start_date, end_date, scraper, limit_games=None, match_filter=None):
+    """Registros de todos os jogos do período numa lista (ver iter_schedule_matches)"""
+    return [row for rows in iter_schedule_matches(index, start_date, end_date, scraper, limit_games, match_filter)
+            for row in rows]
+
+
+def months_in_period(start_date, end_date):
+    """Lista de (ano, mês) cobertos pelo período"""
     current_date = start_date
-    months_to_process = []
+    months = []
     
     while current_date <= end_date:
         year_month = (current_date.year, current_date.month)
-        if year_month not in months_to_process:
-            months_to_process.append(year_month)
+        if year_month not in months:
+            months.append(year_month)
         
         if current_date.month == 12:
             current_date = current_date.replace(year=current_date.year + 1, month=1, day=1)
         else:
             current_date = current_date.replace(month=current_date.month + 1, day=1)
     
-    print(f"\n📅 Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
-    print(f"📋 Meses a processar: {', '.join([f'{y}-{m:02d}' for y, m in months_to_process])}")
+    return months
+
+
+def iter_period(league_id, league_name, start_date, end_date, scraper=None, limit_games=None, match_filter=None):
+    """
+    Busca dados para um período específico, entregando os registros jogo a jogo
+    (uma lista por jogo; ver saidas.py). match_filter: ver iter_schedule_matches
+    """
+    if scraper is None:
+        scraper = LeagueScraper()
     
-    for year, month in months_to_process:
-        print(f"\n{'='*60}")
-        print(f"Processando {league_name} - {year}-{month:02d}...")
-        print(f"{'='*60}")
+    if not scraper._initialized:
+        scraper._ensure_initialized()
+    
+    months_to_process = months_in_period(start_date, end_date)
+    
+    scraper.log.info(f"\n📅 Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
+    scraper.log.info(f"📋 Meses a processar: {', '.join([f'{y}-{m:02d}' for y, m in months_to_process])}")
+    
+    for position, (year, month) in enumerate(months_to_process):
+        scraper.log.info(f"\n{'='*60}")
+        scraper.log.info(f"Processando {league_name} - {year}-{month:02d}...")
+        scraper.log.info(f"{'='*60}")
         
         try:
+            # Uma página por temporada: os meses seguintes consultam o mesmo índice
             url = get_season_url(league_id, year, month)
-            print(f"  Acessando: {url}")
-            
-            response = scraper._get_with_retry(url, max_retries=3, timeout=20)
-            if response is None:
-                print(f"  ❌ Não foi possível acessar a URL após múltiplas tentativas")
+            index = scraper.get_schedule_index(url)
+            if index is None:
                 continue
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            month_start = pd.Timestamp(year, month, 1)
+            month_end = month_start + pd.offsets.MonthEnd(0)
+            yield from iter_schedule_matches(index, max(start_date, month_start), min(end_date, month_end),
+                                             scraper, limit_games, match_filter)
             
-            month_stats = process_schedule_table(soup, start_date, end_date, scraper, limit_games)
-            all_player_stats.extend(month_stats)
-            
-            if (year, month) != months_to_process[-1]:
-                print(f"  ⏳ Aguardando 10 segundos...")
-                time.sleep(10)
+            next_months = months_to_process[position + 1:]
+            if next_months and get_season_url(league_id, *next_months[0]) != url:
+                if scraper.rate_limiter is None:
+                    scraper.log.info(f"  ⏳ Aguardando 10 segundos...")
+                scraper._pace(10)
                 
         except Exception as e:
-            print(f"  ❌ Erro ao processar {year}-{month:02d}: {e}")
+            scraper.log.error(f"  ❌ Erro ao processar {year}-{month:02d}: {e}")
             continue
-    
-    return all_player_stats
+
+
+def scrape_period(league_id, league_name, start_date, end_date, scraper=None, limit_games=None, match_filter=None):
+    """Busca dados para um período específico numa lista (ver iter_period)"""
+    return [row for rows in iter_period(league_id, league_name, start_date, end_date, scraper, limit_games, match_filter)
+            for row in rows]
 
 
 def main():
@@ -764,6 +1082,9 @@ Exemplos:
 
   # Teste com 1 jogo
   python buscar_estatisticas_multi_liga.py --liga laliga --inicio 2025-09-01 --fim 2025-09-30 --limit 1 --test
+
+  # Backfill em fluxo: blocos Parquet gravados durante a busca (sem planilha)
+  python buscar_estatisticas_multi_liga.py --liga laliga --inicio 2024-08-01 --fim 2025-05-31 --parquet saida_laliga
         """
     )
     
@@ -780,8 +1101,35 @@ Exemplos:
                        help='Limitar número de jogos')
     parser.add_argument('--test', action='store_true',
                        help='Modo teste - não salva arquivo')
+    parser.add_argument('--arquivo-paginas', type=str, default=None,
+                       help='Arquivar as páginas baixadas neste banco (ex: paginas.sqlite)')
+    parser.add_argument('--tabelas', nargs='+', choices=EXTRA_TABLES + ['todas'], default=[],
+                       help='Juntar outras tabelas da página do jogo (passing, defense, possession, misc, keeper...)')
+    parser.add_argument('--armazem', type=str, default=None,
+                       help='Gravar também no armazém colunar (Parquet) neste diretório (requer pyarrow)')
+    parser.add_argument('--limite-global', type=float, default=None,
+                       help='Páginas por minuto no FBref somando todos os processos em paralelo (ex: 10)')
+    parser.add_argument('--limite-arquivo', type=str, default=DEFAULT_LIMIT_PATH,
+                       help=f'Banco do limite global compartilhado (padrão: {DEFAULT_LIMIT_PATH})')
+    parser.add_argument('--ndjson', action='store_true',
+                       help='Escrever os registros em NDJSON na saída padrão, jogo a jogo (sem planilha; mensagens vão para stderr)')
+    parser.add_argument('--parquet', type=str, default=None,
+                       help='Gravar os registros em blocos Parquet neste diretório durante a busca (sem planilha)')
+    parser.add_argument('--bloco', type=int, default=DEFAULT_CHUNK_ROWS,
+                       help=f'Registros por bloco gravado no --parquet/--armazem em fluxo (padrão: {DEFAULT_CHUNK_ROWS})')
     
     args = parser.parse_args()
+    # NDJSON na saída padrão: as mensagens vão para stderr
+    ndjson_stream = sys.stdout
+    if args.ndjson:
+        sys.stdout = sys.stderr
+    configure_cli_logging()
+    streaming = args.ndjson or args.parquet is not None
+    extra_tables = EXTRA_TABLES if 'todas' in args.tabelas else args.tabelas
+    
+    if (args.armazem or args.parquet) and not HAS_PYARROW:
+        print("❌ pyarrow não está instalado. Instale com: pip install pyarrow")
+        return
     
     league_info = LEAGUE_IDS[args.liga]
     league_id = league_info['id']
@@ -815,9 +1163,10 @@ Exemplos:
         args.output = f"{league_slug}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
     
     print(f"\n📅 Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
-    print(f"📁 Arquivo de saída: {args.output}")
+    if not streaming:
+        print(f"📁 Arquivo de saída: {args.output}")
     
-    if not args.test:
+    if not args.test and not streaming:
         resposta = input("\n⚠️  Continuar com a busca? (s/n): ").strip().lower()
         if resposta not in ['s', 'sim', 'y', 'yes']:
             print("Operação cancelada.")
@@ -825,12 +1174,36 @@ Exemplos:
     
     # Inicializar scraper
     print("\n🔧 Inicializando scraper...")
-    scraper = LeagueScraper()
+    archive = PageArchive(args.arquivo_paginas) if args.arquivo_paginas else None
+    rate_limiter = RateLimiter(args.limite_arquivo, args.limite_global) if args.limite_global else None
+    if rate_limiter is not None:
+        print(f"🚦 Limite global: {args.limite_global:g} páginas/minuto ({args.limite_arquivo})")
+    scraper = LeagueScraper(archive=archive, extra_tables=extra_tables, rate_limiter=rate_limiter)
     scraper._ensure_initialized()
     
     # Buscar dados
     print("\n🚀 Iniciando busca...")
-    all_data = scrape_period(league_id, league_name, start_date, end_date, scraper, limit_games=args.limit)
+    batches = iter_period(league_id, league_name, start_date, end_date, scraper, limit_games=args.limit)
+    
+    if streaming:
+        # Registros gravados jogo a jogo / em blocos, sem juntar o período na memória
+        sinks = []
+        if args.parquet:
+            sinks.append(ParquetSink(args.parquet, scraper.stats_frame, chunk_rows=args.bloco))
+        if args.armazem:
+            sinks.append(StoreSink(ColumnarStore(args.armazem), 'fbref', args.liga, scraper.stats_frame,
+                                   chunk_rows=args.bloco))
+        if args.ndjson:
+            sinks.append(NdjsonSink(ndjson_stream))
+        total = stream_rows(batches, sinks)
+        print(f"\n✅ Total: {total} registros de jogadores")
+        if args.parquet:
+            print(f"📁 Parquet: {args.parquet}")
+        if args.armazem:
+            print(f"🗄️  Armazém: {args.armazem}")
+        return
+    
+    all_data = [row for rows in batches for row in rows]
     
     if not all_data:
         print("\n⚠️  Nenhum dado foi encontrado.")
@@ -923,6 +1296,11 @@ Exemplos:
             print(f"📅 Data máxima: {new_df['Date'].max().strftime('%Y-%m-%d')}")
         print(f"📁 Arquivo salvo: {os.path.abspath(args.output)}")
         print(f"{'='*60}")
+        
+        if args.armazem:
+            store = ColumnarStore(args.armazem)
+            partitions = store.append('fbref', scraper.stats_frame(new_df.to_dict('records')), args.liga, key=PLAYER_MATCH_KEY)
+            print(f"🗄️  Armazém: {partitions} partição(ões) gravada(s) em {Path(args.armazem) / 'fbref'}")
 
 
 if __name__ == "__main__":
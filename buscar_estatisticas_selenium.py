@@ -2,16 +2,26 @@
 """
 Script usando Selenium para buscar estatísticas do FBref
 Selenium simula navegador real e pode contornar Cloudflare
+
+Usa um pool de N navegadores headless, iniciados uma única vez e reaproveitados
+entre páginas, com perfil persistente (os cookies do desafio Cloudflare são
+mantidos entre execuções) e várias abas carregando em paralelo em cada
+navegador. As esperas são por condição (tabela presente na página), não por
+tempo fixo. O HTML obtido é entregue ao mesmo código de extração do
+buscar_estatisticas_multi_liga.py.
 """
 
 import sys
 import argparse
+import threading
 from datetime import datetime
+from pathlib import Path
 import pandas as pd
 import time
 
 try:
     from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.by import By
@@ -26,6 +36,10 @@ except ImportError:
     print("💡 Também precisa instalar ChromeDriver")
     sys.exit(1)
 
+from buscar_estatisticas_multi_liga import LeagueScraper, parse_schedule_table
+from cache_http import make_response
+from registro import configure_cli_logging
+
 LEAGUE_IDS = {
     'premier': {'id': 9, 'name': 'Premier League'},
     'laliga': {'id': 12, 'name': 'La Liga'},
@@ -36,134 +50,324 @@ LEAGUE_IDS = {
     'championship': {'id': 10, 'name': 'Championship'},
 }
 
-class SeleniumFBrefScraper:
-    """Scraper usando Selenium para contornar Cloudflare"""
-    
-    def __init__(self, headless=True):
-        self.base_url = "https://fbref.com"
+# Seletores que indicam que a página terminou de carregar (e passou do Cloudflare)
+SCHEDULE_SELECTOR = 'table[id*=sched]'
+MATCH_SELECTOR = 'table[id$=_summary]'
+
+DEFAULT_PROFILE_DIR = Path.home() / '.cache' / 'bot_estat_bets' / 'selenium'
+
+
+def _is_challenge(driver):
+    """Verifica se o navegador está na página de desafio do Cloudflare"""
+    return "Just a moment" in driver.title or "Just a moment" in driver.page_source[:1000]
+
+
+class SeleniumDriverPool:
+    """Pool de navegadores Chrome iniciados uma vez e reaproveitados entre páginas"""
+
+    def __init__(self, size=2, headless=True, profile_dir=DEFAULT_PROFILE_DIR, tabs=3, timeout=30):
+        self.size = size
         self.headless = headless
-        self.driver = None
-        self._setup_driver()
-    
-    def _setup_driver(self):
-        """Configura o driver do Chrome"""
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.tabs = max(1, tabs)
+        self.timeout = timeout
+        self.drivers = []
+        for i in range(size):
+            self.drivers.append(self._create_driver(i))
+        print(f"  ✅ {len(self.drivers)} ChromeDriver(s) inicializado(s)")
+
+    def _create_driver(self, index):
+        """Configura um driver do Chrome"""
         chrome_options = Options()
-        
+
         if self.headless:
-            chrome_options.add_argument('--headless')
-        
+            chrome_options.add_argument('--headless=new')
+
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
+
+        if self.profile_dir:
+            # Um perfil por driver: o Chrome não permite dois processos no mesmo perfil
+            profile = self.profile_dir / f"driver_{index}"
+            profile.mkdir(parents=True, exist_ok=True)
+            chrome_options.add_argument(f'--user-data-dir={profile}')
+
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            print("  ✅ ChromeDriver inicializado")
+            return webdriver.Chrome(options=chrome_options)
         except Exception as e:
             print(f"  ❌ Erro ao inicializar ChromeDriver: {e}")
             print("  💡 Certifique-se de que o ChromeDriver está instalado")
             print("  💡 Ou instale: sudo apt-get install chromium-chromedriver")
+            self.close()
             raise
-    
-    def get_page(self, url, wait_time=10):
-        """Acessa uma página e aguarda carregar"""
+
+    def _wait(self, driver, selector):
+        """Aguarda o seletor aparecer (o desafio Cloudflare some antes disso)"""
         try:
-            print(f"  🔄 Acessando: {url}")
-            self.driver.get(url)
-            
-            # Aguardar a página carregar (especialmente para Cloudflare)
-            time.sleep(5)  # Aguardar desafio Cloudflare
-            
-            # Aguardar até que a página esteja carregada
-            WebDriverWait(self.driver, wait_time).until(
-                lambda d: d.execute_script('return document.readyState') == 'complete'
+            WebDriverWait(driver, self.timeout).until(
+                lambda d: not _is_challenge(d) and d.find_elements(By.CSS_SELECTOR, selector)
             )
-            
-            # Verificar se passou do desafio Cloudflare
-            if "Just a moment" in self.driver.page_source[:1000]:
-                print("  ⏳ Aguardando resolução do desafio Cloudflare...")
-                time.sleep(10)  # Aguardar mais tempo
-            
-            if "Just a moment" in self.driver.page_source[:1000]:
-                print("  ⚠️  Ainda na página de desafio")
-                return False
-            
-            print("  ✅ Página carregada")
             return True
-            
-        except Exception as e:
-            print(f"  ❌ Erro ao carregar página: {e}")
+        except TimeoutException:
+            return False
+
+    def _fetch_batch(self, driver, urls, selector, results):
+        """Carrega as URLs em abas paralelas de um mesmo navegador"""
+        main_handle = driver.current_window_handle
+
+        for start in range(0, len(urls), self.tabs):
+            chunk = urls[start:start + self.tabs]
+
+            # Abrir as abas novas primeiro (carregam em paralelo) e depois a aba principal
+            handles = [main_handle]
+            driver.switch_to.window(main_handle)
+            for url in chunk[1:]:
+                before = set(driver.window_handles)
+                driver.execute_script("window.open(arguments[0], '_blank');", url)
+                new_handles = set(driver.window_handles) - before
+                handles.append(new_handles.pop() if new_handles else None)
+            driver.switch_to.window(main_handle)
+            driver.get(chunk[0])
+
+            for url, handle in zip(chunk, handles):
+                if handle is None:
+                    results[url] = None
+                    continue
+                driver.switch_to.window(handle)
+                if self._wait(driver, selector):
+                    results[url] = driver.page_source
+                else:
+                    print(f"  ⚠️  Página não carregou: {url}")
+                    results[url] = None
+                if handle != main_handle:
+                    driver.close()
+
+            driver.switch_to.window(main_handle)
+
+    def fetch_many(self, urls, selector):
+        """Baixa várias URLs distribuídas entre os navegadores. Retorna {url: html}"""
+        results = {}
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return results
+
+        # Cada navegador é usado por uma única thread (WebDriver não é thread-safe)
+        threads = []
+        for i, driver in enumerate(self.drivers):
+            batch = urls[i::len(self.drivers)]
+            if not batch:
+                continue
+            thread = threading.Thread(target=self._fetch_batch, args=(driver, batch, selector, results))
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def close(self):
+        """Fecha todos os drivers"""
+        for driver in getattr(self, 'drivers', []):
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.drivers = []
+
+
+class SeleniumSession:
+    """
+    Sessão compatível com requests.Session.get servida pelo pool de navegadores.
+    Páginas pré-carregadas com prefetch() são entregues sem nova navegação.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.headers = {}
+        self._pages = {}
+
+    def prefetch(self, urls, selector=MATCH_SELECTOR):
+        """Carrega várias páginas em paralelo (abas x navegadores)"""
+        pending = [url for url in urls if url not in self._pages]
+        self._pages.update(self.pool.fetch_many(pending, selector))
+
+    def discard(self, url):
+        """Libera uma página pré-carregada da memória"""
+        self._pages.pop(url, None)
+
+    def get(self, url, **kwargs):
+        if url in self._pages:
+            # Pré-carregada (None = já falhou no prefetch, não navegar de novo)
+            html = self._pages[url]
+        else:
+            selector = SCHEDULE_SELECTOR if '/schedule/' in url else MATCH_SELECTOR
+            html = self.pool.fetch_many([url], selector).get(url)
+        if html is None:
+            return make_response(url, b'', 403)
+        return make_response(url, html.encode('utf-8'), 200, {'Content-Type': 'text/html; charset=utf-8'})
+
+
+class SeleniumFBrefScraper:
+    """Scraper usando Selenium para contornar Cloudflare"""
+
+    def __init__(self, headless=True, drivers=2, tabs=3, profile_dir=DEFAULT_PROFILE_DIR):
+        self.base_url = "https://fbref.com"
+        self.headless = headless
+        self.pool = SeleniumDriverPool(drivers, headless=headless, profile_dir=profile_dir, tabs=tabs)
+        self.session = SeleniumSession(self.pool)
+        # Mesmo extrator do caminho requests, usando os navegadores como transporte
+        self.extractor = LeagueScraper(session=self.session, delays=False)
+        self.extractor._initialized = True
+        self.page_source = ""
+
+    def get_page(self, url, selector=SCHEDULE_SELECTOR):
+        """Acessa uma página e aguarda a tabela aparecer"""
+        print(f"  🔄 Acessando: {url}")
+        html = self.pool.fetch_many([url], selector).get(url)
+        if html is None:
+            print("  ⚠️  Página não carregou (desafio Cloudflare ou tabela ausente)")
             return False
-    
+
+        self.page_source = html
+        print("  ✅ Página carregada")
+        return True
+
     def get_schedule_page(self, league_id, season):
         """Acessa página de schedule de uma liga"""
         url = f"{self.base_url}/en/comps/{league_id}/{season}/schedule/{season}-Scores-and-Fixtures"
         return self.get_page(url)
-    
-    def extract_match_data(self, soup):
-        """Extrai dados dos jogos da página"""
-        # Similar ao código original, mas usando BeautifulSoup do HTML do Selenium
-        matches = []
-        # Implementação similar ao buscar_estatisticas_multi_liga.py
-        return matches
-    
+
+    def extract_match_data(self, soup, start_date, end_date):
+        """Extrai os jogos disputados no período a partir da página de schedule"""
+        matches, _ = parse_schedule_table(soup, start_date, end_date, self.extractor)
+        return matches or []
+
+    def scrape_matches(self, matches):
+        """Baixa as páginas dos jogos em paralelo e extrai as estatísticas dos jogadores"""
+        all_player_stats = []
+        # Pré-carregar um lote por vez (navegadores x abas) para limitar a memória
+        batch_size = len(self.pool.drivers) * self.pool.tabs
+
+        for i, match in enumerate(matches):
+            if i % batch_size == 0:
+                self.session.prefetch([m['match_url'] for m in matches[i:i + batch_size]])
+
+            print(f"  📅 {match['date'].strftime('%Y-%m-%d')}: {match['home_team']} vs {match['away_team']}")
+            stats_home = self.extractor.get_player_stats_from_match(
+                match['match_url'], match['home_team'], match['away_team'], match['date'], 'home'
+            )
+            stats_away = self.extractor.get_player_stats_from_match(
+                match['match_url'], match['away_team'], match['home_team'], match['date'], 'away'
+            )
+            # Home e away vêm da mesma página: liberar depois da segunda leitura
+            self.session.discard(match['match_url'])
+            all_player_stats.extend(stats_home)
+            all_player_stats.extend(stats_away)
+
+        return all_player_stats
+
     def close(self):
-        """Fecha o driver"""
-        if self.driver:
-            self.driver.quit()
-            print("  ✅ Driver fechado")
+        """Fecha o pool de drivers"""
+        self.pool.close()
+        print("  ✅ Drivers fechados")
 
 def main():
     """Função principal"""
     parser = argparse.ArgumentParser(
         description='Busca estatísticas usando Selenium (contorna Cloudflare)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Temporada inteira com 3 navegadores e 4 abas cada
+  python buscar_estatisticas_selenium.py --liga laliga --season 2025-2026 --drivers 3 --abas 4
+
+  # Apenas um período
+  python buscar_estatisticas_selenium.py --liga laliga --season 2025-2026 --inicio 2025-09-01 --fim 2025-09-30
+        """
     )
-    
+
     parser.add_argument('--liga', type=str, required=True,
                        choices=list(LEAGUE_IDS.keys()),
                        help='Liga a buscar')
     parser.add_argument('--season', type=str, default='2025-2026',
                        help='Temporada (ex: 2025-2026)')
+    parser.add_argument('--inicio', type=str, default=None,
+                       help='Data de início (YYYY-MM-DD, padrão: início da temporada)')
+    parser.add_argument('--fim', type=str, default=None,
+                       help='Data de fim (YYYY-MM-DD, padrão: fim da temporada)')
+    parser.add_argument('--drivers', type=int, default=2,
+                       help='Número de navegadores no pool (padrão: 2)')
+    parser.add_argument('--abas', type=int, default=3,
+                       help='Abas carregando em paralelo por navegador (padrão: 3)')
+    parser.add_argument('--perfil', type=str, default=str(DEFAULT_PROFILE_DIR),
+                       help='Diretório do perfil persistente do Chrome')
+    parser.add_argument('--limit', type=int, default=None,
+                       help='Limitar número de jogos')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Arquivo Excel de saída')
     parser.add_argument('--test', action='store_true',
                        help='Modo teste')
     parser.add_argument('--visible', action='store_true',
                        help='Mostrar navegador (não headless)')
-    
+
     args = parser.parse_args()
-    
+    configure_cli_logging()
+
+    first_year, last_year = (int(y) for y in args.season.split('-'))
+    start_date = pd.to_datetime(args.inicio) if args.inicio else pd.Timestamp(first_year, 7, 1)
+    end_date = pd.to_datetime(args.fim) if args.fim else pd.Timestamp(last_year, 6, 30)
+
     print("="*70)
     print("🔍 BUSCADOR DE ESTATÍSTICAS - SELENIUM")
     print("="*70)
     print(f"Liga: {LEAGUE_IDS[args.liga]['name']}")
     print(f"Temporada: {args.season}")
-    print(f"Modo: {'VISÍVEL' if args.visible else 'HEADLESS'}")
+    print(f"Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')}")
+    print(f"Modo: {'VISÍVEL' if args.visible else 'HEADLESS'} - {args.drivers} navegador(es) x {args.abas} aba(s)")
     print("="*70)
-    
+
     scraper = None
-    
+
     try:
         print("\n🔧 Inicializando Selenium...")
-        scraper = SeleniumFBrefScraper(headless=not args.visible)
-        
+        scraper = SeleniumFBrefScraper(
+            headless=not args.visible, drivers=args.drivers, tabs=args.abas, profile_dir=args.perfil
+        )
+
         print(f"\n📊 Acessando página da liga...")
         success = scraper.get_schedule_page(LEAGUE_IDS[args.liga]['id'], args.season)
-        
+
         if success:
             print("✅ Página acessada com sucesso!")
-            
-            if args.test:
-                print("\n🧪 MODO TESTE - HTML da página:")
-                print(scraper.driver.page_source[:500])
-            else:
-                # Extrair dados
-                soup = BeautifulSoup(scraper.driver.page_source, 'html.parser')
-                matches = scraper.extract_match_data(soup)
-                print(f"✅ Extraídos {len(matches)} jogos")
+
+            soup = BeautifulSoup(scraper.page_source, 'html.parser')
+            matches = scraper.extract_match_data(soup, start_date, end_date)
+            if args.limit:
+                matches = matches[:args.limit]
+            print(f"✅ Encontrados {len(matches)} jogos no período")
+
+            started = time.perf_counter()
+            all_stats = scraper.scrape_matches(matches)
+            print(f"\n✅ Total: {len(all_stats)} registros de jogadores ({time.perf_counter() - started:.1f}s)")
+
+            if all_stats:
+                df = pd.DataFrame(all_stats)
+                df = df.drop_duplicates(subset=['Player', 'Team', 'Date', 'Opponent'], keep='last')
+                df = df.sort_values('Date').reset_index(drop=True)
+
+                if args.test:
+                    print("\n🧪 MODO TESTE - Primeiras linhas:")
+                    print(df.head(10).to_string())
+                else:
+                    output_file = args.output or f"{args.liga}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}_selenium.xlsx"
+                    df.to_excel(output_file, index=False)
+                    print(f"\n💾 Dados salvos em: {output_file}")
         else:
             print("❌ Não foi possível acessar a página")
-            
+
     except KeyboardInterrupt:
         print("\n⚠️  Interrompido pelo usuário")
     except Exception as e:
@@ -176,4 +380,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
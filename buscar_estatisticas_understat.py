@@ -4,31 +4,77 @@ Script para buscar estatísticas usando Understat como alternativa ao FBref
 Understat fornece dados xG/xA para várias ligas europeias
 """
 
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import time
 import re
 import json
-from datetime import datetime
 import argparse
 import sys
 
+from arquivo_paginas import ArchivingSession, PageArchive, content_hash
+from cache_http import SingleFlightSession, accept_encoding
+from importacao import lazy_import
+from registro import configure_cli_logging, get_logger
+
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
+
+_JS_ESCAPE = re.compile(r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|.)', re.DOTALL)
+_JS_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+def decode_js_string(value):
+    """
+    Decodifica o conteúdo de uma string JavaScript entre aspas simples.
+    O Understat escapa o JSON com \\xHH (ex: \\x22 para aspas); remover as barras
+    corrompe nomes com acentos e aspas escapadas dentro dos valores.
+    """
+    def replace(match):
+        escape = match.group(1)
+        if escape[0] in 'xu' and len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        return _JS_SIMPLE_ESCAPES.get(escape, escape)
+    
+    return _JS_ESCAPE.sub(replace, value)
+
+
+def extract_json_var(html, name):
+    """Extrai e decodifica `var name = JSON.parse('...')` embutido no HTML (ou None)"""
+    match = re.search(name + r"\s*=\s*JSON\.parse\('(.*?)'\)", html, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(decode_js_string(match.group(1)))
+    except ValueError:
+        return None
+
+
 class UnderstatScraper:
     """Scraper para buscar dados do Understat"""
     
-    def __init__(self):
+    def __init__(self, session=None, archive=None, delays=True, logger=None):
         self.base_url = "https://understat.com"
-        self.session = requests.Session()
+        # logger: destino das mensagens de progresso (padrão: 'estatisticas.understat', ver registro.py)
+        self.log = logger or get_logger('understat')
+        # delays=False desativa as pausas de rate limiting (replay do arquivo/cache)
+        self.delays = delays
+        self.session = session if session is not None else requests.Session()
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Encoding': accept_encoding(),
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': 'https://www.google.com/'
         }
         self.session.headers.update(headers)
         
+        if archive is not None:
+            # Guardar toda página baixada no arquivo (ver reextrair.py)
+            self.session = ArchivingSession(self.session, archive)
+        
+        # Pedidos simultâneos da mesma URL viram uma só requisição
+        self.session = SingleFlightSession(self.session)
+        
         # Mapeamento de ligas
         self.leagues = {
             'premier': {'name': 'Premier League', 'id': 'EPL', 'url': 'EPL'},
@@ -38,83 +84,218 @@ class UnderstatScraper:
             'ligue1': {'name': 'Ligue 1', 'id': 'Ligue_1', 'url': 'Ligue_1'},
         }
     
-    def get_matches(self, league_key, season):
-        """Busca jogos de uma liga e temporada"""
+    def _sleep(self, seconds):
+        """Pausa de rate limiting (ignorada quando delays=False)"""
+        if self.delays:
+            time.sleep(seconds)
+    
+    def _fetch_page(self, url):
+        """Baixa uma página. Retorna (html, hash do conteúdo)."""
+        response = self.session.get(url, timeout=20)
+        response.raise_for_status()
+        return response.text, content_hash(response.content)
+    
+    def get_league_data(self, league_key, season):
+        """
+        Baixa a página da liga uma única vez e decodifica os três blocos embutidos:
+        datesData (jogos), teamsData (histórico jogo a jogo dos times) e
+        playersData (agregados da temporada por jogador).
+        """
         if league_key not in self.leagues:
-            print(f"❌ Liga '{league_key}' não suportada pelo Understat")
-            return []
+            self.log.error(f"❌ Liga '{league_key}' não suportada pelo Understat")
+            return None
         
         league = self.leagues[league_key]
         url = f"{self.base_url}/league/{league['url']}/{season}"
         
-        print(f"  🔄 Acessando: {url}")
+        self.log.info(f"  🔄 Acessando: {url}")
         
         try:
-            response = self.session.get(url, timeout=20)
-            response.raise_for_status()
-            
-            # Understat usa JavaScript para carregar dados, então precisamos extrair do HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Procurar por scripts que contêm dados JSON
-            scripts = soup.find_all('script')
-            matches_data = None
-            
-            for script in scripts:
-                if script.string and 'datesData' in script.string:
-                    # Extrair dados JSON do script
-                    match = re.search(r'datesData\s*=\s*JSON\.parse\(\'(.+?)\'\)', script.string)
-                    if match:
-                        try:
-                            json_str = match.group(1).replace('\\', '')
-                            matches_data = json.loads(json_str)
-                            break
-                        except:
-                            pass
-            
-            if not matches_data:
-                print("  ⚠️  Não foi possível extrair dados do Understat")
-                print("  💡 Understat carrega dados via JavaScript, pode precisar de Selenium")
-                return []
-            
-            print(f"  ✅ Encontrados dados de {len(matches_data)} jogos")
-            return matches_data
-            
+            html, source_hash = self._fetch_page(url)
         except Exception as e:
-            print(f"  ❌ Erro ao buscar jogos: {e}")
+            self.log.error(f"  ❌ Erro ao buscar dados da liga: {e}")
+            return None
+        
+        return {
+            'dates': extract_json_var(html, 'datesData') or [],
+            'teams': extract_json_var(html, 'teamsData') or {},
+            'players': extract_json_var(html, 'playersData') or [],
+            'source_hash': source_hash,
+        }
+    
+    def get_matches(self, league_key, season):
+        """Busca jogos de uma liga e temporada"""
+        league_data = self.get_league_data(league_key, season)
+        
+        if not league_data or not league_data['dates']:
+            self.log.warning("  ⚠️  Não foi possível extrair dados do Understat")
+            self.log.info("  💡 Understat carrega dados via JavaScript, pode precisar de Selenium")
             return []
+        
+        matches_data = league_data['dates']
+        self.log.info(f"  ✅ Encontrados dados de {len(matches_data)} jogos")
+        return matches_data
     
     def get_match_stats(self, match_id):
         """Busca estatísticas de um jogo específico"""
         url = f"{self.base_url}/match/{match_id}"
         
         try:
-            response = self.session.get(url, timeout=20)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            scripts = soup.find_all('script')
-            
-            # Procurar dados dos jogadores
-            players_data = None
-            
-            for script in scripts:
-                if script.string and 'shotsData' in script.string:
-                    # Extrair dados dos jogadores
-                    match = re.search(r'playersData\s*=\s*JSON\.parse\(\'(.+?)\'\)', script.string)
-                    if match:
-                        try:
-                            json_str = match.group(1).replace('\\', '')
-                            players_data = json.loads(json_str)
-                            break
-                        except:
-                            pass
-            
-            return players_data
-            
+            html, _ = self._fetch_page(url)
+            return extract_json_var(html, 'rostersData') or extract_json_var(html, 'playersData')
         except Exception as e:
-            print(f"  ❌ Erro ao buscar estatísticas do jogo: {e}")
+            self.log.error(f"  ❌ Erro ao buscar estatísticas do jogo: {e}")
             return None
+    
+    def get_match_players(self, match):
+        """
+        Estatísticas de cada jogador em um jogo (registros no formato das outras fontes).
+        Única informação que exige a página do jogo: minutos, gols, xG e xA por partida.
+        """
+        url = f"{self.base_url}/match/{match['id']}"
+        
+        try:
+            html, source_hash = self._fetch_page(url)
+        except Exception as e:
+            self.log.error(f"    ❌ Erro ao buscar jogo {match['id']}: {e}")
+            return []
+        
+        rosters = extract_json_var(html, 'rostersData') or extract_json_var(html, 'playersData')
+        if not rosters:
+            return []
+        
+        match_date = pd.to_datetime(match['datetime']).normalize()
+        home_team = match['h']['title']
+        away_team = match['a']['title']
+        
+        player_stats = []
+        for side, team, opponent, location in [('h', home_team, away_team, 'home'),
+                                               ('a', away_team, home_team, 'away')]:
+            for player in (rosters.get(side) or {}).values():
+                minutes = int(player.get('time') or 0)
+                if minutes == 0:
+                    continue
+                player_stats.append({
+                    'Player': player.get('player', ''),
+                    'Team': team,
+                    'Date': match_date,
+                    'Opponent': opponent,
+                    'Minutes': minutes,
+                    'Goals': int(player.get('goals') or 0),
+                    'Assists': int(player.get('assists') or 0),
+                    'xG': round(float(player.get('xG') or 0), 4),
+                    'xA': round(float(player.get('xA') or 0), 4),
+                    'SH': int(player.get('shots') or 0),
+                    'Confronto': f"{team}|{opponent}|{match_date.strftime('%Y-%m-%d')}",
+                    'Location': location,
+                    'Year': match_date.year,
+                    'Month': match_date.month,
+                    'adj': 0,
+                    'SourceHash': source_hash
+                })
+        
+        return player_stats
+    
+    def scrape_season_bulk(self, league_key, season, start_date=None, end_date=None, per_match=False, limit_games=None):
+        """
+        Modo em lote: jogos, histórico dos times e agregados dos jogadores vêm todos
+        da página da liga (1 requisição). Páginas de jogo só são baixadas com
+        per_match=True, e apenas para os jogos já disputados dentro do período.
+        Retorna dict de DataFrames: matches, teams, players e (opcional) match_players.
+        """
+        league_data = self.get_league_data(league_key, season)
+        if not league_data:
+            return None
+        
+        source_hash = league_data['source_hash']
+        
+        matches = pd.DataFrame([{
+            'MatchId': m['id'],
+            'Date': pd.to_datetime(m['datetime']),
+            'Home': m['h']['title'],
+            'Away': m['a']['title'],
+            'HomeGoals': pd.to_numeric(m.get('goals', {}).get('h'), errors='coerce'),
+            'AwayGoals': pd.to_numeric(m.get('goals', {}).get('a'), errors='coerce'),
+            'HomeXG': pd.to_numeric(m.get('xG', {}).get('h'), errors='coerce'),
+            'AwayXG': pd.to_numeric(m.get('xG', {}).get('a'), errors='coerce'),
+            'IsResult': bool(m.get('isResult')),
+            'SourceHash': source_hash,
+        } for m in league_data['dates']])
+        
+        teams = pd.DataFrame([{
+            'Team': team['title'],
+            'Date': pd.to_datetime(game.get('date')),
+            'Location': 'home' if game.get('h_a') == 'h' else 'away',
+            'xG': float(game.get('xG') or 0),
+            'xGA': float(game.get('xGA') or 0),
+            'npxG': float(game.get('npxG') or 0),
+            'npxGA': float(game.get('npxGA') or 0),
+            'Scored': int(game.get('scored') or 0),
+            'Missed': int(game.get('missed') or 0),
+            'Result': game.get('result'),
+            'SourceHash': source_hash,
+        } for team in league_data['teams'].values() for game in team.get('history', [])])
+        
+        players = pd.DataFrame(league_data['players'])
+        if len(players):
+            players = players.rename(columns={
+                'player_name': 'Player', 'team_title': 'Team', 'games': 'Games',
+                'time': 'Minutes', 'goals': 'Goals', 'assists': 'Assists',
+                'shots': 'SH', 'key_passes': 'KeyPasses', 'position': 'Position',
+            })
+            for col in ['Games', 'Minutes', 'Goals', 'Assists', 'SH', 'KeyPasses',
+                        'yellow_cards', 'red_cards', 'npg']:
+                if col in players.columns:
+                    players[col] = pd.to_numeric(players[col], errors='coerce').fillna(0).astype(int)
+            for col in ['xG', 'xA', 'npxG', 'xGChain', 'xGBuildup']:
+                if col in players.columns:
+                    players[col] = pd.to_numeric(players[col], errors='coerce').astype(float).round(4)
+            players['SourceHash'] = source_hash
+        
+        self.log.info(f"  ✅ {len(matches)} jogos, {len(teams)} linhas de times, {len(players)} jogadores (1 requisição)")
+        
+        result = {'matches': matches, 'teams': teams, 'players': players}
+        
+        if per_match:
+            played = [m for m in league_data['dates'] if m.get('isResult')]
+            if start_date is not None or end_date is not None:
+                dates = [pd.to_datetime(m['datetime']).normalize() for m in played]
+                played = [m for m, d in zip(played, dates)
+                          if (start_date is None or d >= start_date) and (end_date is None or d <= end_date)]
+            if limit_games:
+                played = played[:limit_games]
+            
+            self.log.info(f"  📅 Baixando {len(played)} página(s) de jogo para estatísticas por partida")
+            
+            rows = []
+            for i, match in enumerate(played, 1):
+                self.log.info(f"  [{i}/{len(played)}] {match['h']['title']} vs {match['a']['title']} ({match['datetime'][:10]})")
+                self._sleep(1)  # Rate limiting
+                rows.extend(self.get_match_players(match))
+            result['match_players'] = pd.DataFrame(rows)
+        
+        return result
+
+def understat_season(date):
+    """Temporada do Understat que contém a data (a temporada 2024 vai de ago/2024 a mai/2025)"""
+    return date.year if date.month >= 7 else date.year - 1
+
+
+def scrape_understat_period(league_key, start_date, end_date, scraper):
+    """
+    Estatísticas por jogo dos jogos disputados no período: página da liga de cada
+    temporada do período + página de cada jogo (ex: reextração a partir do arquivo).
+    """
+    rows = []
+    seasons = range(understat_season(start_date), understat_season(end_date) + 1)
+    for season in seasons:
+        matches = scraper.get_matches(league_key, season)
+        played = [m for m in matches if m.get('isResult')
+                  and start_date <= pd.to_datetime(m['datetime']).normalize() <= end_date]
+        for match in played:
+            rows.extend(scraper.get_match_players(match))
+    return rows
+
 
 def main():
     """Função principal"""
@@ -131,6 +312,12 @@ Ligas disponíveis (Understat):
 
 Exemplo:
   python buscar_estatisticas_understat.py --liga bundesliga --season 2024
+
+  # Modo em lote: temporada inteira a partir da página da liga (1 requisição)
+  python buscar_estatisticas_understat.py --liga bundesliga --season 2024 --bulk
+
+  # Em lote + estatísticas por jogo apenas para um período
+  python buscar_estatisticas_understat.py --liga bundesliga --season 2024 --bulk --por-jogo --inicio 2024-09-01 --fim 2024-09-30
         """
     )
     
@@ -141,8 +328,23 @@ Exemplo:
                        help='Temporada (ex: 2024 para 2023-2024)')
     parser.add_argument('--test', action='store_true',
                        help='Modo teste - não salva arquivo')
+    parser.add_argument('--arquivo-paginas', type=str, default=None,
+                       help='Arquivar as páginas baixadas neste banco (ex: paginas.sqlite)')
+    parser.add_argument('--bulk', action='store_true',
+                       help='Extrair jogos, times e jogadores da página da liga (1 requisição)')
+    parser.add_argument('--por-jogo', action='store_true',
+                       help='Com --bulk: baixar páginas de jogo para estatísticas por partida')
+    parser.add_argument('--inicio', type=str, default=None,
+                       help='Data de início para --por-jogo (YYYY-MM-DD)')
+    parser.add_argument('--fim', type=str, default=None,
+                       help='Data de fim para --por-jogo (YYYY-MM-DD)')
+    parser.add_argument('--limit', type=int, default=None,
+                       help='Limitar número de páginas de jogo')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Arquivo Excel de saída do modo --bulk')
     
     args = parser.parse_args()
+    configure_cli_logging()
     
     print("="*70)
     print("🔍 BUSCADOR DE ESTATÍSTICAS - UNDERSTAT")
@@ -152,7 +354,8 @@ Exemplo:
     print(f"Modo: {'TESTE' if args.test else 'PRODUÇÃO'}")
     print("="*70)
     
-    scraper = UnderstatScraper()
+    archive = PageArchive(args.arquivo_paginas) if args.arquivo_paginas else None
+    scraper = UnderstatScraper(archive=archive)
     
     # Testar acesso
     print("\n🔧 Testando acesso ao Understat...")
@@ -167,30 +370,50 @@ Exemplo:
         print(f"  ❌ Erro ao acessar Understat: {e}")
         sys.exit(1)
     
+    if args.bulk:
+        start_date = pd.to_datetime(args.inicio) if args.inicio else None
+        end_date = pd.to_datetime(args.fim) if args.fim else None
+        
+        print(f"\n📊 Buscando temporada da {scraper.leagues[args.liga]['name']} (modo em lote)...")
+        result = scraper.scrape_season_bulk(
+            args.liga, args.season, start_date, end_date, per_match=args.por_jogo, limit_games=args.limit
+        )
+        
+        if not result or not len(result['matches']):
+            print("❌ Não foi possível obter dados do Understat")
+            sys.exit(1)
+        
+        if args.test:
+            for name, df in result.items():
+                print(f"\n🧪 MODO TESTE - {name} ({len(df)} linhas):")
+                print(df.head(5).to_string())
+        else:
+            output_file = args.output or f"{args.liga}_{args.season}_understat.xlsx"
+            with pd.ExcelWriter(output_file) as writer:
+                result['players'].to_excel(writer, sheet_name='Jogadores', index=False)
+                result['matches'].to_excel(writer, sheet_name='Jogos', index=False)
+                result['teams'].to_excel(writer, sheet_name='Times', index=False)
+                if 'match_players' in result:
+                    result['match_players'].to_excel(writer, sheet_name='PorJogo', index=False)
+            print(f"\n💾 Dados salvos em: {output_file}")
+        return
+    
     # Buscar jogos
     print(f"\n📊 Buscando jogos da {scraper.leagues[args.liga]['name']}...")
     matches = scraper.get_matches(args.liga, args.season)
     
     if not matches:
         print("❌ Não foi possível obter dados do Understat")
-        print("💡 Nota: Understat carrega dados via JavaScript.")
-        print("   Para extração completa, pode ser necessário usar Selenium.")
         sys.exit(1)
     
     print(f"\n✅ Encontrados {len(matches)} jogos")
     
     if args.test:
         print("\n🧪 MODO TESTE - Exibindo primeiros 3 jogos:")
-        for i, match in enumerate(list(matches.items())[:3]):
+        for i, match in enumerate(matches[:3]):
             print(f"  Jogo {i+1}: {match}")
     
-    print("\n" + "="*70)
-    print("💡 RECOMENDAÇÃO")
-    print("="*70)
-    print("Understat carrega dados via JavaScript.")
-    print("Para extração completa, recomendo usar Selenium.")
-    print("Vou criar um script com Selenium agora...")
-    print("="*70)
+    print("\n💡 Use --bulk para extrair jogos, times e jogadores da temporada")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Cache de páginas HTTP em disco e sessão que consulta o cache antes da rede.
+
+Usado para gravar fixtures (validar_ligas.py), reaproveitar downloads entre
+extratores (comparar_dados.py) e rodar os scrapers sem acesso à internet.
+
+Os corpos ficam comprimidos (gzip) no disco e só são descomprimidos quando
+a resposta é lida, em blocos. SingleFlightSession junta requisições
+simultâneas da mesma URL numa única ida à rede.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from importacao import lazy_import
+
+requests = lazy_import('requests')
+
+
+def url_key(url):
+    """Gera a chave (sha1) usada para armazenar uma URL"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def accept_encoding():
+    """
+    Valor de Accept-Encoding com o que o urllib3 instalado sabe descomprimir:
+    gzip/deflate, mais br e zstd quando brotli/zstandard estão instalados
+    """
+    from urllib3.util.request import ACCEPT_ENCODING
+    return ACCEPT_ENCODING
+
+
+def make_response(url, body, status_code=200, headers=None, stream=None):
+    """
+    Cria um requests.Response a partir de um corpo já baixado.
+    stream: arquivo com o corpo, lido só quando .content/.text é acessado (no lugar de body)
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    if stream is not None:
+        response.raw = stream
+    else:
+        response._content = body
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+    return response
+
+
+class PageCache:
+    """
+    Cache de páginas em disco: um arquivo de corpo (gzip) e um de metadados por URL.
+    Corpos gravados antes da compressão (sem 'encoding' nos metadados) continuam legíveis.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = url_key(url)
+        return self.directory / f"{key}.body", self.directory / f"{key}.json"
+
+    def __contains__(self, url):
+        body_path, meta_path = self._paths(url)
+        return body_path.exists() and meta_path.exists()
+
+    def open(self, url):
+        """
+        Retorna (arquivo, metadados) ou None se a URL não está no cache.
+        O arquivo descomprime o corpo à medida que é lido.
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                stored = f.read()
+        except (OSError, ValueError):
+            return None
+        stream = io.BytesIO(stored)
+        if meta.get('encoding') == 'gzip':
+            stream = gzip.GzipFile(fileobj=stream, mode='rb')
+        return stream, meta
+
+    def get(self, url):
+        """Retorna (corpo, metadados) ou None se a URL não está no cache"""
+        opened = self.open(url)
+        if opened is None:
+            return None
+        stream, meta = opened
+        try:
+            return stream.read(), meta
+        except (OSError, EOFError):
+            return None
+
+    def put(self, url, body, status_code=200, headers=None):
+        """Grava uma página no cache (escrita atômica)"""
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'status_code': status_code,
+            'headers': {k: v for k, v in (headers or {}).items()
+                        if k.lower() in ('content-type', 'etag', 'last-modified')},
+            'encoding': 'gzip',
+            'size': len(body),
+        }
+        stored = gzip.compress(body, compresslevel=6, mtime=0)
+        with self._lock:
+            tmp_body = body_path.with_suffix('.body.tmp')
+            with open(tmp_body, 'wb') as f:
+                f.write(stored)
+            os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_suffix('.json.tmp')
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_meta, meta_path)
+
+    def urls(self):
+        """Lista as URLs presentes no cache"""
+        urls = []
+        for meta_path in sorted(self.directory.glob('*.json')):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    urls.append(json.load(f)['url'])
+            except (OSError, ValueError, KeyError):
+                continue
+        return urls
+
+
+class CachedSession:
+    """
+    Sessão compatível com requests.Session.get que lê do PageCache.
+
+    - session=None: modo offline (replay); URLs ausentes retornam 404
+    - session=<Session>: busca na rede quando falta no cache e grava respostas 200
+    """
+
+    def __init__(self, cache, session=None):
+        self.cache = cache
+        self.session = session
+        self.hits = 0
+        self.misses = 0
+        self.headers = session.headers if session is not None else requests.structures.CaseInsensitiveDict()
+
+    @property
+    def offline(self):
+        return self.session is None
+
+    def get(self, url, **kwargs):
+        # PageCache entrega o corpo comprimido, descomprimido só quando a resposta é lida
+        opener = getattr(self.cache, 'open', None)
+        if opener is not None:
+            opened = opener(url)
+            if opened is not None:
+                self.hits += 1
+                stream, meta = opened
+                return make_response(url, None, meta.get('status_code', 200), meta.get('headers'), stream=stream)
+        else:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self.hits += 1
+                body, meta = cached
+                return make_response(url, body, meta.get('status_code', 200), meta.get('headers'))
+
+        self.misses += 1
+        if self.session is None:
+            return make_response(url, b'', 404)
+
+        response = self.session.get(url, **kwargs)
+        if response.status_code == 200:
+            self.cache.put(url, response.content, response.status_code, response.headers)
+        return response
+
+
+def copy_response(response):
+    """Nova requests.Response com o mesmo corpo (já lido), status e cabeçalhos"""
+    copy = make_response(response.url, response.content, response.status_code, dict(response.headers))
+    copy.encoding = response.encoding
+    return copy
+
+
+class _Flight:
+    """Requisição em andamento, aguardada pelas chamadas repetidas"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlightSession:
+    """
+    Sessão que junta chamadas simultâneas de get() para a mesma URL (e mesmos
+    cabeçalhos/params): a primeira vai à rede, as outras esperam e recebem uma
+    cópia da mesma resposta (ou a mesma exceção).
+
+    linger: segundos em que uma resposta 200 recém-terminada ainda é reaproveitada
+    (ex: a página do jogo pedida em seguida para o mandante e para o visitante).
+    """
+
+    def __init__(self, session, linger=0):
+        self.session = session
+        self.linger = linger
+        self.requests = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._recent = {}  # chave -> (expira_em, resposta)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def __getattr__(self, name):
+        # Atributos da sessão interna (ex: CachedSession.cache) continuam acessíveis
+        if name == 'session':
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    @staticmethod
+    def _key(url, kwargs):
+        headers = tuple(sorted((kwargs.get('headers') or {}).items()))
+        params = kwargs.get('params')
+        params = tuple(sorted(params.items())) if isinstance(params, dict) else params
+        return url, headers, params
+
+    def get(self, url, **kwargs):
+        key = self._key(url, kwargs)
+        with self._lock:
+            now = time.monotonic()
+            recent = self._recent.get(key)
+            if recent is not None and recent[0] > now:
+                self.coalesced += 1
+                return copy_response(recent[1])
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.requests += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy_response(flight.response)
+
+        try:
+            response = self.session.get(url, **kwargs)
+            response.content  # Ler o corpo antes de liberar quem espera
+            flight.response = response
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if self.linger:
+                    now = time.monotonic()
+                    self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+                    if flight.response is not None and flight.response.status_code == 200:
+                        self._recent[key] = (now + self.linger, flight.response)
+            flight.done.set()
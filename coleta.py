@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+API de biblioteca: busca estatísticas e devolve os dados em memória.
+
+Sem perguntas, sem prints e sem Excel: as mensagens de progresso vão para
+o logger informado (ou para 'estatisticas', silencioso por padrão) e o
+resultado é um DataFrame tipado (ou pyarrow.Table), pronto para ser usado
+num processo de longa duração.
+
+Exemplo:
+  import logging
+  from coleta import scrape
+
+  df = scrape(['laliga', 'premier'], '2025-09-01', '2025-09-30', source='fotmob',
+              logger=logging.getLogger('precificacao'))
+"""
+
+from armazenamento import PLAYER_MATCH_KEY
+from buscar_estatisticas_combinado import OUTPUT_COLUMNS, scrape_combined
+from buscar_estatisticas_fotmob import FOTMOB_LEAGUE_IDS, FotMobScraper, scrape_league_period
+from buscar_estatisticas_multi_liga import LEAGUE_IDS, LeagueScraper, scrape_period
+from identidade import DEFAULT_INDEX_PATH, IdentityIndex
+from importacao import lazy_import
+from registro import get_logger
+
+pd = lazy_import('pandas')
+
+SOURCES = ('fotmob', 'fbref', 'combinado')
+
+
+def supported_leagues(source):
+    """Ligas disponíveis numa fonte"""
+    if source == 'fotmob':
+        return sorted(FOTMOB_LEAGUE_IDS)
+    if source == 'fbref':
+        return sorted(LEAGUE_IDS)
+    return sorted(set(FOTMOB_LEAGUE_IDS) & set(LEAGUE_IDS))
+
+
+def _source_frame(rows, frame_builder):
+    """DataFrame tipado de uma fonte única, sem duplicatas e com Date sem horário"""
+    if not rows:
+        return pd.DataFrame()
+    df = frame_builder(rows)
+    df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+    df = df.drop_duplicates(subset=PLAYER_MATCH_KEY, keep='first')
+    return df.sort_values(['Date', 'Team', 'Player'], kind='stable').reset_index(drop=True)
+
+
+def scrape(leagues, start, end, source='fotmob', logger=None, limit_games=None,
+           fotmob=None, fbref=None, index=None, as_arrow=False):
+    """
+    Busca as estatísticas dos jogadores de uma ou mais ligas no período.
+
+    leagues: chave da liga ou lista de chaves (ex: 'laliga', ['laliga', 'premier'])
+    source: 'fotmob', 'fbref' ou 'combinado' (FotMob + FBref nas lacunas)
+    logger: logging.Logger que recebe as mensagens de progresso
+    fotmob/fbref: scrapers já configurados (sessão, arquivo, limite global...)
+    index: identidade.IdentityIndex usado no modo combinado (padrão: identidades.json,
+           salvo ao final)
+    as_arrow: devolver pyarrow.Table em vez de DataFrame
+
+    Retorna uma linha por jogador e jogo, com a coluna 'liga'.
+    """
+    if isinstance(leagues, str):
+        leagues = [leagues]
+    if source not in SOURCES:
+        raise ValueError(f"Fonte '{source}' inválida (use: {', '.join(SOURCES)})")
+    unknown = [league for league in leagues if league not in supported_leagues(source)]
+    if unknown:
+        raise ValueError(f"Liga(s) não suportada(s) em {source}: {', '.join(unknown)}")
+
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    if start > end:
+        raise ValueError("Data de início deve ser anterior à data de fim")
+
+    log = logger or get_logger('coleta')
+    if source in ('fotmob', 'combinado') and fotmob is None:
+        fotmob = FotMobScraper(logger=logger)
+    if source in ('fbref', 'combinado') and fbref is None:
+        fbref = LeagueScraper(logger=logger)
+    save_index = source == 'combinado' and index is None
+    if save_index:
+        index = IdentityIndex(DEFAULT_INDEX_PATH)
+
+    frames = []
+    for league in leagues:
+        log.info(f"📥 {league}: {start.strftime('%Y-%m-%d')} até {end.strftime('%Y-%m-%d')} ({source})")
+        if source == 'fotmob':
+            rows = scrape_league_period(league, start, end, fotmob, limit_games)
+            df = _source_frame(rows, fotmob.stats_frame)
+        elif source == 'fbref':
+            league_info = LEAGUE_IDS[league]
+            rows = scrape_period(league_info['id'], league_info['name'], start, end, fbref, limit_games)
+            df = _source_frame(rows, fbref.stats_frame)
+        else:
+            df = scrape_combined(league, start, end, fotmob=fotmob, fbref=fbref, index=index,
+                                 limit_games=limit_games)
+            df = df.drop_duplicates(subset=['PlayerID', 'TeamID', 'Date'], keep='first')
+        if df.empty:
+            continue
+        df['liga'] = league
+        frames.append(df)
+
+    if save_index:
+        index.save()
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=(OUTPUT_COLUMNS if source == 'combinado' else []) + ['liga'])
+    log.info(f"✅ {len(df)} registros de jogadores")
+
+    if as_arrow:
+        import pyarrow as pa
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df
@@ -1,33 +1,36 @@
 #!/usr/bin/env python3
 """
 Script simples para comparar dados extraídos pelo script com dados do site
+
+Modo lote: cada página de jogo é baixada uma única vez (cache compartilhado em
+disco) e o extrator de referência e o extrator de produção rodam sobre os
+mesmos bytes. O resultado é um único relatório de divergências.
 """
 
-import cloudscraper
-from bs4 import BeautifulSoup
+import argparse
 import re
-import pandas as pd
 from datetime import datetime
+from pathlib import Path
 import sys
 sys.path.insert(0, '.')
-from buscar_estatisticas_multi_liga import scrape_period, LeagueScraper
+from buscar_estatisticas_multi_liga import (
+    LEAGUE_IDS, LeagueScraper, get_season_url, months_in_period, parse_schedule_table
+)
+from cache_http import CachedSession, PageCache
+from identidade import normalize_name
+from importacao import lazy_import
+from registro import configure_cli_logging
 
-def extrair_dados_site(match_url):
-    """Extrai dados diretamente do site"""
-    print(f"\n{'='*70}")
-    print(f"🌐 EXTRAINDO DADOS DO SITE")
-    print(f"{'='*70}")
-    print(f"URL: {match_url}\n")
-    
-    scraper = cloudscraper.create_scraper()
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
-    }
-    scraper.headers.update(headers)
-    
-    response = scraper.get(match_url, timeout=20)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.content, 'html.parser')
+bs4 = lazy_import('bs4')
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+CAMPOS_INT = ['Minutes', 'Goals', 'Assists']
+CAMPOS_FLOAT = ['xG', 'xA']
+
+def extrair_dados_html(content):
+    """Extrai dados de uma página de jogo já baixada (extrator de referência)"""
+    soup = bs4.BeautifulSoup(content, 'html.parser')
     
     all_tables = soup.find_all('table', {'id': re.compile(r'.*')})
     
@@ -40,7 +43,9 @@ def extrair_dados_site(match_url):
     
     dados_site = []
     
-    for stats_table in summary_tables:
+    for table_idx, stats_table in enumerate(summary_tables):
+        # Primeira tabela summary é do mandante, segunda do visitante
+        location = 'home' if table_idx == 0 else 'away'
         rows = stats_table.find_all('tr')[1:]
         
         for row in rows:
@@ -106,6 +111,7 @@ def extrair_dados_site(match_url):
             
             dados_site.append({
                 'Player': player_name,
+                'Location': location,
                 'Minutes': minutes,
                 'Goals': goals,
                 'Assists': assists,
@@ -115,156 +121,243 @@ def extrair_dados_site(match_url):
     
     return dados_site
 
-def comparar(dados_site, dados_script):
-    """Compara dados do site com dados do script"""
-    print(f"\n{'='*70}")
-    print(f"📊 COMPARAÇÃO DE DADOS")
-    print(f"{'='*70}\n")
+def criar_sessao(cache_dir):
+    """Sessão com cache compartilhado: cada URL é baixada uma única vez"""
+    live = LeagueScraper()
+    return LeagueScraper(session=CachedSession(PageCache(cache_dir), live.session))
+
+def baixar_pagina(fetcher, url):
+    """Baixa uma página pelo cache (com rate limiting apenas quando vai à rede)"""
+    if url not in fetcher.session.cache:
+        # Conexão inicial só quando alguma página vai de fato à rede
+        fetcher._ensure_initialized()
+        fetcher._sleep(3)
+    response = fetcher._get_with_retry(url, max_retries=3, timeout=20)
+    return response.content if response is not None else None
+
+def times_da_pagina(content):
+    """(mandante, visitante) lidos do placar (scorebox) da página do jogo, ou None"""
+    soup = bs4.BeautifulSoup(content, 'html.parser')
+    times = [a.get_text(strip=True) for a in soup.select('div.scorebox strong a[href*="/squads/"]')]
+    return tuple(times[:2]) if len(times) >= 2 else None
+
+MESES_URL = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
+    'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12,
+}
+
+def data_da_url(match_url):
+    """Extrai a data do slug da URL do jogo (ex: ...-September-12-2025-La-Liga)"""
+    match = re.search(r'-(' + '|'.join(MESES_URL) + r')-(\d{1,2})-(\d{4})', match_url)
+    if not match:
+        return pd.Timestamp(datetime.now().date())
+    return pd.Timestamp(int(match.group(3)), MESES_URL[match.group(1)], int(match.group(2)))
+
+def listar_jogos_periodo(fetcher, liga, start_date, end_date):
+    """Lista os jogos de uma liga no período a partir da tabela da temporada"""
+    league_id = LEAGUE_IDS[liga]['id']
+    jogos = []
+    vistos = set()
+    
+    for year, month in months_in_period(start_date, end_date):
+        url = get_season_url(league_id, year, month)
+        if url in vistos:
+            continue
+        vistos.add(url)
+        
+        content = baixar_pagina(fetcher, url)
+        if content is None:
+            print(f"  ❌ Não foi possível acessar {url}")
+            continue
+        
+        matches, _ = parse_schedule_table(bs4.BeautifulSoup(content, 'html.parser'), start_date, end_date, fetcher)
+        jogos.extend(matches or [])
+    
+    return jogos
+
+def comparar_lote(jogos, fetcher):
+    """
+    Roda os dois extratores sobre a mesma página de cada jogo e compara tudo
+    com um único merge. Retorna o relatório (DataFrame, uma linha por jogador).
+    """
+    # Extrator de produção lê apenas do cache (as páginas já foram baixadas)
+    producao = LeagueScraper(session=CachedSession(fetcher.session.cache), delays=False)
+    
+    dados_site = []
+    dados_script = []
+    
+    for i, jogo in enumerate(jogos, 1):
+        url = jogo['match_url']
+        print(f"  [{i}/{len(jogos)}] {url}")
+        
+        content = baixar_pagina(fetcher, url)
+        if content is None:
+            print(f"    ⚠️  Página não disponível")
+            continue
+        
+        if jogo['home_team'] is None:
+            # Jogo informado só pela URL: nomes dos times vêm da própria página
+            times = times_da_pagina(content)
+            if times is None:
+                print("    ⚠️  Times não encontrados no placar da página")
+                times = ('', '')
+            jogo = {**jogo, 'home_team': times[0], 'away_team': times[1]}
+        
+        for item in extrair_dados_html(content):
+            dados_site.append({'Match': url, **item})
+        
+        for team, opponent, location in [
+            (jogo['home_team'], jogo['away_team'], 'home'),
+            (jogo['away_team'], jogo['home_team'], 'away'),
+        ]:
+            for item in producao.get_player_stats_from_match(url, team, opponent, jogo['date'], location):
+                dados_script.append({
+                    'Match': url,
+                    'Player': item['Player'],
+                    'Location': item['Location'],
+                    'Minutes': item['Minutes'],
+                    'Goals': item['Goals'],
+                    'Assists': item['Assists'],
+                    'xG': float(item['xG']),
+                    'xA': float(item['xA'])
+                })
     
-    # Converter para DataFrame para facilitar comparação
-    df_site = pd.DataFrame(dados_site)
-    df_script = pd.DataFrame(dados_script)
+    colunas = ['Match', 'Player', 'Location'] + CAMPOS_INT + CAMPOS_FLOAT
+    df_site = pd.DataFrame(dados_site, columns=colunas)
+    df_script = pd.DataFrame(dados_script, columns=colunas)
     
-    # Normalizar nomes (lowercase) para comparação
-    df_site['Player_lower'] = df_site['Player'].str.lower().str.strip()
-    df_script['Player_lower'] = df_script['Player'].str.lower().str.strip()
+    for df in (df_site, df_script):
+        df['Player_key'] = df['Player'].map(normalize_name)
     
-    # Merge pelos nomes
     merged = df_site.merge(
         df_script,
-        on='Player_lower',
+        on=['Match', 'Location', 'Player_key'],
         how='outer',
         suffixes=('_site', '_script'),
         indicator=True
     )
     
-    erros = []
-    acertos = []
-    
-    # Comparar jogadores que estão em ambos
-    both = merged[merged['_merge'] == 'both']
-    
-    print(f"📋 Total de jogadores no site: {len(df_site)}")
-    print(f"📋 Total de jogadores no script: {len(df_script)}")
-    print(f"📋 Jogadores em ambos: {len(both)}\n")
+    both = merged['_merge'] == 'both'
+    divergentes = pd.Series('', index=merged.index)
     
-    for idx, row in both.iterrows():
-        player = row['Player_site']
-        print(f"👤 {player}:")
-        
-        campos_ok = []
-        campos_erro = []
-        
-        for campo in ['Minutes', 'Goals', 'Assists', 'xG', 'xA']:
-            val_site = row[f'{campo}_site']
-            val_script = row[f'{campo}_script']
-            
-            # Para xG e xA, comparar com tolerância
-            if campo in ['xG', 'xA']:
-                val_site = float(val_site)
-                val_script = float(val_script)
-                diff = abs(val_site - val_script)
-                if diff < 0.0001:
-                    status = "✅"
-                    campos_ok.append(campo)
-                else:
-                    status = "❌"
-                    campos_erro.append((campo, val_site, val_script))
-            else:
-                val_site = int(val_site) if pd.notna(val_site) else 0
-                val_script = int(val_script) if pd.notna(val_script) else 0
-                if val_site == val_script:
-                    status = "✅"
-                    campos_ok.append(campo)
-                else:
-                    status = "❌"
-                    campos_erro.append((campo, val_site, val_script))
-            
-            print(f"  {status} {campo}: Site={val_site} | Script={val_script}")
-        
-        if campos_erro:
-            erros.append((player, campos_erro))
-        else:
-            acertos.append(player)
-        
-        print()
+    for campo in CAMPOS_INT:
+        iguais = merged[f'{campo}_site'].fillna(-1).astype(int) == merged[f'{campo}_script'].fillna(-1).astype(int)
+        divergentes = divergentes.where(iguais | ~both, divergentes + campo + ' ')
+    for campo in CAMPOS_FLOAT:
+        iguais = np.isclose(merged[f'{campo}_site'].astype(float), merged[f'{campo}_script'].astype(float), atol=0.0001, rtol=0)
+        divergentes = divergentes.where(iguais | ~both, divergentes + campo + ' ')
     
-    # Jogadores apenas no site
-    only_site = merged[merged['_merge'] == 'left_only']
-    if len(only_site) > 0:
-        print(f"⚠️  Jogadores apenas no site ({len(only_site)}):")
-        for idx, row in only_site.iterrows():
-            print(f"  - {row['Player_site']}")
-        print()
+    merged['Campos'] = divergentes.str.strip()
+    merged['Status'] = np.select(
+        [merged['_merge'] == 'left_only', merged['_merge'] == 'right_only', merged['Campos'] != ''],
+        ['apenas_site', 'apenas_script', 'divergente'],
+        default='ok'
+    )
+    merged['Player'] = merged['Player_site'].fillna(merged['Player_script'])
     
-    # Jogadores apenas no script
-    only_script = merged[merged['_merge'] == 'right_only']
-    if len(only_script) > 0:
-        print(f"⚠️  Jogadores apenas no script ({len(only_script)}):")
-        for idx, row in only_script.iterrows():
-            print(f"  - {row['Player_script']}")
-        print()
+    colunas_relatorio = ['Match', 'Location', 'Player', 'Status', 'Campos']
+    for campo in CAMPOS_INT + CAMPOS_FLOAT:
+        colunas_relatorio += [f'{campo}_site', f'{campo}_script']
     
-    # Resumo
-    print(f"{'='*70}")
-    print(f"📊 RESUMO DA VALIDAÇÃO")
+    return merged[colunas_relatorio].sort_values(['Match', 'Location', 'Player']).reset_index(drop=True)
+
+def resumir_relatorio(relatorio):
+    """Imprime o resumo do relatório em lote. Retorna True se não houver erros."""
+    print(f"\n{'='*70}")
+    print(f"📊 RESUMO DA VALIDAÇÃO (LOTE)")
     print(f"{'='*70}")
-    print(f"✅ Jogadores corretos: {len(acertos)}/{len(both)}")
-    print(f"❌ Jogadores com erros: {len(erros)}/{len(both)}")
+    print(f"🎮 Jogos: {relatorio['Match'].nunique()}")
+    
+    contagem = relatorio['Status'].value_counts()
+    for status in ['ok', 'divergente', 'apenas_site', 'apenas_script']:
+        print(f"  {status}: {contagem.get(status, 0)}")
     
-    if erros:
+    erros = relatorio[relatorio['Status'] != 'ok']
+    if len(erros):
         print(f"\n❌ ERROS ENCONTRADOS:")
-        for player, campos in erros:
-            print(f"\n  {player}:")
-            for campo, val_site, val_script in campos:
-                print(f"    - {campo}: Site={val_site} | Script={val_script}")
+        print(erros[['Match', 'Location', 'Player', 'Status', 'Campos']].to_string(index=False))
     else:
         print(f"\n🎉 TODOS OS DADOS ESTÃO CORRETOS!")
     
     return len(erros) == 0
 
-if __name__ == "__main__":
-    # Jogo para validar: Sevilla vs Elche - 12/09/2025
-    match_url = "https://fbref.com/en/matches/13448b32/Sevilla-Elche-September-12-2025-La-Liga"
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compara o extrator de produção com o extrator de referência (um ou vários jogos)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Jogo padrão (Sevilla vs Elche - 12/09/2025)
+  python comparar_dados.py
+
+  # Lista de jogos
+  python comparar_dados.py URL1 URL2 ...
+  python comparar_dados.py --arquivo jogos.txt
+
+  # Rodada inteira de uma liga
+  python comparar_dados.py --liga laliga --inicio 2025-09-12 --fim 2025-09-14 --relatorio rodada.csv
+        """
+    )
+    parser.add_argument('urls', nargs='*', help='URLs de jogos do fbref.com')
+    parser.add_argument('--arquivo', type=str, default=None,
+                       help='Arquivo com uma URL de jogo por linha')
+    parser.add_argument('--liga', type=str, choices=list(LEAGUE_IDS.keys()), default=None,
+                       help='Liga para comparar todos os jogos do período')
+    parser.add_argument('--inicio', type=str, default=None, help='Data de início (YYYY-MM-DD)')
+    parser.add_argument('--fim', type=str, default=None, help='Data de fim (YYYY-MM-DD)')
+    parser.add_argument('--cache', type=str, default='.cache_paginas',
+                       help='Diretório do cache de páginas (padrão: .cache_paginas)')
+    parser.add_argument('--relatorio', type=str, default=None,
+                       help='Salvar relatório de divergências (.csv ou .xlsx)')
+    args = parser.parse_args()
+    configure_cli_logging()
     
     print("="*70)
     print("🔍 VALIDAÇÃO DE DADOS - COMPARANDO SITE vs SCRIPT")
     print("="*70)
     
-    # 1. Extrair dados do site
-    dados_site = extrair_dados_site(match_url)
-    print(f"✅ Extraídos {len(dados_site)} jogadores do site")
+    fetcher = criar_sessao(args.cache)
     
-    # 2. Extrair dados do script
-    print(f"\n{'='*70}")
-    print(f"🚀 EXTRAINDO DADOS DO SCRIPT")
-    print(f"{'='*70}\n")
+    urls = list(args.urls)
+    if args.arquivo:
+        with open(args.arquivo, 'r', encoding='utf-8') as f:
+            urls += [linha.strip() for linha in f if linha.strip() and not linha.startswith('#')]
     
-    scraper = LeagueScraper()
-    scraper._ensure_initialized()
+    jogos = [
+        {'match_url': url, 'home_team': None, 'away_team': None, 'date': data_da_url(url)}
+        for url in urls
+    ]
     
-    start_date = pd.to_datetime('2025-09-12')
-    end_date = pd.to_datetime('2025-09-12')
+    if args.liga:
+        if not args.inicio or not args.fim:
+            parser.error('--liga requer --inicio e --fim')
+        start_date = pd.to_datetime(args.inicio)
+        end_date = pd.to_datetime(args.fim)
+        jogos += listar_jogos_periodo(fetcher, args.liga, start_date, end_date)
     
-    dados_script = scrape_period(12, 'La Liga', start_date, end_date, scraper, limit_games=1)
+    if not jogos:
+        # Jogo para validar: Sevilla vs Elche - 12/09/2025
+        url = "https://fbref.com/en/matches/13448b32/Sevilla-Elche-September-12-2025-La-Liga"
+        jogos = [{'match_url': url, 'home_team': 'Sevilla', 'away_team': 'Elche', 'date': data_da_url(url)}]
     
-    print(f"✅ Extraídos {len(dados_script)} jogadores do script")
+    print(f"\n🎮 {len(jogos)} jogo(s) para comparar\n")
     
-    # Converter para formato de comparação
-    dados_script_comparacao = []
-    for item in dados_script:
-        dados_script_comparacao.append({
-            'Player': item['Player'],
-            'Minutes': item['Minutes'],
-            'Goals': item['Goals'],
-            'Assists': item['Assists'],
-            'xG': float(item['xG']),
-            'xA': float(item['xA'])
-        })
+    relatorio = comparar_lote(jogos, fetcher)
+    sucesso = resumir_relatorio(relatorio)
     
-    # 3. Comparar
-    sucesso = comparar(dados_site, dados_script_comparacao)
+    cache_session = fetcher.session
+    print(f"\n💾 Cache: {cache_session.misses} download(s), {cache_session.hits} leitura(s) do cache")
     
-    sys.exit(0 if sucesso else 1)
-
+    if args.relatorio:
+        output_path = Path(args.relatorio)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if output_path.suffix.lower() == '.xlsx':
+            relatorio.to_excel(output_path, index=False)
+        else:
+            relatorio.to_csv(output_path, index=False)
+        print(f"📁 Relatório salvo: {output_path}")
+    
+    return 0 if sucesso else 1
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Gera a planilha dos analistas a partir do armazém colunar (armazenamento.py).
+
+Lê apenas as ligas e o período pedidos (mais o histórico usado nas médias),
+calcula as colunas derivadas de uma vez para todas as linhas e grava um
+Excel novo, sem abrir nem reescrever a planilha histórica.
+
+Colunas derivadas (médias usam só jogos ANTERIORES à linha, sem vazamento):
+  TEAM          Time do jogador
+  LINHA         Linha de gols/assistências usada nas odds justas (--linha)
+  FAIR GOAL     Odd justa de o jogador passar da LINHA em gols:
+                1 / P(X > LINHA), X ~ Poisson(média do xG nos últimos --janela jogos)
+  FAIR ASS      Idem para assistências, com a média do xA
+  LOCAL PLAYER  Média de xG do jogador nos jogos anteriores com o mesmo mando
+  LOCAL TEAM    Média de xG do time por jogo nos jogos anteriores com o mesmo mando
+  CONFRONTO     "Mandante x Visitante"
+  Neto          xG do time no jogo menos xG do adversário no jogo
+
+Exemplo:
+  python gerar_relatorio.py --ligas laliga premier --inicio 2025-09-01 --fim 2025-09-30
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+from armazenamento import DEFAULT_STORE_DIR, HAS_PYARROW, ColumnarStore
+from importacao import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Colunas brutas lidas do armazém
+SOURCE_COLUMNS = [
+    'Player', 'Team', 'Date', 'Opponent', 'Minutes', 'Goals', 'Assists',
+    'xG', 'xA', 'Confronto', 'Location', 'adj', 'liga',
+]
+
+# Colunas da planilha gerada, na ordem do modelo dos analistas (sem as colunas
+# 'Unnamed: N' e de cabeçalho numérico herdadas da planilha antiga)
+REPORT_COLUMNS = [
+    'Player', 'Team', 'Date', 'Opponent', 'Minutes', 'Goals', 'Assists',
+    'xG', 'xA', 'Confronto', 'Location', 'adj', 'TEAM', 'LINHA', 'FAIR ASS',
+    'FAIR GOAL', 'LOCAL TEAM', 'LOCAL PLAYER', 'CONFRONTO', 'Neto', 'Liga',
+    'Year', 'Month',
+]
+
+# Formato numérico das colunas no Excel
+NUMBER_FORMATS = {
+    'xG': '0.0000', 'xA': '0.0000', 'FAIR ASS': '0.00', 'FAIR GOAL': '0.00',
+    'LOCAL TEAM': '0.0000', 'LOCAL PLAYER': '0.0000', 'Neto': '0.0000',
+}
+
+
+def poisson_over(rate, line):
+    """P(X > line) para X ~ Poisson(rate), vetorizado em rate"""
+    rate = np.asarray(rate, dtype=float)
+    cdf = np.zeros_like(rate)
+    term = np.exp(-rate)
+    for k in range(int(math.floor(line)) + 1):
+        if k > 0:
+            term = term * rate / k
+        cdf += term
+    return 1.0 - cdf
+
+
+def fair_odds(probability):
+    """Odd justa (1/p); vazia quando a probabilidade é zero ou desconhecida"""
+    probability = np.asarray(probability, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        odds = 1.0 / probability
+    return np.where(probability > 0, odds, np.nan)
+
+
+def prior_mean(df, keys, column, window=None):
+    """Média de column nos jogos anteriores de cada grupo (janela móvel ou todo o histórico)"""
+    previous = df.groupby(keys, sort=False)[column].shift()
+    grouped = previous.groupby([df[key] for key in keys], sort=False)
+    if window:
+        means = grouped.rolling(window, min_periods=1).mean()
+    else:
+        means = grouped.expanding().mean()
+    return means.reset_index(level=list(range(len(keys))), drop=True).reindex(df.index)
+
+
+def add_derived_columns(df, line=0.5, window=10):
+    """Calcula as colunas derivadas da planilha para todas as linhas de uma vez"""
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+    df['xG'] = df['xG'].astype(float)
+    df['xA'] = df['xA'].astype(float)
+    df = df.sort_values(['Date', 'Team', 'Player'], kind='stable').reset_index(drop=True)
+
+    df['TEAM'] = df['Team']
+    df['LINHA'] = line
+
+    xg_form = prior_mean(df, ['Player', 'Team'], 'xG', window)
+    xa_form = prior_mean(df, ['Player', 'Team'], 'xA', window)
+    df['FAIR GOAL'] = fair_odds(poisson_over(xg_form.fillna(0), line))
+    df['FAIR ASS'] = fair_odds(poisson_over(xa_form.fillna(0), line))
+
+    df['LOCAL PLAYER'] = prior_mean(df, ['Player', 'Team', 'Location'], 'xG')
+
+    # Totais por time e jogo
+    team_match = df.groupby(['Team', 'Date', 'Location', 'Opponent'], as_index=False, sort=False)['xG'].sum()
+    team_match = team_match.sort_values(['Date', 'Team'], kind='stable').reset_index(drop=True)
+    team_match['LOCAL TEAM'] = prior_mean(team_match, ['Team', 'Location'], 'xG')
+    opponent_xg = team_match.rename(columns={'Team': 'Opponent', 'Opponent': 'Team', 'xG': 'xG_opp'})
+    team_match = team_match.merge(opponent_xg[['Team', 'Opponent', 'Date', 'xG_opp']],
+                                  on=['Team', 'Opponent', 'Date'], how='left')
+    team_match['Neto'] = team_match['xG'] - team_match['xG_opp']
+    df = df.merge(team_match[['Team', 'Date', 'Opponent', 'LOCAL TEAM', 'Neto']],
+                  on=['Team', 'Date', 'Opponent'], how='left')
+
+    df['CONFRONTO'] = np.where(
+        df['Location'] == 'home',
+        df['Team'] + ' x ' + df['Opponent'],
+        df['Opponent'] + ' x ' + df['Team'],
+    )
+    df['Liga'] = df['liga']
+    df['Year'] = df['Date'].dt.year
+    df['Month'] = df['Date'].dt.month
+    return df
+
+
+def build_report(store, leagues, start_date, end_date, source='fotmob', line=0.5, window=10,
+                 history_days=365):
+    """
+    Monta a planilha das ligas/período pedidos. O histórico anterior a start_date
+    (history_days) é lido só para as médias e não entra no resultado.
+    """
+    start_date = pd.Timestamp(start_date).normalize()
+    end_date = pd.Timestamp(end_date).normalize()
+    history_start = start_date - pd.Timedelta(days=history_days)
+
+    df = store.read(source, leagues=leagues, start=history_start, end=end_date, columns=SOURCE_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    df = add_derived_columns(df, line=line, window=window)
+    df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
+    return df.reindex(columns=REPORT_COLUMNS).reset_index(drop=True)
+
+
+def write_report(df, output_file):
+    """Grava o Excel com os formatos numéricos das colunas"""
+    from openpyxl.utils import get_column_letter
+
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Relatorio')
+        ws = writer.sheets['Relatorio']
+        for col_idx, column in enumerate(df.columns, 1):
+            number_format = NUMBER_FORMATS.get(column)
+            if number_format is None:
+                continue
+            for (cell,) in ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx):
+                cell.number_format = number_format
+        ws.freeze_panes = 'B2'
+        ws.auto_filter.ref = f"A1:{get_column_letter(len(df.columns))}{len(df) + 1}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Gera a planilha dos analistas a partir do armazém colunar',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--ligas', nargs='+', required=True, help='Ligas (ex: laliga premier)')
+    parser.add_argument('--inicio', type=str, required=True, help='Data de início (YYYY-MM-DD)')
+    parser.add_argument('--fim', type=str, required=True, help='Data de fim (YYYY-MM-DD)')
+    parser.add_argument('--fonte', type=str, choices=['fotmob', 'fbref'], default='fotmob',
+                       help='Conjunto do armazém usado (padrão: fotmob)')
+    parser.add_argument('--armazem', type=str, default=DEFAULT_STORE_DIR,
+                       help=f'Diretório do armazém (padrão: {DEFAULT_STORE_DIR})')
+    parser.add_argument('--linha', type=float, default=0.5,
+                       help='Linha de gols/assistências das odds justas (padrão: 0.5)')
+    parser.add_argument('--janela', type=int, default=10,
+                       help='Jogos anteriores usados na média de xG/xA (padrão: 10)')
+    parser.add_argument('--historico-dias', type=int, default=365,
+                       help='Dias de histórico antes do início lidos para as médias (padrão: 365)')
+    parser.add_argument('--output', type=str, default=None, help='Arquivo Excel de saída')
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        print("❌ pyarrow não está instalado. Instale com: pip install pyarrow")
+        sys.exit(1)
+
+    try:
+        start_date = pd.to_datetime(args.inicio)
+        end_date = pd.to_datetime(args.fim)
+    except:
+        print("❌ Erro: Datas inválidas. Use formato YYYY-MM-DD")
+        sys.exit(1)
+
+    print("="*70)
+    print("📑 RELATÓRIO DOS ANALISTAS")
+    print("="*70)
+    print(f"Ligas: {', '.join(args.ligas)} | Fonte: {args.fonte}")
+    print(f"Período: {args.inicio} até {args.fim}")
+    print("="*70)
+
+    store = ColumnarStore(args.armazem)
+    df = build_report(store, args.ligas, start_date, end_date, source=args.fonte, line=args.linha,
+                      window=args.janela, history_days=args.historico_dias)
+
+    if df.empty:
+        print("\n⚠️  Nenhum registro no armazém para as ligas e período pedidos.")
+        sys.exit(1)
+
+    output_file = args.output or (
+        f"relatorio_{'_'.join(args.ligas)}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.xlsx"
+    )
+    write_report(df, output_file)
+    print(f"\n✅ {len(df)} registros")
+    print(f"💾 Relatório salvo em: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Índice de identidade entre fontes (FBref, FotMob, Understat).
+
+Mapeia nomes (ou IDs) de jogadores e times de cada fonte para um ID canônico.
+Os nomes são normalizados (acentos, pontuação, sufixos de clube, abreviações)
+e, quando não há correspondência exata, comparados por similaridade apenas
+dentro de um bloco pequeno de candidatos (mesmo time, mesma inicial do
+sobrenome). Cada nome novo é resolvido uma única vez e fica gravado no índice,
+então juntar fontes vira um join por ID em vez de comparar strings.
+
+Times que só têm uma palavra em comum com um time conhecido ('Paris FC' e
+'Paris Saint-Germain', 'Betis' e 'Real Betis') não são unidos automaticamente:
+ficam na lista de pendentes do índice para revisão manual (aliases no JSON).
+Jogadores com o mesmo nome em times diferentes também não são unidos: uma
+transferência só mantém o ID com o ID do jogador na fonte (source_id) ou com
+um alias gravado manualmente.
+
+Exemplo:
+  python identidade.py --fbref laliga_fbref.xlsx --fotmob laliga_fotmob.xlsx --output comparacao.xlsx
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import unicodedata
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from importacao import lazy_import
+
+pd = lazy_import('pandas')
+
+DEFAULT_INDEX_PATH = 'identidades.json'
+
+# Limite de similaridade para aceitar uma correspondência aproximada
+FUZZY_THRESHOLD = 0.88
+
+# Tokens de clube que não fazem parte do nome (FC Barcelona == Barcelona)
+CLUB_TOKENS = {
+    'fc', 'cf', 'afc', 'sc', 'ac', 'as', 'ss', 'ssc', 'us', 'cd', 'ud', 'rc', 'rcd', 'sd',
+    'fk', 'sv', 'vfl', 'vfb', 'tsg', 'bv', 'club', 'calcio', 'football', 'futbol', '1',
+}
+
+# Abreviações comuns expandidas token a token
+TOKEN_ALIASES = {
+    'man': 'manchester',
+    'utd': 'united',
+    'nottm': 'nottingham',
+    'spurs': 'tottenham hotspur',
+    'wolves': 'wolverhampton wanderers',
+    'psg': 'paris saint germain',
+    'st': 'saint',
+    'inter': 'internazionale',
+    'gladbach': 'monchengladbach',
+}
+
+
+def normalize_name(name):
+    """Chave normalizada de um nome: sem acentos, minúsculo, só letras/dígitos"""
+    if not isinstance(name, str):
+        return ''
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.lower().replace('ø', 'o').replace('ß', 'ss').replace('ł', 'l')
+    text = re.sub(r"[^a-z0-9]+", ' ', text)
+    return ' '.join(text.split())
+
+
+def normalize_team(name):
+    """Chave normalizada de um time (sem sufixos de clube, abreviações expandidas)"""
+    tokens = []
+    for token in normalize_name(name).split():
+        if token in CLUB_TOKENS:
+            continue
+        tokens.extend(TOKEN_ALIASES.get(token, token).split())
+    return ' '.join(tokens) or normalize_name(name)
+
+
+def _player_block(key):
+    """Bloco de candidatos de um jogador: inicial do último sobrenome"""
+    tokens = key.split()
+    return tokens[-1][:1] if tokens else ''
+
+
+def _player_similarity(a, b):
+    """Similaridade entre duas chaves de jogador (considera iniciais: 'j smith' ~ 'john smith')"""
+    ratio = SequenceMatcher(None, a, b).ratio()
+    ta, tb = a.split(), b.split()
+    if ta and tb and ta[-1] == tb[-1]:
+        firsts_a, firsts_b = ta[:-1], tb[:-1]
+        if not firsts_a or not firsts_b:
+            # Apenas sobrenome em uma das fontes
+            ratio = max(ratio, 0.9)
+        elif len(firsts_a[0]) == 1 or len(firsts_b[0]) == 1:
+            if firsts_a[0][0] == firsts_b[0][0]:
+                ratio = max(ratio, 0.95)
+    return ratio
+
+
+class IdentityIndex:
+    """Índice persistente (JSON) de IDs canônicos de jogadores e times"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entities = {'team': {}, 'player': {}}
+        self.aliases = {}
+        self.unresolved = []
+        self.new_aliases = 0
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entities = data.get('entities', self.entities)
+            self.aliases = data.get('aliases', {})
+            self.unresolved = data.get('unresolved', [])
+
+        # Índices em memória: chave exata e blocos para a busca aproximada
+        self._by_key = {'team': {}, 'player': {}}
+        self._blocks = {}
+        for kind, entities in self.entities.items():
+            for canonical_id, entity in entities.items():
+                self._add_to_indexes(kind, canonical_id, entity)
+
+    def _add_to_indexes(self, kind, canonical_id, entity):
+        scope = entity.get('team', '')
+        self._by_key[kind].setdefault((scope, entity['key']), canonical_id)
+        if kind == 'player':
+            self._blocks.setdefault((scope, _player_block(entity['key'])), []).append(canonical_id)
+        else:
+            # Times: um bloco por palavra do nome ('betis' encontra 'real betis')
+            for token in set(entity['key'].split()):
+                self._blocks.setdefault(('team', token), []).append(canonical_id)
+
+    def _new_entity(self, kind, name, key, team_id=''):
+        prefix = 'T' if kind == 'team' else 'P'
+        canonical_id = f"{prefix}{len(self.entities[kind]) + 1:06d}"
+        entity = {'name': name, 'key': key}
+        if kind == 'player':
+            entity['team'] = team_id
+        self.entities[kind][canonical_id] = entity
+        self._add_to_indexes(kind, canonical_id, entity)
+        return canonical_id
+
+    def _match_team(self, key):
+        """Retorna (ID correspondente ou None, IDs com uma única palavra em comum)"""
+        canonical_id = self._by_key['team'].get(('', key))
+        if canonical_id:
+            return canonical_id, []
+        best_id, best_score = None, 0.0
+        partial = []
+        candidates = {c for token in key.split() for c in self._blocks.get(('team', token), [])}
+        for candidate_id in sorted(candidates):
+            candidate = self.entities['team'][candidate_id]['key']
+            shorter, longer = sorted((key.split(), candidate.split()), key=len)
+            if set(shorter) <= set(longer):
+                if len(shorter) == 1:
+                    # Uma palavra só ('paris' em 'paris saint germain'): ambíguo, revisão manual
+                    partial.append(candidate_id)
+                    continue
+                # Todas as palavras do nome menor presentes no maior
+                score = 0.9
+            else:
+                score = SequenceMatcher(None, key, candidate).ratio()
+            if score > best_score:
+                best_id, best_score = candidate_id, score
+        if best_score >= FUZZY_THRESHOLD:
+            return best_id, []
+        return None, partial
+
+    def _match_player(self, key, team_id):
+        canonical_id = self._by_key['player'].get((team_id, key))
+        if canonical_id:
+            return canonical_id
+        best_id, best_score = None, 0.0
+        for candidate_id in self._blocks.get((team_id, _player_block(key)), []):
+            score = _player_similarity(key, self.entities['player'][candidate_id]['key'])
+            if score > best_score:
+                best_id, best_score = candidate_id, score
+        if best_score >= FUZZY_THRESHOLD:
+            return best_id
+        # Sem correspondência no time: o mesmo nome em outro time não basta (homônimos);
+        # transferências só são unidas pelo ID da fonte (ver resolve_player)
+        return None
+
+    def resolve_team(self, source, name, source_id=None):
+        """ID canônico de um time de uma fonte (cria um novo se não houver correspondência)"""
+        alias = f"{source}|team|{source_id if source_id is not None else name}"
+        with self._lock:
+            canonical_id = self.aliases.get(alias)
+            if canonical_id:
+                return canonical_id
+            key = normalize_team(name)
+            canonical_id, partial = self._match_team(key)
+            if canonical_id is None:
+                canonical_id = self._new_entity('team', name, key)
+                if partial:
+                    self.unresolved.append({
+                        'alias': alias,
+                        'name': name,
+                        'id': canonical_id,
+                        'candidates': {c: self.entities['team'][c]['name'] for c in partial},
+                    })
+            self.aliases[alias] = canonical_id
+            self.new_aliases += 1
+            return canonical_id
+
+    def resolve_player(self, source, name, team_id='', source_id=None):
+        """
+        ID canônico de um jogador (team_id restringe a busca ao elenco do time).
+        Com source_id, o mesmo jogador da fonte em outro time (transferência)
+        mantém o ID; sem ele, nomes iguais em times diferentes viram IDs diferentes.
+        """
+        alias = f"{source}|player|{team_id}|{source_id if source_id is not None else name}"
+        source_alias = f"{source}|player|{source_id}" if source_id is not None else None
+        with self._lock:
+            canonical_id = self.aliases.get(alias)
+            if canonical_id:
+                return canonical_id
+            if source_alias is not None:
+                canonical_id = self.aliases.get(source_alias)
+            if not canonical_id:
+                key = normalize_name(name)
+                canonical_id = self._match_player(key, team_id) or self._new_entity('player', name, key, team_id)
+            self.aliases[alias] = canonical_id
+            if source_alias is not None:
+                self.aliases.setdefault(source_alias, canonical_id)
+            self.new_aliases += 1
+            return canonical_id
+
+    def team_ids(self, source):
+        """IDs canônicos dos times já vistos numa fonte"""
+        prefix = f"{source}|team|"
+        with self._lock:
+            return {canonical_id for alias, canonical_id in self.aliases.items() if alias.startswith(prefix)}
+
+    def annotate(self, df, source, player_col='Player', team_col='Team', opponent_col='Opponent'):
+        """
+        Adiciona TeamID, OpponentID e PlayerID a um DataFrame de uma fonte.
+        Cada combinação distinta é resolvida uma vez; o resto é um map vetorizado.
+        """
+        df = df.copy()
+        if team_col in df.columns:
+            teams = {name: self.resolve_team(source, name) for name in df[team_col].dropna().unique()}
+            df['TeamID'] = df[team_col].map(teams)
+        if opponent_col in df.columns:
+            opponents = {name: self.resolve_team(source, name) for name in df[opponent_col].dropna().unique()}
+            df['OpponentID'] = df[opponent_col].map(opponents)
+        if player_col in df.columns:
+            team_ids = df['TeamID'].fillna('') if 'TeamID' in df.columns else pd.Series('', index=df.index)
+            pairs = pd.DataFrame({'player': df[player_col], 'team': team_ids}).drop_duplicates()
+            resolved = {
+                (player, team): self.resolve_player(source, player, team)
+                for player, team in pairs.itertuples(index=False)
+                if isinstance(player, str)
+            }
+            df['PlayerID'] = [resolved.get(pair) for pair in zip(df[player_col], team_ids)]
+        return df
+
+    def save(self):
+        """Grava o índice (escrita atômica)"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entities': self.entities, 'aliases': self.aliases, 'unresolved': self.unresolved},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.new_aliases = 0
+
+
+def merge_sources(frames, index, stats=('Minutes', 'Goals', 'Assists', 'xG', 'xA')):
+    """
+    Junta registros de várias fontes por (PlayerID, dia do jogo).
+    frames: {'fbref': df, 'fotmob': df, ...}. Retorna um DataFrame largo com
+    as estatísticas de cada fonte lado a lado (ex: xG_fbref, xG_fotmob).
+    """
+    merged = None
+    for source, df in frames.items():
+        annotated = index.annotate(df, source)
+        annotated['MatchDay'] = pd.to_datetime(annotated['Date']).dt.tz_localize(None).dt.normalize()
+        columns = {col: f"{col}_{source}" for col in stats if col in annotated.columns}
+        for col in columns:
+            annotated[col] = pd.to_numeric(annotated[col], errors='coerce')
+        annotated = annotated.rename(columns={**columns, 'Player': f'Player_{source}'})
+        keep = ['PlayerID', 'TeamID', 'MatchDay', f'Player_{source}'] + list(columns.values())
+        annotated = annotated[keep].drop_duplicates(subset=['PlayerID', 'MatchDay'])
+        if merged is None:
+            merged = annotated
+        else:
+            merged = merged.merge(annotated, on=['PlayerID', 'TeamID', 'MatchDay'], how='outer')
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Junta planilhas de fontes diferentes por ID canônico de jogador/time'
+    )
+    parser.add_argument('--fbref', type=str, default=None, help='Planilha extraída do FBref')
+    parser.add_argument('--fotmob', type=str, default=None, help='Planilha extraída do FotMob')
+    parser.add_argument('--understat', type=str, default=None, help='Planilha extraída do Understat')
+    parser.add_argument('--indice', type=str, default=DEFAULT_INDEX_PATH,
+                       help=f'Arquivo do índice de identidades (padrão: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Salvar a comparação (.xlsx ou .csv)')
+    args = parser.parse_args()
+
+    frames = {}
+    for source in ('fbref', 'fotmob', 'understat'):
+        path = getattr(args, source)
+        if path:
+            frames[source] = pd.read_excel(path) if path.endswith('.xlsx') else pd.read_csv(path)
+
+    if len(frames) < 2:
+        parser.error('informe pelo menos duas fontes')
+
+    index = IdentityIndex(args.indice)
+    merged = merge_sources(frames, index)
+    print(f"✅ {len(merged)} linhas (jogador x jogo), {index.new_aliases} nome(s) novo(s) resolvido(s)")
+    index.save()
+
+    if index.unresolved:
+        print(f"⚠️  {len(index.unresolved)} time(s) com apenas uma palavra em comum com outro (não unidos):")
+        for item in index.unresolved:
+            candidates = ', '.join(f"{name} ({cid})" for cid, name in item['candidates'].items())
+            print(f"  - {item['name']} ({item['id']}) ~ {candidates}")
+        print(f"  💡 Para unir, aponte o alias em 'aliases' de {args.indice} para o ID correto")
+
+    sources = list(frames)
+    for a, b in zip(sources, sources[1:]):
+        if f'xG_{a}' in merged.columns and f'xG_{b}' in merged.columns:
+            both = merged[f'xG_{a}'].notna() & merged[f'xG_{b}'].notna()
+            diff = (merged.loc[both, f'xG_{a}'] - merged.loc[both, f'xG_{b}']).abs()
+            print(f"📊 xG {a} vs {b}: {both.sum()} pares, diferença média {diff.mean():.4f}")
+
+    if args.output:
+        if args.output.endswith('.xlsx'):
+            merged.to_excel(args.output, index=False)
+        else:
+            merged.to_csv(args.output, index=False)
+        print(f"💾 Comparação salva em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Importação tardia dos módulos pesados (pandas, numpy, requests, bs4, pyarrow...).
+
+lazy_import devolve um módulo substituto: o módulo real só é importado no
+primeiro acesso a um atributo, com trava (o primeiro acesso pode vir de
+várias threads ao mesmo tempo). Em seguida os atributos são copiados para o
+substituto, e o acesso passa a custar o mesmo que no módulo real. Assim
+--help, erros de argumentos e os caminhos que não usam a biblioteca não
+pagam o custo da importação (ver benchmark.py importacao).
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+_lock = threading.RLock()
+_proxies = {}  # nome -> substituto
+_loaded = {}   # nome -> módulo real, depois da primeira importação
+
+
+class _LazyModule(types.ModuleType):
+    """Substituto de um módulo ainda não importado"""
+
+    def __getattr__(self, attr):
+        module = _loaded.get(self.__name__) or _load(self.__name__)
+        return getattr(module, attr)
+
+
+def _load(name):
+    """Importa o módulo real e copia os atributos para o substituto"""
+    with _lock:
+        module = _loaded.get(name)
+        if module is None:
+            module = importlib.import_module(name)
+            proxy = _proxies.get(name)
+            if proxy is not None:
+                proxy.__dict__.update(module.__dict__)
+            _loaded[name] = module
+        return module
+
+
+def module_available(name):
+    """True se o módulo está instalado (sem importá-lo)"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name):
+    """Módulo importado só no primeiro acesso a um atributo (ImportError se não instalado)"""
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        proxy = _proxies.get(name)
+        if proxy is None:
+            if not module_available(name):
+                raise ImportError(f"No module named '{name}'", name=name)
+            proxy = _proxies[name] = _LazyModule(name)
+        return proxy
+
+
+def is_loaded(name):
+    """True se o módulo já foi de fato importado"""
+    return name in sys.modules
+
+
+def load(*modules):
+    """Importa já os módulos tardios (sem argumentos: todos os pedidos até agora)"""
+    for module in modules or list(_proxies.values()):
+        if isinstance(module, _LazyModule):
+            _load(module.__name__)
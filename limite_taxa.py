@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Limite de requisições por host compartilhado entre processos.
+
+Um balde de fichas (token bucket) por host, guardado num banco SQLite. Cada
+requisição consome uma ficha dentro de uma transação exclusiva (BEGIN
+IMMEDIATE), então vários processos do scraper (ex: uma liga por processo)
+dividem o mesmo orçamento em vez de cada um pausar por conta própria.
+
+Um 403/429 recebido por qualquer processo bloqueia o host para todos
+durante a espera (penalize).
+
+A ficha é consumida por RateLimitedSession, a camada da sessão mais próxima
+da rede: respostas vindas do cache ou de um pedido coalescido não gastam o
+orçamento (ver limit_session).
+
+Exemplo (duas ligas em paralelo, no máximo 10 páginas/minuto no total):
+  python buscar_estatisticas_multi_liga.py --liga laliga ... --limite-global 10 &
+  python buscar_estatisticas_multi_liga.py --liga seriea ... --limite-global 10 &
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from cache_http import CachedSession
+
+DEFAULT_LIMIT_PATH = '.limite_taxa.sqlite'
+
+# Orçamento padrão do FBref (páginas por minuto, somando todos os processos)
+FBREF_PAGES_PER_MINUTE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class RateLimiter:
+    """Token bucket por host em SQLite, consultado por todos os processos"""
+
+    def __init__(self, path=DEFAULT_LIMIT_PATH, per_minute=FBREF_PAGES_PER_MINUTE, burst=1):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate = per_minute / 60.0  # fichas por segundo
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        # isolation_level=None: transações controladas explicitamente (BEGIN IMMEDIATE)
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def _take(self, host, now):
+        """Tenta consumir uma ficha. Retorna 0 se conseguiu ou os segundos a esperar."""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self._conn.execute(
+                'SELECT tokens, updated_at, blocked_until FROM buckets WHERE host = ?', (host,)
+            ).fetchone()
+            if row is None:
+                tokens, blocked_until = float(self.burst), 0.0
+            else:
+                tokens, updated_at, blocked_until = row
+                tokens = min(float(self.burst), tokens + max(0.0, now - updated_at) * self.rate)
+
+            if now < blocked_until:
+                wait = blocked_until - now
+            elif tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO buckets (host, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)',
+                (host, tokens, now, blocked_until)
+            )
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return wait
+
+    def acquire(self, host):
+        """Bloqueia até haver uma ficha para o host. Retorna o tempo total esperado (s)."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = self._take(host, time.time())
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, host, seconds):
+        """Bloqueia o host para todos os processos por alguns segundos (após 403/429)"""
+        until = time.time() + seconds
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute(
+                    'INSERT INTO buckets (host, tokens, updated_at, blocked_until) VALUES (?, 0, ?, ?) '
+                    'ON CONFLICT(host) DO UPDATE SET blocked_until = MAX(blocked_until, excluded.blocked_until)',
+                    (host, time.time(), until)
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimitedSession:
+    """Sessão que consome uma ficha do RateLimiter antes de cada get() que vai à rede"""
+
+    def __init__(self, session, limiter):
+        self.session = session
+        self.limiter = limiter
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def __getattr__(self, name):
+        if name == 'session':
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def get(self, url, **kwargs):
+        self.limiter.acquire(urlparse(url).netloc)
+        return self.session.get(url, **kwargs)
+
+
+def limit_session(session, limiter):
+    """
+    Aplica o limite na camada que fala com a rede. Numa CachedSession com
+    sessão de rede, só as faltas do cache passam pelo limite; em modo offline
+    nada é limitado.
+    """
+    if isinstance(session, CachedSession):
+        if session.session is not None:
+            session.session = RateLimitedSession(session.session, limiter)
+        return session
+    return RateLimitedSession(session, limiter)
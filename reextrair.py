@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Reextrai estatísticas a partir do arquivo de páginas (arquivo_paginas.py), sem rede.
+
+Quando o parser muda (get_player_stats_from_match, process_schedule_table,
+extract_player_stats, extract_json_var...), roda os extratores atuais sobre as páginas já
+arquivadas, em paralelo (um processo por mês do período), em vez de baixar
+tudo de novo.
+
+Exemplos:
+  python reextrair.py --fonte fbref --liga laliga --inicio 2023-08-01 --fim 2025-05-31
+  python reextrair.py --fonte fotmob --liga bundesliga --inicio 2024-08-01 --fim 2025-05-31 --workers 8
+  python reextrair.py --fonte understat --liga premier --inicio 2024-08-01 --fim 2025-05-31
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from arquivo_paginas import PageArchive
+from buscar_estatisticas_fotmob import FOTMOB_LEAGUE_IDS, FotMobScraper, scrape_league_period
+from buscar_estatisticas_multi_liga import LEAGUE_IDS, LeagueScraper, months_in_period, scrape_period
+from buscar_estatisticas_understat import UnderstatScraper, scrape_understat_period
+from cache_http import CachedSession
+from importacao import lazy_import
+from registro import configure_cli_logging
+
+pd = lazy_import('pandas')
+
+
+def split_by_month(start_date, end_date):
+    """Divide o período em janelas mensais (uma por processo)"""
+    windows = []
+    for year, month in months_in_period(start_date, end_date):
+        month_start = pd.Timestamp(year, month, 1)
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        windows.append((max(start_date, month_start), min(end_date, month_end)))
+    return windows
+
+
+def reextract_window(fonte, liga, start_date, end_date, archive_path, verbose=False):
+    """Roda o extrator atual de uma fonte sobre o arquivo para uma janela de datas"""
+    configure_cli_logging()  # Processos novos (spawn) não herdam a configuração
+    archive = PageArchive(archive_path)
+    session = CachedSession(archive)
+
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        if fonte == 'fbref':
+            league_info = LEAGUE_IDS[liga]
+            scraper = LeagueScraper(session=session, delays=False)
+            scraper._initialized = True
+            rows = scrape_period(league_info['id'], league_info['name'], start_date, end_date, scraper)
+        elif fonte == 'understat':
+            scraper = UnderstatScraper(session=session, delays=False)
+            rows = scrape_understat_period(liga, start_date, end_date, scraper)
+        else:
+            scraper = FotMobScraper(session=session, delays=False)
+            rows = scrape_league_period(liga, start_date, end_date, scraper)
+
+    archive.close()
+    return rows, session.hits, session.misses
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Reextrai estatísticas do arquivo de páginas, sem acessar a rede',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--fonte', type=str, choices=['fbref', 'fotmob', 'understat'], required=True,
+                       help='Fonte das páginas arquivadas')
+    parser.add_argument('--liga', type=str, required=True,
+                       choices=sorted(set(LEAGUE_IDS) | set(FOTMOB_LEAGUE_IDS)),
+                       help='Liga a reextrair')
+    parser.add_argument('--inicio', type=str, required=True, help='Data de início (YYYY-MM-DD)')
+    parser.add_argument('--fim', type=str, required=True, help='Data de fim (YYYY-MM-DD)')
+    parser.add_argument('--arquivo-paginas', type=str, default='paginas.sqlite',
+                       help='Banco do arquivo de páginas (padrão: paginas.sqlite)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Processos em paralelo (padrão: número de CPUs)')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Arquivo Excel de saída')
+    parser.add_argument('--test', action='store_true',
+                       help='Modo teste - não salva arquivo')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Mostrar a saída dos extratores')
+    args = parser.parse_args()
+
+    try:
+        start_date = pd.to_datetime(args.inicio)
+        end_date = pd.to_datetime(args.fim)
+    except:
+        print("❌ Erro: Datas inválidas. Use formato YYYY-MM-DD")
+        sys.exit(1)
+
+    if args.fonte == 'understat' and args.liga not in UnderstatScraper().leagues:
+        print(f"❌ Liga '{args.liga}' não suportada pelo Understat")
+        sys.exit(1)
+
+    if not os.path.exists(args.arquivo_paginas):
+        print(f"❌ Arquivo de páginas não encontrado: {args.arquivo_paginas}")
+        sys.exit(1)
+
+    archive = PageArchive(args.arquivo_paginas)
+    stats = archive.stats()
+    archive.close()
+
+    windows = split_by_month(start_date, end_date)
+
+    print("="*70)
+    print("♻️  REEXTRAÇÃO A PARTIR DO ARQUIVO DE PÁGINAS")
+    print("="*70)
+    print(f"Fonte: {args.fonte} | Liga: {args.liga}")
+    print(f"Período: {start_date.strftime('%Y-%m-%d')} até {end_date.strftime('%Y-%m-%d')} ({len(windows)} janela(s))")
+    print(f"Arquivo: {args.arquivo_paginas} ({stats['fetches']} buscas, {stats['bodies']} páginas distintas)")
+    print("="*70)
+
+    started = time.perf_counter()
+    all_rows = []
+    hits = misses = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(reextract_window, args.fonte, args.liga, window_start, window_end,
+                            args.arquivo_paginas, args.verbose)
+            for window_start, window_end in windows
+        ]
+        for (window_start, _), future in zip(windows, futures):
+            try:
+                rows, window_hits, window_misses = future.result()
+            except Exception as e:
+                print(f"  ❌ Erro em {window_start.strftime('%Y-%m')}: {e}")
+                continue
+            print(f"  ✅ {window_start.strftime('%Y-%m')}: {len(rows)} registros")
+            all_rows.extend(rows)
+            hits += window_hits
+            misses += window_misses
+
+    print(f"\n⏱️  {time.perf_counter() - started:.1f}s - {hits} página(s) lidas do arquivo, {misses} ausente(s)")
+
+    if not all_rows:
+        print("\n⚠️  Nenhum dado foi encontrado no arquivo.")
+        sys.exit(1)
+
+    df = pd.DataFrame(all_rows)
+    df = df.drop_duplicates(subset=['Player', 'Team', 'Date', 'Opponent'], keep='last')
+    df = df.sort_values('Date').reset_index(drop=True)
+
+    print(f"✅ Total: {len(df)} registros de jogadores")
+
+    if args.test:
+        print("\n🧪 MODO TESTE - Primeiras linhas:")
+        print(df.head(10).to_string())
+    else:
+        output_file = args.output or (
+            f"{args.liga}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}_{args.fonte}_reextraido.xlsx"
+        )
+        df.to_excel(output_file, index=False)
+        print(f"\n💾 Dados salvos em: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Registro (logging) das mensagens de progresso dos scrapers.
+
+As funções de biblioteca escrevem no logger 'estatisticas' (ou no logger
+passado ao scraper) em vez de usar print; sem configuração nada é mostrado.
+Os scripts chamam configure_cli_logging() para mostrar as mensagens no
+terminal, como antes.
+"""
+
+import logging
+import sys
+
+LOGGER_NAME = 'estatisticas'
+
+# Biblioteca: silenciosa até o chamador configurar o logging
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(source):
+    """Logger de uma fonte (ex: 'fbref' -> 'estatisticas.fbref')"""
+    return logging.getLogger(f"{LOGGER_NAME}.{source}")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Escreve no sys.stdout do momento (respeita redirect_stdout e capturas por thread)"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_cli_logging(level=logging.INFO):
+    """Mostra as mensagens dos scrapers no terminal (só o texto, sem prefixos)"""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    if not any(isinstance(handler, _StdoutHandler) for handler in logger.handlers):
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Saídas em fluxo para os registros dos scrapers.
+
+iter_period (FBref) e iter_league_period (FotMob) entregam os registros jogo
+a jogo. Cada saída acumula até chunk_rows registros e grava o bloco, então a
+memória não cresce com o tamanho do período e os resultados parciais já
+aparecem durante backfills longos.
+
+- StoreSink: armazém colunar (armazenamento.ColumnarStore)
+- ParquetSink: diretório com um arquivo Parquet por bloco (parte-00000.parquet, ...),
+  todos com o mesmo esquema
+- NdjsonSink: um JSON por linha (ex: saída padrão, para outro processo consumir)
+
+Exemplo:
+  with ParquetSink('saida_laliga', scraper.stats_frame) as sink:
+      for rows in iter_period(12, 'La Liga', start, end, scraper):
+          sink.write(rows)
+"""
+
+import json
+import math
+import os
+import sys
+import uuid
+from pathlib import Path
+
+from armazenamento import HAS_PYARROW, PLAYER_MATCH_KEY
+from importacao import lazy_import
+
+pd = lazy_import('pandas')
+
+# Registros acumulados antes de gravar um bloco (StoreSink/ParquetSink)
+DEFAULT_CHUNK_ROWS = 5000
+
+
+class RowSink:
+    """Base das saídas: acumula registros e grava em blocos de chunk_rows"""
+
+    def __init__(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.chunk_rows = max(1, chunk_rows)
+        self.buffer = []
+        self.rows_written = 0
+        self.chunks_written = 0
+
+    def write(self, rows):
+        """Recebe os registros de um jogo (grava quando o bloco enche)"""
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.chunk_rows:
+            self.flush()
+
+    # Usável no lugar de uma lista (ex: shot_rows do FotMob)
+    extend = write
+
+    def flush(self):
+        """Grava os registros acumulados"""
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        self._write_chunk(rows)
+        self.rows_written += len(rows)
+        self.chunks_written += 1
+
+    def _write_chunk(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Grava o bloco pendente mesmo se a busca foi interrompida
+        self.close()
+
+
+class StoreSink(RowSink):
+    """Blocos mesclados no armazém colunar (a chave evita duplicatas entre blocos)"""
+
+    def __init__(self, store, dataset, league, frame_builder, key=PLAYER_MATCH_KEY, sort_by=None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        self.store = store
+        self.dataset = dataset
+        self.league = league
+        self.frame_builder = frame_builder
+        self.key = key
+        self.sort_by = sort_by
+
+    def _write_chunk(self, rows):
+        self.store.append(self.dataset, self.frame_builder(rows), self.league, key=self.key, sort_by=self.sort_by)
+
+
+def _pyarrow():
+    """Módulos do pyarrow usados pelo ParquetSink (pa, pq), importados só ao gravar"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    return pa, pq
+
+
+def _conform(table, schema):
+    """Tabela com exatamente as colunas e tipos do esquema (colunas ausentes ficam nulas)"""
+    pa, _ = _pyarrow()
+    columns = [
+        table.column(field.name).cast(field.type) if field.name in table.column_names
+        else pa.nulls(len(table), field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class ParquetSink(RowSink):
+    """
+    Um arquivo Parquet por bloco num diretório (lido inteiro com pd.read_parquet).
+    Todas as partes têm o mesmo esquema: quando um bloco traz colunas novas ou um
+    tipo mais largo (ex: fm_* que só aparecem depois, inteiro que vira float), as
+    partes anteriores são regravadas com o esquema unificado. Cada parte é gravada
+    num temporário e renomeada: as partes visíveis estão completas.
+    """
+
+    def __init__(self, directory, frame_builder, chunk_rows=DEFAULT_CHUNK_ROWS):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow não está instalado. Instale com: pip install pyarrow")
+        super().__init__(chunk_rows)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.frame_builder = frame_builder
+        parts = self._parts()
+        # Continua a numeração de execuções anteriores, sem sobrescrever partes
+        self.next_part = len(parts)
+        # Esquema comum das partes e dtype do pandas de cada coluna (Int64, boolean...)
+        self.schema = None
+        self.dtypes = {}
+        if parts:
+            _, pq = _pyarrow()
+            existing = pq.read_schema(parts[-1])
+            self.schema = existing.remove_metadata()
+            self.dtypes = dict(existing.empty_table().to_pandas().dtypes)
+
+    def _parts(self):
+        return sorted(self.directory.glob('parte-*.parquet'))
+
+    def _write_table(self, table, path):
+        _, pq = _pyarrow()
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_chunk(self, rows):
+        pa, pq = _pyarrow()
+        frame = self.frame_builder(rows)
+        table = pa.Table.from_pandas(frame, preserve_index=False).replace_schema_metadata(None)
+        if self.schema is None:
+            schema = table.schema
+        else:
+            schema = pa.unify_schemas([self.schema, table.schema], promote_options='permissive')
+
+        known = self.schema
+        for field in schema:
+            # Coluna nova ou com tipo alargado: vale o dtype deste bloco
+            if known is None or field.name not in known.names or known.field(field.name).type != field.type:
+                self.dtypes[field.name] = frame[field.name].dtype
+        # Metadados do pandas do esquema inteiro: Int64/boolean voltam como estavam
+        metadata = pa.Schema.from_pandas(
+            pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in self.dtypes.items()}),
+            preserve_index=False,
+        ).metadata
+        schema = schema.with_metadata(metadata)
+
+        if self.schema is not None and not schema.remove_metadata().equals(self.schema):
+            # Esquema mudou: regravar as partes anteriores para continuarem legíveis juntas
+            for path in self._parts():
+                self._write_table(_conform(pq.read_table(path), schema), path)
+        self.schema = schema.remove_metadata()
+
+        self._write_table(_conform(table, schema), self.directory / f"parte-{self.next_part:05d}.parquet")
+        self.next_part += 1
+
+
+def _json_value(value):
+    """Valores que o json não serializa sozinho (datas, tipos do numpy/pandas)"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class NdjsonSink(RowSink):
+    """Um JSON por registro, escrito a cada jogo (stream padrão: sys.stdout)"""
+
+    def __init__(self, stream=None, chunk_rows=1):
+        super().__init__(chunk_rows)
+        self.stream = stream
+
+    def _write_chunk(self, rows):
+        stream = self.stream or sys.stdout
+        for row in rows:
+            row = {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in row.items()}
+            stream.write(json.dumps(row, ensure_ascii=False, default=_json_value) + '\n')
+        stream.flush()
+
+
+def stream_rows(batches, sinks):
+    """Entrega cada lote de registros a todas as saídas e as fecha no fim. Retorna o total."""
+    total = 0
+    try:
+        for rows in batches:
+            for sink in sinks:
+                sink.write(rows)
+            total += len(rows)
+    finally:
+        for sink in sinks:
+            sink.close()
+    return total
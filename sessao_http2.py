@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Sessão HTTP/2 (httpx) com a interface de requests.Session.get usada pelos scrapers.
+
+Uma única conexão multiplexa as requisições de várias threads (ex: vários
+matchDetails do FotMob ao mesmo tempo), sem abrir um socket e um handshake
+TLS por requisição. As respostas são convertidas em requests.Response (e os
+erros de transporte em requests.exceptions.Timeout/ConnectionError), então
+ArchivingSession, SingleFlightSession e o resto do código não mudam.
+
+Para testar contra um servidor local sem TLS (h2c), use uma URL http://: a
+sessão fala HTTP/2 direto (prior knowledge). tests/test_sessao_http2.py faz
+isso com um servidor h2c local.
+
+Requer httpx com suporte a HTTP/2 (opcional): pip install "httpx[http2]"
+"""
+
+from cache_http import make_response
+from importacao import lazy_import, module_available
+
+HAS_HTTPX = module_available('httpx') and module_available('h2')
+if HAS_HTTPX:
+    httpx = lazy_import('httpx')
+
+requests = lazy_import('requests')
+
+# Cabeçalhos que descrevem o corpo no fio (o httpx já entrega o corpo descomprimido)
+_WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class Http2Session:
+    """Cliente httpx (HTTP/2) compatível com requests.Session.get"""
+
+    def __init__(self, prior_knowledge=False, max_connections=4, verify=True):
+        if not HAS_HTTPX:
+            raise ImportError('httpx[http2] não está instalado. Instale com: pip install "httpx[http2]"')
+        # prior_knowledge: HTTP/2 sem negociação (servidor h2c local, URLs http://)
+        self.client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            verify=verify,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    def get(self, url, timeout=20, headers=None, params=None, **kwargs):
+        try:
+            response = self.client.get(url, timeout=timeout, headers=headers, params=params)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        result = make_response(
+            str(response.url),
+            response.content,
+            response.status_code,
+            {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS},
+        )
+        result.reason = response.reason_phrase
+        return result
+
+    def close(self):
+        self.client.close()
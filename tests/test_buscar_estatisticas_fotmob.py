@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Leitura parcial do matchDetails (trim_match_details) comparada com json.loads.
+
+O documento imita a resposta da API: playerStats e header.status no meio de
+trechos que são pulados sem decodificar (strings com chaves, colchetes, aspas
+e barras escapadas, números com expoente, listas aninhadas).
+"""
+
+import json
+
+import pytest
+
+from buscar_estatisticas_fotmob import MATCH_DETAIL_PATHS, SHOTMAP_PATH, _skip_json_value, trim_match_details
+
+
+def stat(value, kind):
+    return {'key': kind, 'stat': {'value': value, 'type': kind}}
+
+
+def match_details(players=22):
+    """matchDetails com as seções da API na ordem em que ela as envia"""
+    events = [{
+        'type': 'Goal' if minute % 30 == 0 else 'Card',
+        'time': minute,
+        'player': {'name': f'Jogador {minute}', 'id': minute},
+        'text': 'texto com } e ] e "aspas" e \\ barra',
+        'nested': [[1, 2.5e3, -3], {'a': [None, False, True]}],
+    } for minute in range(0, 95, 5)]
+    player_stats = {str(100 + i): {
+        'name': f'Jogador "{i}" {{x}} [y] Ñúñez',
+        'id': 100 + i,
+        'teamId': 10 + i % 2,
+        'teamName': 'Sevilla' if i % 2 == 0 else 'Elche',
+        'isGoalkeeper': i == 0,
+        'stats': [{'title': 'Top stats', 'key': 'top_stats', 'stats': {
+            'Minutes played': stat(90 - i, 'integer'),
+            'Expected goals (xG)': stat(round(i * 0.013, 3), 'double'),
+            'Accurate passes': stat(f'{20 + i}/{25 + i} ({80}%)', 'fractionWithPercentage'),
+            'Captain': stat(i == 1, 'boolean'),
+            'Rating': stat(None, 'double'),
+        }}],
+    } for i in range(players)}
+    return {
+        'general': {'matchId': 1, 'leagueName': 'LaLiga', 'teamColors': {'home': '#fff', 'away': '#000'}},
+        'header': {
+            'teams': [{'name': 'Sevilla', 'score': 1}, {'name': 'Elche', 'score': 0}],
+            'status': {'utcTime': '2025-09-12T19:00:00Z', 'finished': True, 'cancelled': False,
+                       'reason': {'short': 'FT', 'long': 'Full-Time'}},
+        },
+        'nav': ['matchfacts', 'stats', 'lineup'],
+        'ongoing': False,
+        'content': {
+            'matchFacts': {'events': {'events': events}, 'infoBox': {'Stadium': {'name': 'Estádio {1} [a]'}}},
+            'stats': {'Periods': {'All': {'stats': [
+                {'title': f'Grupo {g}', 'stats': [{'title': f'S{k}', 'stats': [k, k / 2]} for k in range(10)]}
+                for g in range(4)
+            ]}}},
+            'playerStats': player_stats,
+            'shotmap': {'shots': [{'id': i, 'playerId': 100 + i, 'expectedGoals': i / 10} for i in range(8)]},
+            'lineup': {'homeTeam': {'starters': [{'name': f'Titular {i}', 'id': i} for i in range(11)]}},
+        },
+        'seo': {'path': '/match/1', 'eventJSONLD': {'@context': 'https://schema.org'}},
+    }
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_trim_matches_json_loads(indent):
+    text = json.dumps(match_details(), ensure_ascii=False, indent=indent)
+    full = json.loads(text)
+
+    assert trim_match_details(text) == {
+        'content': {'playerStats': full['content']['playerStats']},
+        'header': {'status': full['header']['status']},
+    }
+    trimmed = trim_match_details(text, MATCH_DETAIL_PATHS + [SHOTMAP_PATH])
+    assert trimmed['content']['shotmap'] == full['content']['shotmap']
+
+
+def test_missing_paths_are_left_out():
+    document = match_details()
+    del document['content']['playerStats']
+    assert trim_match_details(json.dumps(document)) == {'header': {'status': document['header']['status']}}
+
+
+@pytest.mark.parametrize('value', [
+    '"a } ] \\" \\\\"',
+    '-1.5e-3',
+    'null',
+    '{"a": [1, {"b": "}"}], "c": {}}',
+    '[' * 20 + '"x]"' + ']' * 20,
+])
+def test_skip_ends_where_json_decoder_ends(value):
+    text = value + ', "next": 1}'
+    assert _skip_json_value(text, 0) == json.JSONDecoder().raw_decode(text)[1] == len(value)
+
+
+@pytest.mark.parametrize('text', ['{"a": "sem fim', '{"a": [1, 2', '"sem fim'])
+def test_truncated_values_raise(text):
+    with pytest.raises(ValueError):
+        _skip_json_value(text, 0)
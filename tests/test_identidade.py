@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Índice de identidade (identidade.IdentityIndex): nomes de fontes diferentes
+resolvidos para o mesmo ID canônico sem unir homônimos de times diferentes.
+"""
+
+import pandas as pd
+
+from identidade import IdentityIndex, merge_sources
+
+
+def make_index(tmp_path):
+    return IdentityIndex(tmp_path / 'identidades.json')
+
+
+def test_same_name_on_different_teams_gets_different_ids(tmp_path):
+    index = make_index(tmp_path)
+    city = index.resolve_team('fbref', 'Manchester City')
+    atletico = index.resolve_team('fbref', 'Atlético Madrid')
+
+    rodri_city = index.resolve_player('fbref', 'Rodri', city)
+    rodri_atletico = index.resolve_player('fbref', 'Rodri', atletico)
+    assert rodri_city != rodri_atletico
+    assert index.resolve_player('fotmob', 'Rodri', atletico) == rodri_atletico
+
+
+def test_same_team_resolves_across_sources(tmp_path):
+    index = make_index(tmp_path)
+    team = index.resolve_team('fbref', 'Manchester Utd')
+    assert index.resolve_team('fotmob', 'Manchester United') == team
+
+    player = index.resolve_player('fbref', 'Bruno Fernandes', team)
+    assert index.resolve_player('fotmob', 'Bruno Fernandes', team) == player
+    assert index.resolve_player('understat', 'B. Fernandes', team) == player
+
+
+def test_transfer_keeps_id_only_with_source_id(tmp_path):
+    index = make_index(tmp_path)
+    chelsea = index.resolve_team('fotmob', 'Chelsea')
+    napoli = index.resolve_team('fotmob', 'Napoli')
+
+    before = index.resolve_player('fotmob', 'Romelu Lukaku', chelsea, source_id=1)
+    assert index.resolve_player('fotmob', 'Romelu Lukaku', napoli, source_id=1) == before
+    assert index.resolve_player('fbref', 'Romelu Lukaku', napoli) != before
+
+
+def test_index_round_trip(tmp_path):
+    index = make_index(tmp_path)
+    team = index.resolve_team('fbref', 'Real Betis')
+    player = index.resolve_player('fbref', 'Isco', team)
+    index.save()
+
+    reloaded = make_index(tmp_path)
+    assert reloaded.resolve_player('fotmob', 'Isco', reloaded.resolve_team('fotmob', 'Real Betis')) == player
+    assert reloaded.resolve_player('fotmob', 'Isco', reloaded.resolve_team('fotmob', 'Sevilla')) != player
+
+
+def test_merge_sources_joins_by_player_id(tmp_path):
+    date = pd.Timestamp('2025-09-12')
+    fbref = pd.DataFrame([
+        {'Player': 'Rodri', 'Team': 'Manchester City', 'Opponent': 'Arsenal', 'Date': date, 'xG': 0.1},
+        {'Player': 'Rodri', 'Team': 'Atlético Madrid', 'Opponent': 'Elche', 'Date': date, 'xG': 0.3},
+    ])
+    fotmob = fbref.assign(Team=['Man City', 'Atletico Madrid'], xG=[0.12, 0.28])
+
+    merged = merge_sources({'fbref': fbref, 'fotmob': fotmob}, make_index(tmp_path))
+    assert len(merged) == 2
+    assert merged['xG_fotmob'].notna().all()
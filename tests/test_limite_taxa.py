@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Limite global (limite_taxa): só as requisições que chegam à rede consomem
+fichas; acertos do cache e pedidos juntados pela SingleFlightSession não.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from buscar_estatisticas_fotmob import FotMobScraper
+from buscar_estatisticas_multi_liga import LeagueScraper
+from cache_http import CachedSession, make_response
+
+
+class CountingLimiter:
+    """RateLimiter que só conta as fichas pedidas"""
+
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, host):
+        self.acquired += 1
+        return 0.0
+
+    def penalize(self, host, seconds):
+        pass
+
+
+class SlowNetwork:
+    """Sessão de rede falsa; o atraso deixa os pedidos simultâneos se sobreporem"""
+
+    def __init__(self):
+        self.headers = requests.structures.CaseInsensitiveDict()
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        time.sleep(0.2)
+        return make_response(url, b'{}', 200, {})
+
+
+class MemoryCache:
+    def __init__(self):
+        self.pages = {}
+
+    def get(self, url):
+        return self.pages.get(url)
+
+    def put(self, url, body, status_code, headers):
+        self.pages[url] = (body, {'status_code': status_code})
+
+
+SCRAPERS = [LeagueScraper, FotMobScraper]
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_coalesced_requests_take_one_token(scraper_class):
+    limiter, network = CountingLimiter(), SlowNetwork()
+    scraper = scraper_class(session=network, rate_limiter=limiter)
+
+    threads = [threading.Thread(target=scraper._fetch, args=('https://exemplo.com/liga',)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert network.calls == 1
+    assert limiter.acquired == 1
+
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS)
+def test_cache_hits_take_no_token(scraper_class):
+    limiter, network, cache = CountingLimiter(), SlowNetwork(), MemoryCache()
+    cache.put('https://exemplo.com/jogo', b'{}', 200, {})
+
+    online = scraper_class(session=CachedSession(cache, network), rate_limiter=limiter)
+    assert online._fetch('https://exemplo.com/jogo').status_code == 200
+    assert limiter.acquired == 0
+
+    online._fetch('https://exemplo.com/outro-jogo')
+    assert network.calls == 1
+    assert limiter.acquired == 1
+
+    offline = scraper_class(session=CachedSession(cache), rate_limiter=limiter)
+    offline._fetch('https://exemplo.com/sem-cache')
+    assert limiter.acquired == 1
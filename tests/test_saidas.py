@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Saídas em fluxo (saidas.py): partes Parquet lidas de volta com pd.read_parquet.
+
+Os blocos têm esquemas diferentes, como numa busca real: colunas fm_* que só
+aparecem em jogos posteriores, inteiros anuláveis todos nulos num bloco e uma
+coluna inteira que vira float.
+"""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from armazenamento import HAS_PYARROW, typed_frame
+from saidas import NdjsonSink, ParquetSink, stream_rows
+
+# Registro de dtypes como o do modo amplo do FotMob (FotMobScraper.wide_dtypes)
+DTYPES = {'Minutes': 'Int64', 'fm_passes': 'Int64', 'fm_xgot': 'float64', 'fm_captain': 'boolean'}
+
+
+def frame(rows):
+    return typed_frame(rows, DTYPES)
+
+
+def player(name, date, **stats):
+    return {'Player': name, 'Team': 'Time', 'Date': pd.Timestamp(date), 'Minutes': 90, **stats}
+
+
+# Cada lote é um jogo; chunk_rows=2 grava um bloco a cada jogo
+BATCHES = [
+    [player('A', '2025-09-01', adj=0), player('B', '2025-09-01', adj=0, Minutes=None)],
+    [player('C', '2025-09-08', adj=1, fm_passes=None), player('D', '2025-09-08', adj=0, fm_passes=None)],
+    [player('E', '2025-09-15', adj=0.5, fm_passes=31, fm_xgot=0.42),
+     player('F', '2025-09-15', adj=0, fm_passes=None, fm_captain=True)],
+]
+
+
+requires_pyarrow = pytest.mark.skipif(not HAS_PYARROW, reason='pyarrow não está instalado')
+
+
+def read_back(directory):
+    return pd.read_parquet(directory).sort_values('Player').reset_index(drop=True)
+
+
+@requires_pyarrow
+def test_heterogeneous_chunks_round_trip(tmp_path):
+    with ParquetSink(tmp_path, frame, chunk_rows=2) as sink:
+        for rows in BATCHES:
+            sink.write(rows)
+    assert sink.chunks_written == 3
+
+    df = read_back(tmp_path)
+    assert list(df['Player']) == ['A', 'B', 'C', 'D', 'E', 'F']
+    assert set(df.columns) == {'Player', 'Team', 'Date', 'Minutes', 'adj', 'fm_passes', 'fm_xgot', 'fm_captain'}
+    assert str(df['Minutes'].dtype) == 'Int64'
+    assert str(df['fm_passes'].dtype) == 'Int64'
+    assert str(df['fm_captain'].dtype) == 'boolean'
+    assert str(df['adj'].dtype) == 'float64'
+    assert df.loc[4, 'fm_passes'] == 31
+    assert df.loc[4, 'fm_xgot'] == 0.42
+    assert df.loc[4, 'adj'] == 0.5
+    assert pd.isna(df.loc[1, 'Minutes'])
+    assert df.loc[0, 'fm_passes'] is pd.NA
+    assert df['fm_captain'].sum() == 1
+
+
+@requires_pyarrow
+def test_resumed_run_keeps_one_schema(tmp_path):
+    with ParquetSink(tmp_path, frame, chunk_rows=2) as sink:
+        sink.write(BATCHES[0])
+    with ParquetSink(tmp_path, frame, chunk_rows=2) as sink:
+        assert sink.next_part == 1
+        for rows in BATCHES[1:]:
+            sink.write(rows)
+
+    df = read_back(tmp_path)
+    assert len(df) == 6
+    assert str(df['Minutes'].dtype) == 'Int64'
+    assert df.loc[4, 'fm_passes'] == 31
+
+
+def test_ndjson_rows_are_json_lines():
+    stream = io.StringIO()
+    total = stream_rows(iter(BATCHES), [NdjsonSink(stream)])
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert total == 6
+    assert [line['Player'] for line in lines] == ['A', 'B', 'C', 'D', 'E', 'F']
+    assert lines[0]['Date'] == '2025-09-01T00:00:00'
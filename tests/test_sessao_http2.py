@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Sessão HTTP/2 (sessao_http2.Http2Session) contra um servidor h2c local.
+
+O servidor fala apenas HTTP/2 sem TLS (prior knowledge) e responde cada stream
+numa thread própria, então as respostas só chegam juntas se o cliente
+multiplexar as requisições numa conexão. Requer httpx[http2] (o teste é pulado
+sem ele).
+
+  python -m pytest tests
+  python -m unittest discover tests
+"""
+
+import json
+import logging
+import socket
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import requests
+
+from buscar_estatisticas_fotmob import FotMobScraper, scrape_league_period
+from sessao_http2 import HAS_HTTPX, Http2Session
+
+if HAS_HTTPX:
+    import h2.config
+    import h2.connection
+    import h2.events
+
+# Atraso de cada resposta: 8 jogos em sequência levariam 8 x RESPONSE_DELAY
+RESPONSE_DELAY = 0.3
+
+LEAGUE = {'fixtures': {'allMatches': [
+    {
+        'id': match_id,
+        'home': {'name': f'Casa {match_id}'},
+        'away': {'name': f'Fora {match_id}'},
+        'status': {'utcTime': f'2025-09-{match_id:02d}T19:00:00Z', 'finished': True, 'cancelled': False},
+    }
+    for match_id in range(1, 9)
+]}}
+
+# Jogos que a API de teste responde com erro
+ERROR_STATUS = {7: 404, 8: 500}
+
+
+def match_details(match_id):
+    """matchDetails mínimo com um jogador do mandante"""
+    stats = {
+        'Minutes played': {'stat': {'value': 90}},
+        'Expected goals (xG)': {'stat': {'value': 0.25}},
+    }
+    return {
+        'header': {'status': {'finished': True}},
+        'content': {'playerStats': {str(match_id): {
+            'name': f'Jogador {match_id}',
+            'teamId': 1,
+            'teamName': f'Casa {match_id}',
+            'stats': [{'stats': stats}],
+        }}},
+    }
+
+
+def api_response(path):
+    """(status, corpo) da API de teste para um caminho"""
+    url = urlparse(path)
+    if url.path.endswith('/leagues'):
+        return 200, LEAGUE
+    if url.path.endswith('/matchDetails'):
+        match_id = int(parse_qs(url.query)['matchId'][0])
+        if match_id in ERROR_STATUS:
+            return ERROR_STATUS[match_id], {'error': 'indisponível'}
+        return 200, match_details(match_id)
+    if url.path.endswith('/lento'):
+        time.sleep(2)
+        return 200, {}
+    return 404, {'error': 'não encontrado'}
+
+
+class H2cStub:
+    """Servidor HTTP/2 sem TLS (h2c, prior knowledge) com contagem de conexões e streams"""
+
+    def __init__(self, handler, delay=RESPONSE_DELAY):
+        self.handler = handler
+        self.delay = delay
+        self.connections = 0
+        self.active_streams = 0
+        self.peak_streams = 0
+        self._counter_lock = threading.Lock()
+        self._server = socket.create_server(('127.0.0.1', 0))
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.port}/api'
+
+    def close(self):
+        self._server.close()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            with self._counter_lock:
+                self.connections += 1
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding='utf-8')
+        )
+        lock = threading.Lock()
+        with lock:
+            conn.initiate_connection()
+            client.sendall(conn.data_to_send())
+        while True:
+            try:
+                data = client.recv(65535)
+            except OSError:
+                break
+            if not data:
+                break
+            with lock:
+                events = conn.receive_data(data)
+                client.sendall(conn.data_to_send())
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    path = dict(event.headers)[':path']
+                    threading.Thread(target=self._respond, args=(client, conn, lock, event.stream_id, path),
+                                     daemon=True).start()
+        client.close()
+
+    def _respond(self, client, conn, lock, stream_id, path):
+        with self._counter_lock:
+            self.active_streams += 1
+            self.peak_streams = max(self.peak_streams, self.active_streams)
+        time.sleep(self.delay)
+        status, payload = self.handler(path)
+        body = json.dumps(payload).encode('utf-8')
+        with self._counter_lock:
+            self.active_streams -= 1
+        with lock:
+            conn.send_headers(stream_id, [
+                (':status', str(status)),
+                ('content-type', 'application/json'),
+                ('content-length', str(len(body))),
+            ])
+            conn.send_data(stream_id, body, end_stream=True)
+            try:
+                client.sendall(conn.data_to_send())
+            except OSError:
+                pass
+
+
+def quiet_logger():
+    """Logger sem saída (os erros 404/500 do teste são esperados)"""
+    logger = logging.getLogger('estatisticas.testes.http2')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    return logger
+
+
+@unittest.skipUnless(HAS_HTTPX, 'httpx[http2] não está instalado')
+class Http2SessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = H2cStub(api_response)
+        self.addCleanup(self.stub.close)
+
+    def test_concurrent_match_details_share_one_connection(self):
+        scraper = FotMobScraper(base_url=self.stub.base_url, http2=True, delays=False, workers=4,
+                                logger=quiet_logger())
+        self.addCleanup(scraper.session.close)
+
+        started = time.monotonic()
+        rows = scrape_league_period('laliga', pd.Timestamp('2025-09-01'), pd.Timestamp('2025-09-30'), scraper)
+        elapsed = time.monotonic() - started
+
+        # Jogos 7 (404) e 8 (500) viram erro do jogo, não da busca inteira
+        self.assertEqual(sorted(row['Player'] for row in rows), [f'Jogador {i}' for i in range(1, 7)])
+        self.assertEqual(self.stub.connections, 1)
+        self.assertGreaterEqual(self.stub.peak_streams, 4)
+        # Calendário + 8 jogos em sequência levariam 9 x RESPONSE_DELAY
+        self.assertLess(elapsed, 6 * RESPONSE_DELAY)
+
+    def test_response_status_and_body(self):
+        session = Http2Session(prior_knowledge=True)
+        self.addCleanup(session.close)
+
+        response = session.get(f'{self.stub.base_url}/matchDetails?matchId=3', timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['content']['playerStats']['3']['name'], 'Jogador 3')
+        self.assertEqual(response.url, f'{self.stub.base_url}/matchDetails?matchId=3')
+        self.assertNotIn('Content-Length', response.headers)
+
+        for match_id, status in ERROR_STATUS.items():
+            response = session.get(f'{self.stub.base_url}/matchDetails?matchId={match_id}', timeout=5)
+            self.assertEqual(response.status_code, status)
+            with self.assertRaises(requests.HTTPError):
+                response.raise_for_status()
+
+    def test_failed_match_details_return_none(self):
+        scraper = FotMobScraper(base_url=self.stub.base_url, http2=True, delays=False, logger=quiet_logger())
+        self.addCleanup(scraper.session.close)
+        self.assertIsNone(scraper.get_match_details(7))
+        self.assertIsNotNone(scraper.get_match_details(1))
+
+    def test_transport_errors_become_requests_exceptions(self):
+        session = Http2Session(prior_knowledge=True)
+        self.addCleanup(session.close)
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            session.get(f'{self.stub.base_url}/lento', timeout=0.5)
+
+        closed = socket.create_server(('127.0.0.1', 0))
+        port = closed.getsockname()[1]
+        closed.close()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.get(f'http://127.0.0.1:{port}/api/leagues', timeout=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Validação offline das ligas (validar_ligas.py) com as fixtures do repositório.
+
+fixtures/laliga traz um calendário sintético com três jogos (um fora do
+período) e a página de cada jogo do período; o replay roda sem rede.
+"""
+
+import sys
+
+import pandas as pd
+
+import validar_ligas
+from validar_ligas import DEFAULT_FIXTURES_DIR, load_manifest, validate_records
+
+
+def test_laliga_fixture_replays_offline():
+    success, message = validar_ligas.test_league('laliga', DEFAULT_FIXTURES_DIR)
+    assert success, message
+    assert message.endswith(f"{load_manifest(DEFAULT_FIXTURES_DIR, 'laliga')['registros']} registros de jogadores")
+
+
+def test_missing_fixtures_are_skipped(tmp_path):
+    success, _ = validar_ligas.test_league('laliga', tmp_path)
+    assert success is None
+
+
+def test_run_fails_when_no_league_is_validated(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['validar_ligas.py', '--fixtures', str(tmp_path)])
+    assert validar_ligas.main() == 1
+    assert 'Nenhuma liga foi validada' in capsys.readouterr().out
+
+
+def test_out_of_range_values_are_reported():
+    start, end = pd.Timestamp('2025-09-01'), pd.Timestamp('2025-09-30')
+    record = {
+        'Player': 'Ana Silva', 'Team': 'Sevilla', 'Date': pd.Timestamp('2025-10-02'), 'Opponent': 'Elche',
+        'Minutes': 130, 'Goals': 0, 'Assists': 0, 'xG': '0.1000', 'xA': '0.0100',
+        'Confronto': 'Sevilla x Elche', 'Location': 'home', 'adj': 0, 'Year': 2025, 'Month': 10,
+    }
+    errors = validate_records([record], start, end)
+    assert '1 registros fora do período' in errors
+    assert 'Minutes fora da faixa [0, 120] em 1 registros' in errors
@@ -1,12 +1,36 @@
 #!/usr/bin/env python3
 """
 Script de validação para testar todas as ligas disponíveis
-Testa apenas 1 jogo de cada liga para validar que está funcionando
+Roda scrape_period no próprio processo, em paralelo entre as ligas, e valida
+quantidade de registros, tipos das colunas e faixas de valores.
+
+Por padrão usa fixtures gravadas (sem rede, termina em segundos):
+  python validar_ligas.py
+
+Para gravar/atualizar as fixtures a partir do site (1 jogo por liga):
+  python validar_ligas.py --gravar
+
+Ligas sem fixtures gravadas são puladas, mas a execução falha se nenhuma liga
+for validada de fato. fixtures/laliga traz páginas sintéticas (calendário e
+jogo) usadas também por tests/test_validar_ligas.py.
 """
 
-import subprocess
+import argparse
+import io
+import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
+
+from buscar_estatisticas_multi_liga import LEAGUE_IDS, LeagueScraper, scrape_period
+from cache_http import CachedSession, PageCache
+from importacao import lazy_import, load
+from registro import configure_cli_logging
+
+pd = lazy_import('pandas')
 
 LEAGUES = {
     'laliga': 'La Liga (Espanha)',
@@ -17,91 +41,237 @@ LEAGUES = {
     'championship': 'Championship (Inglaterra - Série B)',
 }
 
-def test_league(league):
-    """Testa uma liga específica com 1 jogo"""
-    print(f"\n{'='*70}")
-    print(f"🧪 TESTANDO: {LEAGUES[league]}")
-    print(f"{'='*70}")
-    
-    # Usar período recente (últimos 30 dias)
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-    
-    cmd = [
-        sys.executable,
-        'buscar_estatisticas_multi_liga.py',
-        '--liga', league,
-        '--inicio', start_date.strftime('%Y-%m-%d'),
-        '--fim', end_date.strftime('%Y-%m-%d'),
-        '--limit', '1',
-        '--test'
-    ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        
-        if result.returncode == 0:
-            # Verificar se encontrou dados
-            if 'registros de jogadores' in result.stdout:
-                # Extrair número de registros
-                for line in result.stdout.split('\n'):
-                    if 'Total:' in line and 'registros' in line:
-                        print(f"✅ SUCESSO: {line.strip()}")
-                        return True
-            print("⚠️  AVISO: Comando executou mas não encontrou dados")
-            print(result.stdout[-500:])  # Últimas 500 chars
-            return False
-        else:
-            print(f"❌ ERRO: Código de saída {result.returncode}")
-            print("STDOUT:")
-            print(result.stdout[-500:])
-            print("\nSTDERR:")
-            print(result.stderr[-500:])
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print("⏱️  TIMEOUT: Comando demorou mais de 5 minutos")
-        return False
-    except Exception as e:
-        print(f"❌ ERRO: {e}")
-        return False
+DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Colunas obrigatórias e faixas de valores aceitas para cada registro
+EXPECTED_COLUMNS = [
+    'Player', 'Team', 'Date', 'Opponent', 'Minutes', 'Goals', 'Assists',
+    'xG', 'xA', 'Confronto', 'Location', 'adj', 'Year', 'Month'
+]
+INT_RANGES = {
+    'Minutes': (0, 120),
+    'Goals': (0, 10),
+    'Assists': (0, 10),
+}
+FLOAT_RANGES = {
+    'xG': (0.0, 5.0),
+    'xA': (0.0, 5.0),
+}
+
+
+class _ThreadOutput(io.TextIOBase):
+    """Redireciona o stdout de cada thread para um buffer próprio"""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def set_buffer(self, buffer):
+        self._local.buffer = buffer
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._fallback).write(text)
+
+    def flush(self):
+        self._fallback.flush()
+
+
+def validate_records(records, start_date, end_date, expected_count=None):
+    """Valida registros retornados por scrape_period. Retorna lista de erros."""
+    if not records:
+        return ["nenhum registro retornado"]
+
+    errors = []
+    df = pd.DataFrame(records)
+
+    missing = [col for col in EXPECTED_COLUMNS if col not in df.columns]
+    if missing:
+        return [f"colunas ausentes: {missing}"]
+
+    if expected_count is not None and len(df) != expected_count:
+        errors.append(f"esperados {expected_count} registros, obtidos {len(df)}")
+
+    if not df['Player'].map(lambda v: isinstance(v, str) and v.strip() != '').all():
+        errors.append("Player vazio ou não-texto")
+    for col in ('Team', 'Opponent'):
+        if not df[col].map(lambda v: isinstance(v, str) and v != '').all():
+            errors.append(f"{col} vazio ou não-texto")
+
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        errors.append(f"Date não é datetime (dtype={df['Date'].dtype})")
+    else:
+        out_of_range = df[(df['Date'] < start_date) | (df['Date'] > end_date)]
+        if len(out_of_range):
+            errors.append(f"{len(out_of_range)} registros fora do período")
+        if not (df['Year'] == df['Date'].dt.year).all() or not (df['Month'] == df['Date'].dt.month).all():
+            errors.append("Year/Month inconsistentes com Date")
+
+    for col, (low, high) in INT_RANGES.items():
+        if not pd.api.types.is_integer_dtype(df[col]):
+            errors.append(f"{col} não é inteiro (dtype={df[col].dtype})")
+            continue
+        bad = df[(df[col] < low) | (df[col] > high)]
+        if len(bad):
+            errors.append(f"{col} fora da faixa [{low}, {high}] em {len(bad)} registros")
+
+    for col, (low, high) in FLOAT_RANGES.items():
+        # xG/xA são gravados como texto com 4 casas decimais
+        if not df[col].astype(str).str.fullmatch(r'\d+\.\d{4}').all():
+            errors.append(f"{col} fora do formato 0.0000")
+            continue
+        values = df[col].astype(float)
+        bad = df[(values < low) | (values > high)]
+        if len(bad):
+            errors.append(f"{col} fora da faixa [{low}, {high}] em {len(bad)} registros")
+
+    if not df['Location'].isin(['home', 'away']).all():
+        errors.append("Location diferente de home/away")
+
+    duplicated = df.duplicated(subset=['Player', 'Team', 'Date', 'Opponent']).sum()
+    if duplicated:
+        errors.append(f"{duplicated} registros duplicados")
+
+    return errors
+
+
+def load_manifest(fixtures_dir, league):
+    """Lê o manifesto de fixtures de uma liga (ou None se não existir)"""
+    manifest_path = Path(fixtures_dir) / league / 'manifest.json'
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_league(league, fixtures_dir, record=False, days=30):
+    """Testa uma liga específica com 1 jogo. Retorna (sucesso, mensagem); sucesso None = pulada."""
+    league_info = LEAGUE_IDS[league]
+
+    if record:
+        # Usar período recente (últimos N dias) e gravar as páginas baixadas
+        end_date = pd.Timestamp(datetime.now().date())
+        start_date = end_date - timedelta(days=days)
+        cache = PageCache(Path(fixtures_dir) / league)
+        live = LeagueScraper()
+        scraper = LeagueScraper(session=CachedSession(cache, live.session))
+        manifest = None
+    else:
+        manifest = load_manifest(fixtures_dir, league)
+        if manifest is None:
+            return None, f"sem fixtures em {Path(fixtures_dir) / league} (grave com: python validar_ligas.py --gravar --ligas {league})"
+        start_date = pd.Timestamp(manifest['inicio'])
+        end_date = pd.Timestamp(manifest['fim'])
+        cache = PageCache(Path(fixtures_dir) / league)
+        scraper = LeagueScraper(session=CachedSession(cache), delays=False)
+
+    records = scrape_period(
+        league_info['id'], league_info['name'], start_date, end_date, scraper, limit_games=1
+    )
+
+    expected_count = manifest.get('registros') if manifest else None
+    errors = validate_records(records, start_date, end_date, expected_count)
+
+    if record and not errors:
+        manifest = {
+            'liga': league,
+            'inicio': start_date.strftime('%Y-%m-%d'),
+            'fim': end_date.strftime('%Y-%m-%d'),
+            'registros': len(records),
+            'gravado_em': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(Path(fixtures_dir) / league / 'manifest.json', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    if errors:
+        return False, '; '.join(errors)
+    return True, f"Total: {len(records)} registros de jogadores"
+
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Valida o scraper de todas as ligas (fixtures gravadas ou site ao vivo)'
+    )
+    parser.add_argument('--ligas', nargs='+', choices=list(LEAGUES.keys()),
+                       default=list(LEAGUES.keys()),
+                       help='Ligas a validar (padrão: todas)')
+    parser.add_argument('--fixtures', type=str, default=str(DEFAULT_FIXTURES_DIR),
+                       help='Diretório das fixtures (padrão: ./fixtures)')
+    parser.add_argument('--gravar', action='store_true',
+                       help='Buscar no site e gravar/atualizar as fixtures')
+    parser.add_argument('--dias', type=int, default=30,
+                       help='Janela em dias usada ao gravar (padrão: 30)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Ligas validadas em paralelo (padrão: todas)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Mostrar a saída completa do scraper')
+    args = parser.parse_args()
+    configure_cli_logging()
+
     print("="*70)
     print("🚀 VALIDAÇÃO DE TODAS AS LIGAS")
     print("="*70)
-    print("\nEste script testa cada liga com 1 jogo para validar funcionamento.")
-    print("Aguarde... isso pode levar alguns minutos.\n")
-    
-    results = {}
-    
-    for league in LEAGUES.keys():
-        success = test_league(league)
-        results[league] = success
-    
+    print(f"Modo: {'GRAVAÇÃO (site ao vivo)' if args.gravar else 'FIXTURES (offline)'}")
+    print(f"Fixtures: {args.fixtures}\n")
+
+    started = time.perf_counter()
+    logs = {}
+    output = _ThreadOutput(sys.stdout)
+
+    def run(league):
+        buffer = io.StringIO()
+        logs[league] = buffer
+        if not args.verbose:
+            output.set_buffer(buffer)
+        try:
+            return test_league(league, args.fixtures, record=args.gravar, days=args.dias)
+        except Exception as e:
+            return False, f"ERRO: {e}"
+        finally:
+            output.set_buffer(None)
+
+    load()  # Carregar os módulos tardios antes das threads
+    original_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers or len(args.ligas)) as executor:
+            results = dict(zip(args.ligas, executor.map(run, args.ligas)))
+    finally:
+        sys.stdout = original_stdout
+
     # Resumo final
-    print(f"\n{'='*70}")
+    print(f"{'='*70}")
     print("📊 RESUMO FINAL")
     print(f"{'='*70}")
-    
-    for league, success in results.items():
+
+    for league, (success, message) in results.items():
+        if success is None:
+            print(f"⏭️  PULADA - {LEAGUES[league]}: {message}")
+            continue
         status = "✅ OK" if success else "❌ FALHOU"
-        print(f"{status} - {LEAGUES[league]}")
-    
+        print(f"{status} - {LEAGUES[league]}: {message}")
+        if not success and not args.verbose:
+            print(logs[league].getvalue()[-500:])  # Últimas 500 chars
+
     total = len(results)
-    passed = sum(1 for s in results.values() if s)
-    
+    passed = sum(1 for success, _ in results.values() if success)
+    skipped = sum(1 for success, _ in results.values() if success is None)
+    failed = total - passed - skipped
+
     print(f"\n✅ Passou: {passed}/{total}")
-    print(f"❌ Falhou: {total - passed}/{total}")
-    
-    if passed == total:
-        print("\n🎉 TODAS AS LIGAS ESTÃO FUNCIONANDO!")
-        return 0
-    else:
-        print(f"\n⚠️  {total - passed} liga(s) falharam. Verifique os erros acima.")
+    print(f"❌ Falhou: {failed}/{total}")
+    if skipped:
+        print(f"⏭️  Puladas (sem fixtures): {skipped}/{total}")
+    print(f"⏱️  Tempo: {time.perf_counter() - started:.1f}s")
+
+    if failed:
+        print(f"\n⚠️  {failed} liga(s) falharam. Verifique os erros acima.")
         return 1
+    if not passed:
+        print("\n⚠️  Nenhuma liga foi validada (sem fixtures gravadas). Grave com: python validar_ligas.py --gravar")
+        return 1
+    print("\n🎉 TODAS AS LIGAS COM FIXTURES ESTÃO FUNCIONANDO!")
+    return 0
 
 if __name__ == "__main__":
     sys.exit(main())
-
-